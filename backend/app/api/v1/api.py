@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, rss, ai
+from app.api.v1.endpoints import auth, users, rss, ai, articles, events, news
 
 api_router = APIRouter()
 
@@ -8,3 +8,6 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(rss.router, prefix="/rss", tags=["rss"])
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
+api_router.include_router(articles.router, prefix="/articles", tags=["articles"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(news.router, prefix="/news", tags=["news"])
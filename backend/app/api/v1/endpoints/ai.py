@@ -1,10 +1,29 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Union
+from sqlalchemy.orm import Session
+import asyncio
+import json
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models.article import AIChat, AIChatInDB
+from app.models.user import User
+from app.models.ai_job import AIJobInDB
 from app.services.ai_service import ai_service
+from app.services.job_queue import job_queue
+from app.services.ai_health import ai_health
+from app.services.ai_batch import ai_batch, OPERATIONS
+from app.services.ai_chat import ai_chat
+from app.services.ollama_scheduler import AIServiceBusy
 
 router = APIRouter()
 
+def busy(e: AIServiceBusy) -> HTTPException:
+    """Queue full or queue wait exceeded: tell the client to back off instead of timing out"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
 class SummaryRequest(BaseModel):
     content: str
     max_length: Optional[int] = 200
@@ -38,6 +57,40 @@ class QuestionsResponse(BaseModel):
     questions: Optional[List[str]] = None
     error: Optional[str] = None
 
+class BatchRequest(BaseModel):
+    contents: List[str] = Field(default_factory=list, max_length=settings.AI_BATCH_MAX_ITEMS)
+    article_ids: List[int] = Field(default_factory=list, max_length=settings.AI_BATCH_MAX_ITEMS)
+    max_length: Optional[int] = 200  # summary only
+    local_first: bool = False  # sentiment/keywords: answer from the local model when it is confident
+
+    @model_validator(mode="after")
+    def check_size(self):
+        if not self.contents and not self.article_ids:
+            raise ValueError("Provide contents or article_ids")
+        if len(self.contents) + len(self.article_ids) > settings.AI_BATCH_MAX_ITEMS:
+            raise ValueError(f"At most {settings.AI_BATCH_MAX_ITEMS} items per batch")
+        return self
+
+class BatchItemResult(BaseModel):
+    index: int
+    article_id: Optional[int] = None
+    status: str  # cached, done, failed, busy, timeout, not_found
+    result: Optional[Union[str, List[str]]] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    operation: str
+    results: List[BatchItemResult]
+    counts: dict
+    unique_generated: int
+    retry_after: int = 0
+
+class ChatRequest(BaseModel):
+    question: str = Field(..., min_length=1, max_length=4000)
+    article_id: Optional[int] = None
+    session_id: Optional[str] = None  # from the previous turn's events; continues that conversation
+    stream: bool = True
+
 @router.post("/summary", response_model=SummaryResponse)
 async def generate_summary(request: SummaryRequest):
     """Generate AI summary of article content"""
@@ -52,6 +105,8 @@ async def generate_summary(request: SummaryRequest):
                 error="Unable to generate summary. Please try again."
             )
             
+    except AIServiceBusy as e:
+        raise busy(e)
     except Exception as e:
         return SummaryResponse(
             success=False, 
@@ -72,6 +127,8 @@ async def analyze_sentiment(request: SentimentRequest):
                 error="Unable to analyze sentiment."
             )
             
+    except AIServiceBusy as e:
+        raise busy(e)
     except Exception as e:
         return SentimentResponse(
             success=False, 
@@ -92,6 +149,8 @@ async def extract_keywords(request: KeywordsRequest):
                 error="Unable to extract keywords."
             )
             
+    except AIServiceBusy as e:
+        raise busy(e)
     except Exception as e:
         return KeywordsResponse(
             success=False, 
@@ -112,26 +171,106 @@ async def generate_questions(request: QuestionsRequest):
                 error="Unable to generate questions."
             )
             
+    except AIServiceBusy as e:
+        raise busy(e)
     except Exception as e:
         return QuestionsResponse(
             success=False, 
             error=f"Question generation failed: {str(e)}"
         )
 
-@router.get("/health")
-async def ai_health_check():
-    """Check AI service health"""
+@router.post("/{operation}/batch", response_model=BatchResponse)
+async def batch(operation: str, request: BatchRequest, response: Response):
+    """Run summary, sentiment, keywords or questions over many texts and/or article ids.
+
+    Results come back in request order (contents first, then article_ids),
+    each with its own status; items that were busy or timed out can be
+    retried, and Retry-After is set when any were.
+    """
+    if operation not in OPERATIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown AI operation: {operation}")
+    report = await ai_batch.run(
+        operation, request.contents, request.article_ids,
+        max_length=request.max_length or 200, local_first=request.local_first,
+    )
+    if report["retry_after"]:
+        response.headers["Retry-After"] = str(report["retry_after"])
+    return report
+
+@router.post("/chat")
+async def chat(request: ChatRequest, current_user: User = Depends(get_current_user)):
+    """Ask about an article; streams NDJSON events ({"type": "delta"} ... {"type": "done"}) unless stream=false"""
+    try:
+        session = await ai_chat.open(current_user.id, request.article_id, request.session_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    events = ai_chat.reply(session, request.question)
     try:
-        # Test with a simple prompt
-        test_summary = await ai_service.generate_summary("This is a test article.", 50)
-        return {
-            "status": "healthy",
-            "service": "ai",
-            "test_summary": test_summary is not None
-        }
+        # Wait for the first token here so a busy or unreachable model is an HTTP error, not a broken stream
+        first = await events.__anext__()
+    except AIServiceBusy as e:
+        raise busy(e)
     except Exception as e:
-        return {
-            "status": "unhealthy",
-            "service": "ai",
-            "error": str(e)
-        }
+        raise HTTPException(status_code=502, detail=f"Chat failed: {str(e)}")
+
+    if not request.stream:
+        last = first
+        async for event in events:
+            last = event
+        if last["type"] == "error":
+            raise HTTPException(status_code=502, detail=f"Chat failed: {last['error']}")
+        return last
+
+    async def relay():
+        try:
+            yield json.dumps(first) + "\n"
+            async for event in events:
+                yield json.dumps(event) + "\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(relay(), media_type="application/x-ndjson")
+
+@router.get("/chat/history", response_model=List[AIChatInDB])
+async def chat_history(
+    article_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """The current user's chat turns, oldest first (for one article when article_id is given)"""
+    # Turns still in the write buffer are flushed first, but only when this user has any
+    if ai_chat.history.has_pending(current_user.id):
+        await asyncio.to_thread(ai_chat.history.flush)
+
+    def load():
+        query = db.query(AIChat).filter(AIChat.user_id == current_user.id)
+        if article_id is not None:
+            query = query.filter(AIChat.article_id == article_id)
+        return query.order_by(AIChat.created_at.desc(), AIChat.id.desc()).limit(limit).all()
+
+    return list(reversed(await asyncio.to_thread(load)))
+
+@router.get("/health")
+async def ai_health_check(response: Response, deep: bool = False):
+    """Check AI service health from cheap Ollama endpoints and live traffic (deep=true also runs a generation)"""
+    report = await ai_health.check()
+    if deep:
+        report["deep"] = await ai_health.deep_check()
+    if report["status"] == "unhealthy":
+        response.status_code = 503
+    return report
+
+
+@router.get("/jobs/{job_id}", response_model=AIJobInDB)
+def get_ai_job(job_id: int, db: Session = Depends(get_db)):
+    """Get status (queued, running, done, failed) and result of an AI job"""
+    job = job_queue.get(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    response = AIJobInDB.model_validate(job)
+    if job.result:
+        response.result = json.loads(job.result)
+    return response
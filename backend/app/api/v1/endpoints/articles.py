@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.responses import ORJSONResponse
+from app.models.article import Article, ArticleResponse
+from app.models.types import json_array_contains
+from app.models.ai_job import PRIORITY_BACKFILL, PRIORITY_INTERACTIVE
+from app.services.article_serializer import article_serializer
+from app.services.job_queue import job_queue
+
+router = APIRouter()
+
+class RelatedArticle(BaseModel):
+    article: ArticleResponse
+    score: float
+
+class RelatedArticlesResponse(BaseModel):
+    article_id: int
+    related: List[RelatedArticle]
+
+class ProcessAIResponse(BaseModel):
+    job_id: int
+    status: str
+    status_url: str
+
+@router.get("", response_model=List[ArticleResponse], response_class=ORJSONResponse)
+def list_articles(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None, description="Only articles carrying every given tag"),
+    topic: Optional[List[str]] = Query(None, description="Only articles whose AI topics include every given topic"),
+    db: Session = Depends(get_db)
+) -> Any:
+    """List articles, newest first."""
+    query = db.query(Article)
+    if category:
+        query = query.filter(Article.category == category)
+    if tag:
+        query = query.filter(json_array_contains(Article.tags, tag))
+    if topic:
+        query = query.filter(json_array_contains(Article.ai_topics, topic))
+    if search:
+        pattern = f"%{search}%"
+        query = query.filter(or_(Article.title.ilike(pattern), Article.description.ilike(pattern)))
+
+    articles = query.order_by(
+        Article.published_date.desc().nulls_last(), Article.id.desc()
+    ).offset(skip).limit(limit).all()
+    # Trusted ORM rows: skip response_model validation and reuse cached fragments
+    return ORJSONResponse(article_serializer.render_list(articles))
+
+@router.get("/{article_id}", response_model=ArticleResponse, response_class=ORJSONResponse)
+def get_article(article_id: int, db: Session = Depends(get_db)) -> Any:
+    """Get a single article."""
+    article = db.query(Article).filter(Article.id == article_id).first()
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return ORJSONResponse(article_serializer.render(article))
+
+@router.get("/{article_id}/related", response_model=RelatedArticlesResponse, response_class=ORJSONResponse)
+async def get_related_articles(
+    article_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Get semantically similar articles from the embedding index."""
+    # Session work runs in a worker thread; only the embedding call awaits on the loop
+    def load():
+        return db.query(Article).filter(Article.id == article_id).first()
+
+    article = await asyncio.to_thread(load)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    # The embedding index (and numpy) loads on the first related-articles request, not at startup
+    from app.services.embedding_service import embedding_service
+
+    try:
+        # Over-fetch a little so deleted articles can be dropped without short pages
+        neighbours = await embedding_service.related_articles(db, article, limit + 5)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Embedding service unavailable: {str(e)}")
+
+    def render() -> bytes:
+        ids = [neighbour_id for neighbour_id, _ in neighbours]
+        articles = {a.id: a for a in db.query(Article).filter(Article.id.in_(ids)).all()} if ids else {}
+        related = [
+            (articles[neighbour_id], score) for neighbour_id, score in neighbours if neighbour_id in articles
+        ][:limit]
+        return b'{"article_id":%d,"related":' % article_id + article_serializer.render_scored(related) + b"}"
+
+    return ORJSONResponse(await asyncio.to_thread(render))
+
+@router.post("/{article_id}/process-ai", response_model=ProcessAIResponse, status_code=status.HTTP_202_ACCEPTED)
+def process_article_with_ai(
+    article_id: int,
+    priority: Literal["interactive", "backfill"] = "interactive",
+    db: Session = Depends(get_db)
+) -> Any:
+    """Queue AI enrichment (summary, sentiment, keywords) for an article."""
+    if db.query(Article.id).filter(Article.id == article_id).first() is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    job = job_queue.submit(
+        db,
+        article_id,
+        priority=PRIORITY_INTERACTIVE if priority == "interactive" else PRIORITY_BACKFILL
+    )
+    return ProcessAIResponse(job_id=job.id, status=job.status, status_url=f"/api/v1/ai/jobs/{job.id}")
@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from app.core.security import get_current_user_optional
+from app.models.user import User
+from app.services.event_buffer import event_buffer
+
+router = APIRouter()
+
+class ArticleEvent(BaseModel):
+    type: Literal["view", "share", "read"]
+    article_id: int
+    progress: Optional[int] = Field(None, ge=0, le=100)
+    time_spent: Optional[int] = Field(None, ge=0)
+
+class ArticleEventBatch(BaseModel):
+    events: List[ArticleEvent] = Field(..., min_length=1, max_length=500)
+
+class EventsAccepted(BaseModel):
+    accepted: int
+
+@router.post("", response_model=EventsAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def record_events(
+    batch: ArticleEventBatch,
+    current_user: Optional[User] = Depends(get_current_user_optional)
+) -> Any:
+    """Record view, share and reading-progress events (applied to the database in batches)."""
+    events = []
+    for event in batch.events:
+        data = event.model_dump(exclude_none=True)
+        if event.type == "read":
+            if current_user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Reading progress events require authentication",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            data["user_id"] = current_user.id
+        events.append(data)
+
+    flush_due = await asyncio.to_thread(event_buffer.record, events)
+    if flush_due:
+        event_buffer.flush_in_background()
+
+    return EventsAccepted(accepted=len(events))
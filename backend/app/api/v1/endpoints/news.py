@@ -0,0 +1,39 @@
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
+from app.core.http_cache import conditional_response
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services.ingestion_service import IngestionThrottled, ingestion_service
+from app.services.facet_service import facet_service
+
+router = APIRouter()
+
+class NewsFetchResponse(BaseModel):
+    message: str
+    total_fetched: int
+    saved_count: int
+    errors: Dict[str, str] = {}
+    duration_ms: float
+
+@router.post("/fetch", response_model=NewsFetchResponse)
+async def fetch_news(current_user: User = Depends(get_current_user)):
+    """Pull new articles from NewsAPI and approved RSS feeds (concurrent calls share one run, rate limited)"""
+    try:
+        return await ingestion_service.run()
+    except IngestionThrottled as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+async def _facet_response(facet: str, request: Request) -> Response:
+    body, etag = await facet_service.get(facet)
+    return conditional_response(request, body, etag, max_age=60)
+
+@router.get("/categories")
+async def get_categories(request: Request):
+    """Article categories by volume, with total and last-24h counts"""
+    return await _facet_response("categories", request)
+
+@router.get("/sources")
+async def get_sources(request: Request):
+    """Article sources by volume, with total and last-24h counts"""
+    return await _facet_response("sources", request)
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, Response, Depends
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
 import httpx
 import asyncio
 from typing import List, Optional
 import json
 import time
+from app.services.trending_service import trending_service
+from app.services.category_feed_service import category_feed_cache
+from app.services.feed_aggregator import feed_aggregator
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.http_cache import conditional_response, http_cache
+from app.core.security import get_current_user
+from app.models.rss_feed import RSSFeed
+from app.models.user import User
 
 router = APIRouter()
 
@@ -16,6 +26,11 @@ class RSSProxyResponse(BaseModel):
     data: Optional[dict] = None
     error: Optional[str] = None
 
+class RSSAggregateRequest(BaseModel):
+    category: Optional[str] = None
+    feed_urls: Optional[List[str]] = None
+    limit: int = Field(20, ge=1, le=200)
+
 # Rate limiting configuration
 RATE_LIMIT_DELAY = 1.0  # seconds between requests
 last_request_time = 0
@@ -63,14 +78,60 @@ async def proxy_rss_feed(request: RSSProxyRequest):
             error=f"Request failed: {str(e)}"
         )
 
-@router.get("/trending")
-async def get_trending_feeds():
-    """Get trending RSS feeds"""
-    # TODO: Implement real trending feeds
-    return {"success": True, "data": []}
+@router.post("/aggregate")
+async def aggregate_feeds(
+    request: RSSAggregateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Fetch a set of feeds server-side and return their newest items merged by publish time.
+
+    Requires authentication: the server fetches caller-supplied URLs (public hosts only).
+    """
+    if request.feed_urls:
+        feeds = [{"url": url, "category": request.category} for url in dict.fromkeys(request.feed_urls)]
+    elif request.category:
+        rows = db.query(RSSFeed.url, RSSFeed.name, RSSFeed.category).filter(
+            RSSFeed.is_active.is_(True),
+            RSSFeed.is_approved.is_(True),
+            RSSFeed.category.ilike(request.category)
+        ).all()
+        feeds = [{"url": row.url, "name": row.name, "category": row.category} for row in rows]
+    else:
+        raise HTTPException(status_code=400, detail="Provide a category or feed_urls")
+
+    if len(feeds) > settings.RSS_AGGREGATE_MAX_FEEDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.RSS_AGGREGATE_MAX_FEEDS} feeds can be aggregated per request"
+        )
+
+    data = await feed_aggregator.aggregate(feeds, request.limit)
+    return {"success": True, "data": data}
+
+async def trending_stamp():
+    snapshot = await trending_service.get_snapshot()
+    return snapshot["generated_at"]
+
+@router.get("/trending", dependencies=[http_cache(trending_stamp, max_age=60)])
+async def get_trending_feeds(
+    category: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Get trending articles from the precomputed trending snapshot"""
+    snapshot = await trending_service.get_snapshot()
+    if category:
+        articles = snapshot["by_category"].get(category.lower(), [])
+    else:
+        articles = snapshot["articles"]
+    return {
+        "success": True,
+        "data": articles[:limit],
+        "generated_at": snapshot["generated_at"]
+    }
 
 @router.get("/category/{category}")
-async def get_feeds_by_category(category: str):
-    """Get RSS feeds by category"""
-    # TODO: Implement real category feeds
-    return {"success": True, "data": []}
+async def get_feeds_by_category(category: str, request: Request):
+    """Get active RSS feeds and their latest articles for a category"""
+    body, etag = await category_feed_cache.get(category)
+    return conditional_response(request, body, etag, max_age=60)
@@ -1,14 +1,40 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.http_cache import http_cache
 from app.core.security import get_current_active_user
 from app.models.user import User, UserUpdate, UserResponse
-import json
+from app.models.article import (
+    Article,
+    ReadingHistoryCreate,
+    ReadingHistoryInDB,
+    ReadingHistoryPage,
+    ReadingHistoryDailyInDB
+)
+from app.services.reading_history_service import reading_history_service
 
 router = APIRouter()
 
-@router.get("/me", response_model=UserResponse)
+def user_stamp(current_user: User = Depends(get_current_active_user)):
+    # Every column the profile, interests and preferences routes expose; updated_at alone
+    # only has second resolution on some backends
+    return (
+        current_user.id, current_user.email, current_user.username, current_user.full_name,
+        current_user.is_active, current_user.interests, current_user.reading_preferences,
+        current_user.updated_at
+    )
+
+def daily_rollup_stamp(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # Read from the rollup table so every worker sees a rollup done by any of them;
+    # the date because the ?days= window moves at midnight
+    return (current_user.id, date.today(), reading_history_service.daily_stamp(db, current_user.id))
+
+@router.get("/me", response_model=UserResponse, dependencies=[http_cache(user_stamp, max_age=0, private=True)])
 def read_user_me(
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
@@ -25,14 +51,6 @@ def update_user_me(
     # Update only provided fields
     update_data = user_data.dict(exclude_unset=True)
     
-    # Handle interests as JSON string
-    if "interests" in update_data and update_data["interests"] is not None:
-        update_data["interests"] = json.dumps(update_data["interests"])
-    
-    # Handle reading preferences as JSON string
-    if "reading_preferences" in update_data and update_data["reading_preferences"] is not None:
-        update_data["reading_preferences"] = json.dumps(update_data["reading_preferences"])
-    
     for field, value in update_data.items():
         setattr(current_user, field, value)
     
@@ -41,17 +59,12 @@ def update_user_me(
     
     return current_user
 
-@router.get("/me/interests")
+@router.get("/me/interests", dependencies=[http_cache(user_stamp, max_age=0, private=True)])
 def get_user_interests(
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get current user interests."""
-    if current_user.interests:
-        try:
-            return json.loads(current_user.interests)
-        except json.JSONDecodeError:
-            return []
-    return []
+    return current_user.interests or []
 
 @router.put("/me/interests")
 def update_user_interests(
@@ -60,23 +73,18 @@ def update_user_interests(
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Update current user interests."""
-    current_user.interests = json.dumps(interests)
+    current_user.interests = interests
     db.commit()
     db.refresh(current_user)
     
     return {"message": "Interests updated successfully", "interests": interests}
 
-@router.get("/me/preferences")
+@router.get("/me/preferences", dependencies=[http_cache(user_stamp, max_age=0, private=True)])
 def get_user_preferences(
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Get current user reading preferences."""
-    if current_user.reading_preferences:
-        try:
-            return json.loads(current_user.reading_preferences)
-        except json.JSONDecodeError:
-            return {}
-    return {}
+    return current_user.reading_preferences or {}
 
 @router.put("/me/preferences")
 def update_user_preferences(
@@ -85,8 +93,55 @@ def update_user_preferences(
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """Update current user reading preferences."""
-    current_user.reading_preferences = json.dumps(preferences)
+    current_user.reading_preferences = preferences
     db.commit()
     db.refresh(current_user)
     
     return {"message": "Preferences updated successfully", "preferences": preferences}
+
+
+@router.post("/me/reading-history", response_model=ReadingHistoryInDB)
+def record_reading_progress(
+    progress: ReadingHistoryCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Record reading progress for an article (one row per user and article)."""
+    if db.query(Article.id).filter(Article.id == progress.article_id).first() is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    return reading_history_service.record_progress(
+        db,
+        user_id=current_user.id,
+        article_id=progress.article_id,
+        progress=progress.reading_progress,
+        time_spent=progress.time_spent
+    )
+
+@router.get("/me/reading-history", response_model=ReadingHistoryPage)
+def get_reading_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get current user reading history, most recent first."""
+    try:
+        items, next_cursor = reading_history_service.list_history(db, current_user.id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    return ReadingHistoryPage(items=items, next_cursor=next_cursor)
+
+@router.get(
+    "/me/reading-history/daily",
+    response_model=List[ReadingHistoryDailyInDB],
+    dependencies=[http_cache(daily_rollup_stamp, max_age=300, private=True)]
+)
+def get_reading_history_daily(
+    days: int = Query(30, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get current user daily reading aggregates for rolled-up history."""
+    return reading_history_service.list_daily(db, current_user.id, days)
@@ -0,0 +1,220 @@
+import asyncio
+import gzip
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies larger than this are compressed in a worker thread instead of on the event loop
+THREAD_THRESHOLD = 64 * 1024
+
+
+def _accepted_encodings(header: str) -> List[str]:
+    accepted = []
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            accepted.append(name)
+    return accepted
+
+
+class CompressedVariantCache:
+    """Byte-bounded LRU of compressed bodies keyed by (ETag, length, encoding).
+
+    Responses carrying an ETag (the snapshot caches and ``http_cache``
+    routes) are compressed once per version; later requests for the same
+    representation reuse the stored variant.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, int, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple[str, int, str], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionStats:
+    def __init__(self):
+        self.compressed = 0
+        self.cache_hits = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.by_encoding: Dict[str, int] = {}
+
+    def snapshot(self, cache: CompressedVariantCache) -> dict:
+        return {
+            "responses_compressed": self.compressed,
+            "variant_cache_hits": self.cache_hits,
+            "responses_skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            "cpu_ms": round(self.cpu_seconds * 1000, 1),
+            "by_encoding": dict(self.by_encoding),
+            "variant_cache_entries": len(cache),
+            "variant_cache_bytes": cache.size,
+        }
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression with a size threshold and content-type allowlist.
+
+    Only complete (non-streaming) 200 responses are compressed; streamed
+    bodies pass through untouched so tokens still reach the client as they
+    are produced. Brotli is preferred when the client accepts it and the
+    ``brotli`` package is installed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE
+        self.content_types = tuple(settings.COMPRESSION_CONTENT_TYPES)
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality = settings.COMPRESSION_BROTLI_QUALITY
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        # Per-thread CPU: compression runs in worker threads alongside other requests
+        started = time.thread_time()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        compression_stats.cpu_seconds += time.thread_time() - started
+        return compressed
+
+    def _should_compress(self, message: Message) -> bool:
+        if message["status"] != 200:
+            return False
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(self.content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                if self._should_compress(message):
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming response: send as-is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) < self.minimum_size:
+                compression_stats.skipped += 1
+                await send(start_message)
+                await send(message)
+                return
+
+            etag = headers.get("etag")
+            key = (etag, len(body), encoding) if etag else None
+            compressed = variant_cache.get(key) if key else None
+            if compressed is not None:
+                compression_stats.cache_hits += 1
+            else:
+                if len(body) > THREAD_THRESHOLD:
+                    compressed = await asyncio.to_thread(self._compress, body, encoding)
+                else:
+                    compressed = self._compress(body, encoding)
+                if key:
+                    variant_cache.put(key, compressed)
+                compression_stats.compressed += 1
+
+            compression_stats.bytes_in += len(body)
+            compression_stats.bytes_out += len(compressed)
+            compression_stats.by_encoding[encoding] = compression_stats.by_encoding.get(encoding, 0) + 1
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+# Global compression state shared by the middleware and /performance
+variant_cache = CompressedVariantCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+compression_stats = CompressionStats()
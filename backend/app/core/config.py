@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Dict, Optional, List
 import os
 
 class Settings(BaseSettings):
@@ -30,7 +30,144 @@ class Settings(BaseSettings):
     # Ollama Configuration (Local LLM)
     OLLAMA_HOST: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama2"  # or "mistral", "codellama", etc.
-    
+    OLLAMA_HOSTS: List[str] = []  # several servers to load-balance across; empty means OLLAMA_HOST only
+
+    # Ollama backend health (passive: consecutive failures eject, /api/ps re-probes with backoff)
+    AI_BACKEND_EJECT_AFTER_FAILURES: int = 3
+    AI_BACKEND_EJECT_SECONDS: float = 5.0
+    AI_BACKEND_EJECT_MAX_SECONDS: float = 120.0
+    AI_BACKEND_MODELS_REFRESH_SECONDS: float = 30.0
+
+    # Ollama request scheduling (lanes: interactive > background > health)
+    AI_MAX_CONCURRENCY: int = 2  # per backend; match OLLAMA_NUM_PARALLEL on the servers
+    AI_QUEUE_MAX_WAITING: int = 200  # per lane; further requests get 503 immediately
+    AI_QUEUE_TIMEOUT_INTERACTIVE: float = 10.0
+    AI_QUEUE_TIMEOUT_BACKGROUND: float = 300.0
+    AI_QUEUE_TIMEOUT_HEALTH: float = 2.0
+    AI_REQUEST_TIMEOUT_SECONDS: float = 30.0
+
+    # Prompt content preparation: token budget for the article text in each prompt
+    AI_CONTENT_TOKEN_BUDGETS: Dict[str, int] = {
+        "summary": 500,
+        "sentiment": 125,
+        "keywords": 250,
+        "questions": 375,
+        "chat": 1500,
+    }
+    AI_CONTENT_CACHE_SIZE: int = 2000
+
+    # Local sentiment/keyword extraction for bulk enrichment; the LLM is only asked below the confidence threshold
+    LOCAL_NLP_ENABLED: bool = True
+    LOCAL_NLP_MIN_CONFIDENCE: float = 0.5
+    LOCAL_NLP_MIN_CORPUS_DOCUMENTS: int = 100  # fewer articles than this and IDF weights are not trusted
+    LOCAL_NLP_CORPUS_REFRESH_SECONDS: int = 21600
+
+    # Batch AI endpoints (/api/v1/ai/<operation>/batch)
+    AI_BATCH_MAX_ITEMS: int = 100
+    AI_BATCH_TIMEOUT_SECONDS: float = 30.0  # items still running after this are returned as "timeout"
+    AI_RESULT_CACHE_SIZE: int = 5000
+
+    # Article chat (/api/v1/ai/chat): sessions keep Ollama's token context between turns
+    AI_CHAT_MAX_SESSIONS: int = 1000
+    AI_CHAT_SESSION_TTL_SECONDS: int = 1800
+    AI_CHAT_MAX_CONTEXT_TOKENS: int = 6000  # past this the next turn restarts from the article and recent turns
+    AI_CHAT_HISTORY_TURNS: int = 4
+    AI_CHAT_FLUSH_SECONDS: float = 2.0
+    AI_CHAT_FLUSH_MAX_ROWS: int = 200
+
+    # AI health checks (/api/v1/ai/health)
+    AI_HEALTH_CACHE_SECONDS: float = 5.0
+    AI_HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    AI_HEALTH_TRAFFIC_WINDOW_SECONDS: int = 300
+    AI_HEALTH_MAX_ERROR_RATE: float = 0.5  # above this (with enough traffic) the service reports degraded
+
+    # Embeddings for related articles
+    EMBEDDING_BACKEND: str = "ollama"  # "ollama" or "hash" (deterministic local model)
+    EMBEDDING_MODEL: str = "nomic-embed-text"
+    EMBEDDING_HASH_DIM: int = 256
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_INDEX_DIR: str = "data/embeddings"
+
+    # Trending computation
+    TRENDING_REFRESH_SECONDS: int = 300
+    TRENDING_WINDOW_HOURS: int = 48
+    TRENDING_LIMIT: int = 50
+    TRENDING_CATEGORY_LIMIT: int = 10
+    TRENDING_HALF_LIFE_HOURS: float = 6.0
+
+    # Category feed cache
+    CATEGORY_FEED_REFRESH_SECONDS: int = 300
+    CATEGORY_FEED_ARTICLES_PER_FEED: int = 5
+
+    # News facet counts: recounted so articles stored by other workers and importers show up
+    FACET_REFRESH_SECONDS: int = 300
+
+    # Write-behind buffer for view/share/read events
+    EVENT_LOG_DIR: str = "data/events"
+    EVENT_BUFFER_FLUSH_SECONDS: float = 5.0
+    EVENT_BUFFER_MAX_EVENTS: int = 5000
+
+    # Reading history retention
+    READING_HISTORY_RETENTION_DAYS: int = 90
+    READING_HISTORY_ROLLUP_SECONDS: int = 21600
+
+    # Server-side RSS aggregation
+    RSS_AGGREGATE_TTL_SECONDS: int = 120
+    RSS_AGGREGATE_MAX_CONCURRENCY: int = 10
+    RSS_AGGREGATE_MAX_ITEMS_PER_FEED: int = 50
+    RSS_AGGREGATE_MAX_FEEDS: int = 50
+    RSS_AGGREGATE_CACHE_MAX_FEEDS: int = 500
+    RSS_AGGREGATE_ALLOW_PRIVATE_HOSTS: bool = False  # only for development against local feeds
+
+    # AI enrichment job queue
+    AI_JOB_WORKERS: int = 2
+    AI_JOB_MAX_ATTEMPTS: int = 3
+    AI_JOB_POLL_SECONDS: float = 5.0
+    AI_JOB_STALE_SECONDS: int = 600
+    AI_JOB_RETRY_BASE_SECONDS: float = 30.0  # doubled after every failed attempt
+    AI_JOB_RETRY_MAX_SECONDS: float = 900.0
+
+    # In-app news ingestion
+    INGEST_NEWSAPI_CATEGORIES: List[str] = ["technology", "business", "science", "health", "general"]
+    INGEST_INITIAL_LOOKBACK_DAYS: int = 2
+    INGEST_MIN_INTERVAL_SECONDS: int = 300  # between triggered runs; protects the NewsAPI quota
+    INGEST_NEWSAPI_PAGE_SIZE: int = 100
+    INGEST_NEWSAPI_MAX_PAGES: int = 10  # per category and run, paging back to the high-water mark
+
+    # Schema migrations: apply pending migrations at startup (disable to require `python migrate.py upgrade`)
+    DB_AUTO_MIGRATE: bool = True
+
+    # Article serialization
+    ARTICLE_FRAGMENT_CACHE_SIZE: int = 5000
+
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "application/json", "application/xml", "application/rss+xml", "text/"
+    ]
+
+    # Logging and request tracing (TRACE_EXPORTER: log = one JSON line per trace on "app.trace", otlp = OTLP/HTTP collector, none)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # text or json
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.05
+    TRACE_SLOW_MS: float = 1000.0  # unsampled requests slower than this are still reported (root span only)
+    TRACE_MAX_SPANS: int = 256
+    TRACE_EXPORTER: str = "log"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACE_SERVICE_NAME: str = "dscvr-backend"
+    TRACE_EXPORT_SECONDS: float = 5.0
+    TRACE_EXPORT_QUEUE_SIZE: int = 10000
+
+    # SQL statement statistics (/performance/queries), slow-query log and N+1 detection
+    QUERY_STATS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 10  # same statement this many times in one request
+    QUERY_STATS_MAX_STATEMENTS: int = 500
+
     # Cache configuration (in-memory for now)
     CACHE_TTL: int = 3600
     
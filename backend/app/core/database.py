@@ -1,12 +1,21 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import QueuePool
 import os
+import time
+import zlib
 from dotenv import load_dotenv
 
-# Load environment variables from parent directory
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env'))
+# Load environment variables once for the whole process: the repository root .env
+# takes precedence over backend/.env (load_dotenv never overrides a variable already set)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for env_path in (os.path.join(os.path.dirname(BACKEND_DIR), '.env'), os.path.join(BACKEND_DIR, '.env')):
+    load_dotenv(env_path)
+
+# Settings-backed modules are imported only once .env has been loaded
+from app.core.query_stats import query_stats  # noqa: E402
+from app.core.tracing import tracer  # noqa: E402
 
 # Database URL - PostgreSQL only
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -34,6 +43,39 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+# Statement instrumentation: timing and counts for query_stats, plus a span inside sampled traces
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+    context._trace_span = tracer.start_span("db.query", kind="client", statement=statement[:300], executemany=executemany)
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - context._query_started) * 1000
+    tracer.end_span(context._trace_span, rows=cursor.rowcount)
+    if query_stats.enabled:
+        query_stats.record(statement, duration_ms, cursor.rowcount)
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    if context is None or not hasattr(context, "_query_started"):
+        return
+    tracer.end_span(context._trace_span, error=exception_context.original_exception)
+    if query_stats.enabled:
+        duration_ms = (time.perf_counter() - context._query_started) * 1000
+        query_stats.record(exception_context.statement or "", duration_ms, 0, error=True)
+
+def try_advisory_xact_lock(db: Session, name: str) -> bool:
+    """Take a named PostgreSQL advisory lock for the rest of the session's transaction.
+
+    Returns False when another session holds it. Other databases have no
+    advisory locks and always get True (SQLite serializes writers anyway).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": zlib.crc32(name.encode("utf-8"))}).scalar())
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,54 @@
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return 'W/"' + digest[:20] + '"'
+
+
+def cache_control_header(max_age: int, private: bool = False) -> str:
+    return f"{'private' if private else 'public'}, max-age={max_age}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of ``If-None-Match`` (which may list several tags) against ``etag``"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in header.split(","))
+
+
+def conditional_response(request: Request, body: bytes, etag: str, max_age: int = 60, private: bool = False) -> Response:
+    """Serve a pre-serialized JSON body, or 304 when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": cache_control_header(max_age, private)}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def http_cache(stamp: Callable[..., Any], max_age: int = 60, private: bool = False):
+    """Route dependency adding ETag/Cache-Control and answering 304 before the handler runs.
+
+    ``stamp`` is itself a dependency (it may take ``Request``, the current
+    user, a session, ...) returning a cheap version value such as
+    ``max(updated_at)`` or a row count read from the database (in-process
+    counters go stale on other workers). The ETag is derived from the
+    stamp and the request URL, so the handler body only runs when the
+    client's copy is out of date::
+
+        @router.get("/trending", dependencies=[http_cache(trending_stamp, max_age=60)])
+    """
+    cache_control = cache_control_header(max_age, private)
+
+    async def dependency(request: Request, response: Response, version: Any = Depends(stamp)):
+        etag = make_etag(request.url.path, request.url.query, version)
+        if etag_matches(request, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
+
+    return Depends(dependency)
@@ -0,0 +1,64 @@
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Newest revision in migrations/versions. Startup compares this with the
+# alembic_version row instead of loading the migration scripts;
+# `python migrate.py check` fails if the two drift apart.
+SCHEMA_HEAD = "0007"
+
+# Revision matching the schema that create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("prepend_sys_path", BACKEND_DIR)
+    return config
+
+
+def current_revision() -> Optional[str]:
+    """The database's schema version, or None if it has never been migrated"""
+    with engine.connect() as conn:
+        try:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            return None
+
+
+def upgrade(revision: str = "head"):
+    """Apply migrations, adopting databases that were built by create_all"""
+    from alembic import command
+
+    config = alembic_config()
+    if current_revision() is None and inspect(engine).has_table("users"):
+        logger.info(f"Unversioned database with existing tables; stamping baseline {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+
+def ensure_schema():
+    """Startup check: one SELECT when the schema is current, migrations only when it is behind"""
+    revision = current_revision()
+    if revision == SCHEMA_HEAD:
+        return
+    if not settings.DB_AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at {revision or 'no version'}, expected {SCHEMA_HEAD}; "
+            f"run `python migrate.py upgrade`"
+        )
+    logger.info(f"Database schema is at {revision or 'no version'}; migrating to {SCHEMA_HEAD}")
+    upgrade(SCHEMA_HEAD)
@@ -0,0 +1,200 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.tracing import current_span, route_template
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists and VALUES rows differ only in their number of placeholders
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%\([\w]+\)s|:\w+|\$\d+)\s*,)+\s*(?:\?|%\([\w]+\)s|:\w+|\$\d+)\s*\)")
+NUMBERED_PARAM = re.compile(r"%\((\w+?)_\d+\)s")
+WHITESPACE = re.compile(r"\s+")
+OTHER_STATEMENTS = "<other statements>"
+
+
+def normalize(statement: str) -> str:
+    statement = WHITESPACE.sub(" ", statement).strip()
+    statement = NUMBERED_PARAM.sub(r"%(\1)s", statement)
+    return PLACEHOLDER_LIST.sub("(...)", statement)
+
+
+class StatementStats:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+
+
+class ScopeQueries:
+    """Statements issued inside one request (or importer run / job)"""
+
+    __slots__ = ("name", "count", "total_ms", "statements")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: Counter = Counter()
+
+
+_scope: ContextVar[Optional[ScopeQueries]] = ContextVar("query_scope", default=None)
+
+
+class QueryStats:
+    """Per-statement SQL counters fed by the engine event hooks in database.py.
+
+    Statements are grouped by their normalized text (whitespace collapsed,
+    IN lists folded), with count, total/max time and rows per group, so the
+    top statements by total time show where the database time goes. Each
+    request (or importer run) also gets its own tally through a contextvar:
+    when one statement repeats QUERY_N_PLUS_ONE_THRESHOLD times in a single
+    scope it is reported as an N+1 pattern for that route. Statements slower
+    than SLOW_QUERY_MS are logged with the request id.
+    """
+
+    def __init__(self):
+        self.enabled = settings.QUERY_STATS_ENABLED
+        self.slow_ms = settings.SLOW_QUERY_MS
+        self.n_plus_one_threshold = settings.QUERY_N_PLUS_ONE_THRESHOLD
+        self.max_statements = settings.QUERY_STATS_MAX_STATEMENTS
+        self._statements: Dict[str, StatementStats] = {}
+        self._normalized: Dict[str, str] = {}
+        self._n_plus_one: Dict[Tuple[str, str], List] = {}
+        self._lock = threading.Lock()
+        self.slow_queries = 0
+        self.started_at = time.time()
+
+    def _normalize(self, statement: str) -> str:
+        normalized = self._normalized.get(statement)
+        if normalized is None:
+            normalized = normalize(statement)
+            if len(self._normalized) >= self.max_statements * 4:
+                self._normalized.clear()
+            self._normalized[statement] = normalized
+        return normalized
+
+    def record(self, statement: str, duration_ms: float, rows: int, error: bool = False):
+        """Called from after_cursor_execute / handle_error"""
+        normalized = self._normalize(statement)
+        with self._lock:
+            stats = self._statements.get(normalized)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    normalized = OTHER_STATEMENTS
+                stats = self._statements.setdefault(normalized, StatementStats())
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.rows += max(rows, 0)
+            stats.errors += error
+
+        scope = _scope.get()
+        if scope is not None:
+            scope.count += 1
+            scope.total_ms += duration_ms
+            scope.statements[normalized] += 1
+
+        if duration_ms >= self.slow_ms:
+            with self._lock:
+                self.slow_queries += 1
+            logger.warning(f"Slow query ({duration_ms:.0f}ms, {max(rows, 0)} rows): {normalized[:500]}")
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[ScopeQueries]:
+        """Tally statements issued inside the block and check them for N+1 patterns at the end"""
+        queries = ScopeQueries(name)
+        token = _scope.set(queries)
+        try:
+            yield queries
+        finally:
+            _scope.reset(token)
+            self._finish(queries)
+
+    def _finish(self, queries: ScopeQueries):
+        if not queries.count:
+            return
+        span = current_span()
+        if span is not None:
+            span.set(db_queries=queries.count, db_ms=round(queries.total_ms, 2))
+        for statement, count in queries.statements.items():
+            if count < self.n_plus_one_threshold or statement == OTHER_STATEMENTS:
+                continue
+            key = (queries.name, statement)
+            with self._lock:
+                seen = self._n_plus_one.get(key)
+                if seen is None:
+                    seen = self._n_plus_one[key] = [0, 0]
+                seen[0] += 1
+                seen[1] = max(seen[1], count)
+            if seen[0] == 1:
+                # Once per route and statement; later occurrences are only counted
+                logger.warning(f"Possible N+1 in {queries.name}: statement ran {count} times: {statement[:300]}")
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> dict:
+        with self._lock:
+            items = [(statement, stats) for statement, stats in self._statements.items()]
+            n_plus_one = [
+                {"scope": scope, "statement": statement, "occurrences": seen[0], "max_per_scope": seen[1]}
+                for (scope, statement), seen in self._n_plus_one.items()
+            ]
+        key = {
+            "total_ms": lambda item: item[1].total_ms,
+            "count": lambda item: item[1].count,
+            "max_ms": lambda item: item[1].max_ms,
+        }[order_by]
+        items.sort(key=key, reverse=True)
+        return {
+            "since": self.started_at,
+            "statements_tracked": len(items),
+            "total_queries": sum(stats.count for _, stats in items),
+            "total_ms": round(sum(stats.total_ms for _, stats in items), 2),
+            "slow_queries": self.slow_queries,
+            "slow_query_ms": self.slow_ms,
+            "top": [
+                {
+                    "statement": statement,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ms, 2),
+                    "mean_ms": round(stats.total_ms / stats.count, 3),
+                    "max_ms": round(stats.max_ms, 2),
+                    "rows": stats.rows,
+                    "errors": stats.errors,
+                }
+                for statement, stats in items[:limit]
+            ],
+            "n_plus_one": sorted(n_plus_one, key=lambda entry: -entry["occurrences"]),
+        }
+
+
+class QueryStatsMiddleware:
+    """Per-request statement tally, named after the route template once routing has run"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not query_stats.enabled:
+            await self.app(scope, receive, send)
+            return
+        with query_stats.scope(f"{scope['method']} {scope['path']}") as queries:
+            await self.app(scope, receive, send)
+            template = route_template(scope)
+            if template is not None:
+                queries.name = f"{scope['method']} {template}"
+
+
+# Global query stats instance
+query_stats = QueryStats()
@@ -14,6 +14,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -68,6 +69,18 @@ async def get_current_user(
     
     return user
 
+async def get_current_user_optional(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Get the current user if a valid token was sent, otherwise None."""
+    if not token:
+        return None
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+    return db.query(User).filter(User.id == int(payload["sub"])).first()
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,439 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+trace_logger = logging.getLogger("app.trace")
+
+# OTLP span kinds
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+KINDS = {"internal": KIND_INTERNAL, "server": KIND_SERVER, "client": KIND_CLIENT}
+
+# version-traceid-parentid-flags, lowercase hex (W3C Trace Context)
+TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$")
+# Client-supplied X-Request-ID values are echoed and logged, so only short plain tokens are kept
+REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def current_span() -> Optional["Span"]:
+    return _current_span.get()
+
+
+class Span:
+    __slots__ = ("trace", "parent", "name", "kind", "span_id", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace: "Trace", parent: Optional["Span"], name: str, kind: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.parent = parent
+        self.name = name
+        self.kind = kind
+        self.span_id = os.urandom(8).hex()
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class Trace:
+    __slots__ = ("trace_id", "request_id", "sampled", "spans", "dropped")
+
+    def __init__(self, trace_id: str, request_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.request_id = request_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.dropped = 0
+
+
+def _parse_traceparent(header: Optional[str]):
+    """(trace id, parent span id, sampled) from a W3C traceparent header, or None"""
+    match = TRACEPARENT.match(header.strip()) if header else None
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags, rest = match.groups()
+    # Version ff is invalid; version 00 has exactly four fields
+    if version == "ff" or (version == "00" and rest) or trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+class Tracer:
+    """Request tracing with head sampling and cheap no-op spans.
+
+    Every request (or background job) gets a request id and a root span;
+    a fraction TRACE_SAMPLE_RATE of them is sampled, and only sampled traces
+    record child spans, so an unsampled request costs one random() and a
+    couple of contextvar writes. Traces that were not sampled but took longer
+    than TRACE_SLOW_MS are still reported with their root span alone. Spans
+    follow the request into worker threads (asyncio.to_thread and sync
+    endpoints copy contextvars). Finished traces go to the ``app.trace``
+    logger as one JSON line each, or to an OTLP/HTTP collector.
+    """
+
+    def __init__(self):
+        self.enabled = settings.TRACING_ENABLED
+        self.sample_rate = settings.TRACE_SAMPLE_RATE
+        self.slow_ms = settings.TRACE_SLOW_MS
+        self.max_spans = settings.TRACE_MAX_SPANS
+        self.exporter = settings.TRACE_EXPORTER
+        self._pending: Deque[dict] = deque(maxlen=settings.TRACE_EXPORT_QUEUE_SIZE)
+        self._client = None
+        self.stats = {"traces": 0, "sampled": 0, "slow": 0, "exported": 0, "export_errors": 0}
+
+    # -- traces ------------------------------------------------------------
+
+    @contextmanager
+    def trace(self, name: str, kind: str = "server", request_id: Optional[str] = None,
+              traceparent: Optional[str] = None, sampled: Optional[bool] = None, **attributes) -> Iterator[Optional[Span]]:
+        """Root span for one request or job; also sets the request id seen by log records.
+
+        `sampled` overrides the sampling decision (command-line importers always trace).
+        """
+        request_id = request_id or uuid.uuid4().hex[:16]
+        request_token = _request_id.set(request_id)
+        if not self.enabled:
+            try:
+                yield None
+            finally:
+                _request_id.reset(request_token)
+            return
+
+        parent = _parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_span_id, parent_sampled = parent
+        else:
+            trace_id, parent_span_id, parent_sampled = os.urandom(16).hex(), None, random.random() < self.sample_rate
+        sampled = parent_sampled if sampled is None else sampled
+        trace = Trace(trace_id, request_id, sampled)
+        root = Span(trace, None, name, KINDS[kind], attributes)
+        if parent_span_id:
+            root.attributes["parent_span_id"] = parent_span_id
+        span_token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            try:
+                # Still inside the request context, so the trace line carries its request id
+                self._finish(root)
+            finally:
+                _current_span.reset(span_token)
+                _request_id.reset(request_token)
+
+    def start_span(self, name: str, kind: str = "internal", **attributes) -> Optional[Span]:
+        """Child of the current span when its trace is sampled; None (and nothing recorded) otherwise.
+
+        The span is not made current: use span() for spans that have children.
+        """
+        parent = _current_span.get()
+        if parent is None or not parent.trace.sampled:
+            return None
+        trace = parent.trace
+        if len(trace.spans) >= self.max_spans:
+            trace.dropped += 1
+            return None
+        span = Span(trace, parent, name, KINDS[kind], attributes)
+        trace.spans.append(span)
+        return span
+
+    @staticmethod
+    def end_span(span: Optional[Span], error: Optional[BaseException] = None, **attributes):
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if attributes:
+            span.attributes.update(attributes)
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+        """Child span around a block, current for spans opened inside it"""
+        span = self.start_span(name, kind, **attributes)
+        if span is None:
+            yield None
+            return
+        _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            # set() rather than reset(): async generators may close in another task's context
+            _current_span.set(span.parent)
+
+    # -- export ------------------------------------------------------------
+
+    def _finish(self, root: Span):
+        trace = root.trace
+        self.stats["traces"] += 1
+        if trace.sampled:
+            self.stats["sampled"] += 1
+        elif root.duration_ms >= self.slow_ms or root.error:
+            self.stats["slow"] += 1
+        else:
+            return
+        if self.exporter == "log":
+            record = self._as_log_record(root)
+            trace_logger.info(json.dumps(record, default=str), extra={"trace": record})
+        elif self.exporter == "otlp":
+            self._pending.extend(self._as_otlp_spans(root))
+
+    @staticmethod
+    def _as_log_record(root: Span) -> dict:
+        trace = root.trace
+        record = {
+            "trace_id": trace.trace_id,
+            "request_id": trace.request_id,
+            "name": root.name,
+            "sampled": trace.sampled,
+            "duration_ms": round(root.duration_ms, 2),
+            **root.attributes,
+        }
+        if root.error:
+            record["error"] = root.error
+        if trace.spans:
+            record["spans"] = [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent.span_id,
+                    "offset_ms": round((span.start_ns - root.start_ns) / 1e6, 2),
+                    "duration_ms": round(span.duration_ms, 2),
+                    **({"error": span.error} if span.error else {}),
+                    **span.attributes,
+                }
+                for span in trace.spans
+            ]
+        if trace.dropped:
+            record["spans_dropped"] = trace.dropped
+        return record
+
+    @staticmethod
+    def _otlp_value(value: Any) -> dict:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _as_otlp_spans(self, root: Span) -> List[dict]:
+        spans = []
+        for span in [root, *root.trace.spans]:
+            attributes = dict(span.attributes)
+            if span is root:
+                attributes["request_id"] = root.trace.request_id
+            otlp = {
+                "traceId": root.trace.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": [{"key": k, "value": self._otlp_value(v)} for k, v in attributes.items() if v is not None],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            parent_id = span.parent.span_id if span.parent else root.attributes.get("parent_span_id")
+            if parent_id:
+                otlp["parentSpanId"] = parent_id
+            spans.append(otlp)
+        return spans
+
+    async def export_pending(self) -> int:
+        """Send queued spans to the OTLP collector; returns spans sent"""
+        if not self._pending:
+            return 0
+        import httpx
+
+        spans = list(self._pending)
+        self._pending.clear()
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": spans}],
+        }]}
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=5.0)
+        try:
+            response = await self._client.post(settings.TRACE_OTLP_ENDPOINT, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self.stats["export_errors"] += 1
+            logger.warning(f"Trace export to {settings.TRACE_OTLP_ENDPOINT} failed ({len(spans)} spans dropped): {e}")
+            return 0
+        self.stats["exported"] += len(spans)
+        return len(spans)
+
+    async def run_periodically(self, interval: Optional[float] = None):
+        """Background OTLP export loop started from the application lifespan (idle for the log exporter)"""
+        if self.exporter != "otlp":
+            return
+        interval = interval or settings.TRACE_EXPORT_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.export_pending()
+            except Exception as e:
+                logger.error(f"Trace export failed: {e}")
+
+    async def close(self):
+        if self.exporter == "otlp":
+            await self.export_pending()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def snapshot(self) -> dict:
+        return {"exporter": self.exporter if self.enabled else "disabled", "sample_rate": self.sample_rate,
+                "pending_spans": len(self._pending), **self.stats}
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """/api/v1/articles/{article_id} for /api/v1/articles/42 (routes in included routers only know their own suffix)"""
+    route = scope.get("route")
+    if route is None:
+        return None
+    try:
+        rendered = route.path.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return None
+    path = scope["path"]
+    if not path.endswith(rendered):
+        return None
+    return path[:len(path) - len(rendered)] + route.path
+
+
+class TracingMiddleware:
+    """Root span per HTTP request; honours X-Request-ID and traceparent and echoes X-Request-ID"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id")
+        if not request_id or not REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex[:16]
+        status = {"code": 0}
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        with tracer.trace(
+            f"{scope['method']} {scope['path']}", request_id=request_id,
+            traceparent=headers.get("traceparent"), method=scope["method"], path=scope["path"],
+        ) as root:
+            await self.app(scope, receive, send_with_request_id)
+            if root is not None:
+                template = route_template(scope)
+                if template is not None:
+                    # The route template groups /articles/1 and /articles/2 under one name
+                    root.name = f"{scope['method']} {template}"
+                root.set(status=status["code"])
+
+
+# -- logging -----------------------------------------------------------------
+
+class RequestContextFilter(logging.Filter):
+    """Adds request_id, trace_id and span_id of the current request to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = _current_span.get()
+        record.request_id = _request_id.get() or "-"
+        record.trace_id = span.trace.trace_id if span is not None else None
+        record.span_id = span.span_id if span is not None else None
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        trace = getattr(record, "trace", None)
+        if trace is not None:
+            # Finished traces are embedded as an object rather than a JSON string inside the message
+            entry["message"] = f"trace {trace['name']}"
+            entry["trace"] = trace
+        else:
+            entry["message"] = record.getMessage()
+        request_id = getattr(record, "request_id", "-")
+        if request_id != "-":
+            entry["request_id"] = request_id
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+            entry["span_id"] = record.span_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """Root logging for the API and the command-line importers (LOG_LEVEL, LOG_FORMAT=text|json)"""
+    with _configure_lock:
+        root = logging.getLogger()
+        if any(getattr(handler, "_app_handler", False) for handler in root.handlers):
+            return
+        handler = logging.StreamHandler(sys.stderr)
+        handler._app_handler = True
+        handler.addFilter(RequestContextFilter())
+        if (fmt or settings.LOG_FORMAT) == "json":
+            handler.setFormatter(JSONFormatter())
+        else:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        root.addHandler(handler)
+        root.setLevel((level or settings.LOG_LEVEL).upper())
+
+
+# Global tracer instance
+tracer = Tracer()
@@ -1,6 +1,10 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
-from .article import Article, ArticleCreate, ArticleUpdate, ArticleInDB, ReadingHistory, ReadingHistoryCreate, ReadingHistoryInDB, AIChat, AIChatCreate, AIChatInDB
+from .article import Article, ArticleCreate, ArticleUpdate, ArticleInDB, ReadingHistory, ReadingHistoryCreate, ReadingHistoryInDB, ReadingHistoryDaily, ReadingHistoryPage, ReadingHistoryDailyInDB, AIChat, AIChatCreate, AIChatInDB
 from .rss_feed import RSSFeed, RSSFeedCreate, RSSFeedUpdate, RSSFeedInDB, UserFeedSubscription, UserFeedSubscriptionCreate, UserFeedSubscriptionUpdate, UserFeedSubscriptionInDB, FeedCategory, FeedCategoryCreate, FeedCategoryInDB
+from .ai_job import AIJob, AIJobInDB
+from .ingestion import IngestionState
+from .corpus import CorpusTerm
+from .trending import TrendingState
 
 __all__ = [
     # User models
@@ -9,10 +13,23 @@ __all__ = [
     # Article models
     "Article", "ArticleCreate", "ArticleUpdate", "ArticleInDB",
     "ReadingHistory", "ReadingHistoryCreate", "ReadingHistoryInDB",
+    "ReadingHistoryDaily", "ReadingHistoryPage", "ReadingHistoryDailyInDB",
     "AIChat", "AIChatCreate", "AIChatInDB",
     
     # RSS Feed models
     "RSSFeed", "RSSFeedCreate", "RSSFeedUpdate", "RSSFeedInDB",
     "UserFeedSubscription", "UserFeedSubscriptionCreate", "UserFeedSubscriptionUpdate", "UserFeedSubscriptionInDB",
     "FeedCategory", "FeedCategoryCreate", "FeedCategoryInDB",
+    
+    # AI job models
+    "AIJob", "AIJobInDB",
+    
+    # Ingestion models
+    "IngestionState",
+
+    # Corpus statistics
+    "CorpusTerm",
+
+    # Trending state
+    "TrendingState",
 ]
@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+
+# Job priorities: lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKFILL = 10
+
+class AIJob(Base):
+    __tablename__ = "ai_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    kind = Column(String(50), nullable=False, default="enrich")
+    priority = Column(Integer, nullable=False, default=PRIORITY_INTERACTIVE)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    result = Column(Text, nullable=True)  # JSON string of job output
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    available_at = Column(DateTime(timezone=True), nullable=True)  # retry backoff: not claimed before this
+
+    # Indexes for claiming the next job and per-article deduplication
+    __table_args__ = (
+        Index('idx_ai_job_status_priority', 'status', 'priority', 'id'),
+        Index('idx_ai_job_article_status', 'article_id', 'status'),
+        # At most one queued/running job per article and kind
+        Index(
+            'uq_ai_job_active_article_kind', 'article_id', 'kind', unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+# Pydantic models for API
+class AIJobInDB(BaseModel):
+    id: int
+    article_id: int
+    kind: str
+    priority: int
+    status: str
+    attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    available_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
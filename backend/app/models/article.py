@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
-from pydantic import BaseModel, HttpUrl
+from app.models.types import JSONType
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
+import json
 
 class Article(Base):
     __tablename__ = "articles"
@@ -18,7 +20,7 @@ class Article(Base):
     published_date = Column(DateTime(timezone=True), nullable=True)
     source = Column(String(255), nullable=True, index=True)
     category = Column(String(100), nullable=True, index=True)
-    tags = Column(Text, nullable=True)  # JSON string of tags
+    tags = Column(JSONType, nullable=True)  # List of tags
     image_url = Column(String(2000), nullable=True)
     word_count = Column(Integer, default=0)
     reading_time = Column(Integer, default=0)  # in minutes
@@ -26,7 +28,7 @@ class Article(Base):
     # AI-generated content
     ai_summary = Column(Text, nullable=True)
     ai_sentiment = Column(String(50), nullable=True)  # positive, negative, neutral
-    ai_topics = Column(Text, nullable=True)  # JSON string of extracted topics
+    ai_topics = Column(JSONType, nullable=True)  # List of extracted topics
     
     # Metadata
     is_featured = Column(Boolean, default=False)
@@ -48,6 +50,12 @@ class Article(Base):
         Index('idx_article_published_date', 'published_date'),
         Index('idx_article_source_category', 'source', 'category'),
         Index('idx_article_trending_featured', 'is_trending', 'is_featured'),
+        Index('idx_article_feed_published', 'rss_feed_id', 'published_date'),
+        # GIN indexes for tag/topic containment filters (PostgreSQL only)
+        Index('idx_article_tags_gin', 'tags', postgresql_using='gin',
+              postgresql_ops={'tags': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_article_ai_topics_gin', 'ai_topics', postgresql_using='gin',
+              postgresql_ops={'ai_topics': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
     )
 
 class ReadingHistory(Base):
@@ -66,8 +74,24 @@ class ReadingHistory(Base):
     
     # Composite index for efficient queries
     __table_args__ = (
-        Index('idx_reading_history_user_article', 'user_id', 'article_id'),
+        Index('uq_reading_history_user_article', 'user_id', 'article_id', unique=True),
         Index('idx_reading_history_read_at', 'read_at'),
+        Index('idx_reading_history_user_read_at', 'user_id', 'read_at'),
+    )
+
+class ReadingHistoryDaily(Base):
+    """Per-user daily rollup of reading history rows older than the retention window"""
+    __tablename__ = "reading_history_daily"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    articles_read = Column(Integer, default=0)
+    completed_count = Column(Integer, default=0)  # Articles read to >= 90%
+    total_time_spent = Column(Integer, default=0)  # Seconds
+    
+    __table_args__ = (
+        Index('idx_reading_history_daily_user_day', 'user_id', 'day', unique=True),
     )
 
 class AIChat(Base):
@@ -136,13 +160,24 @@ class ArticleInDB(ArticleBase):
     class Config:
         from_attributes = True
 
+    @field_validator("tags", "ai_topics", mode="before")
+    @classmethod
+    def parse_json_list(cls, value):
+        # Rows written before the JSON column migration may still hold JSON strings
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                return []
+        return value
+
 class ArticleResponse(ArticleInDB):
     pass
 
 class ReadingHistoryCreate(BaseModel):
     article_id: int
-    reading_progress: int = 0
-    time_spent: int = 0
+    reading_progress: int = Field(0, ge=0, le=100)
+    time_spent: int = Field(0, ge=0)
 
 class ReadingHistoryInDB(BaseModel):
     id: int
@@ -155,6 +190,19 @@ class ReadingHistoryInDB(BaseModel):
     class Config:
         from_attributes = True
 
+class ReadingHistoryPage(BaseModel):
+    items: List[ReadingHistoryInDB]
+    next_cursor: Optional[str] = None
+
+class ReadingHistoryDailyInDB(BaseModel):
+    day: date
+    articles_read: int
+    completed_count: int
+    total_time_spent: int
+    
+    class Config:
+        from_attributes = True
+
 class AIChatCreate(BaseModel):
     question: str
     article_id: Optional[int] = None
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+
+from app.core.database import Base
+
+# Row whose document_count is the number of articles the statistics were built from
+TOTAL_DOCUMENTS_TERM = "__documents__"
+# Row whose document_count is the unix time the statistics were built
+BUILT_AT_TERM = "__built_at__"
+
+class CorpusTerm(Base):
+    """Document frequency of a term across articles, for IDF-weighted keyword extraction"""
+    __tablename__ = "corpus_terms"
+
+    term = Column(String(100), primary_key=True)
+    document_count = Column(Integer, nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class IngestionState(Base):
+    """Per-source high-water mark for incremental ingestion"""
+    __tablename__ = "ingestion_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_key = Column(String(255), unique=True, nullable=False)  # e.g. "newsapi:technology", "rss:12"
+    high_water_mark = Column(DateTime(timezone=True), nullable=True)  # Newest published_date ingested
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_fetched = Column(Integer, default=0)
+    last_saved = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index,
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.types import JSONType
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List
 from datetime import datetime
@@ -63,7 +64,7 @@ class UserFeedSubscription(Base):
     
     # User preferences for this feed
     priority = Column(Integer, default=1)  # 1-5, higher = more important
-    categories_filter = Column(Text, nullable=True)  # JSON string of categories to include
+    categories_filter = Column(JSONType, nullable=True)  # List of categories to include
     
     # Relationships
     user = relationship("User", back_populates="feed_subscriptions")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Float, Integer
+
+from app.core.database import Base
+
+class TrendingState(Base):
+    """Per-article counts and decayed velocity as of the last trending run, shared by every worker"""
+    __tablename__ = "trending_state"
+
+    article_id = Column(Integer, primary_key=True)
+    view_count = Column(Integer, nullable=False, default=0)
+    share_count = Column(Integer, nullable=False, default=0)
+    velocity = Column(Float, nullable=False, default=0.0)
+    computed_at = Column(DateTime(timezone=True), nullable=False)  # Same for every row of a run
@@ -0,0 +1,26 @@
+from typing import List
+
+from sqlalchemy import JSON, and_, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.database import engine
+
+# JSONB on PostgreSQL (GIN-indexable, supports @>), plain JSON elsewhere (SQLite stores it as text)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def json_array_contains(column, values: List[str]):
+    """Filter for rows whose JSON array ``column`` contains every item in ``values``.
+
+    On PostgreSQL this is ``column @> '[...]'``, which the ``jsonb_path_ops``
+    GIN indexes answer directly. Other backends fall back to one
+    ``EXISTS (SELECT 1 FROM json_each(column) ...)`` per value.
+    """
+    if engine.dialect.name == "postgresql":
+        return type_coerce(column, JSONB).contains(list(values))
+
+    clauses = []
+    for value in values:
+        items = func.json_each(column).table_valued("value")
+        clauses.append(exists(select(1).select_from(items).where(items.c.value == value)))
+    return and_(*clauses)
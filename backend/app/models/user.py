@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.types import JSONType
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -20,14 +21,20 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # User preferences
-    interests = Column(Text, nullable=True)  # JSON string of interests
-    reading_preferences = Column(Text, nullable=True)  # JSON string of preferences
+    interests = Column(JSONType, nullable=True)  # List of interests
+    reading_preferences = Column(JSONType, nullable=True)  # Preferences object
     
     # Relationships
     reading_history = relationship("ReadingHistory", back_populates="user")
     ai_chats = relationship("AIChat", back_populates="user")
     feed_subscriptions = relationship("UserFeedSubscription", back_populates="user")
 
+    # GIN index for interest containment queries (PostgreSQL only)
+    __table_args__ = (
+        Index('idx_user_interests_gin', 'interests', postgresql_using='gin',
+              postgresql_ops={'interests': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
+
 # Pydantic models for API
 class UserBase(BaseModel):
     email: str
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import Article
+from app.services.ai_service import ai_service
+from app.services.content_prep import content_digest
+from app.services.ollama_scheduler import AIServiceBusy, LANE_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("summary", "sentiment", "keywords", "questions")
+# Article columns that already hold an operation's result (written by enrichment jobs)
+ARTICLE_FIELDS = {"summary": "ai_summary", "sentiment": "ai_sentiment", "keywords": "ai_topics"}
+DEFAULT_SUMMARY_LENGTH = 200
+
+
+class AIResultCache:
+    """LRU of successful AI results keyed by (operation, variant, content digest)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Any, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class AIBatchService:
+    """Runs one AI operation over many texts or articles in a single request.
+
+    Items are resolved in three steps: articles whose stored enrichment
+    already answers the operation and texts whose result is in the LRU are
+    returned as ``cached``; the remaining texts are deduplicated by content
+    hash; each unique text then runs once through AIService, with at most
+    the scheduler's concurrency in flight per batch so one large batch does
+    not fill the interactive queue. Whatever has not finished when the batch
+    deadline passes is reported as ``timeout``; every item carries its own
+    status, so callers render what they got and retry the rest.
+    """
+
+    def __init__(self):
+        self.cache = AIResultCache(settings.AI_RESULT_CACHE_SIZE)
+        self.timeout = settings.AI_BATCH_TIMEOUT_SECONDS
+        self.stats = Counter()
+
+    async def _run_operation(self, operation: str, content: str, max_length: int, local_first: bool):
+        if operation == "summary":
+            return await ai_service.generate_summary(content, max_length, lane=LANE_INTERACTIVE)
+        if operation == "sentiment":
+            return await ai_service.analyze_sentiment(content, lane=LANE_INTERACTIVE, local_first=local_first)
+        if operation == "keywords":
+            return await ai_service.extract_keywords(content, lane=LANE_INTERACTIVE, local_first=local_first)
+        return await ai_service.generate_follow_up_questions(content, lane=LANE_INTERACTIVE)
+
+    async def _generate(self, semaphore: asyncio.Semaphore, operation: str, content: str,
+                        max_length: int, local_first: bool) -> Tuple[str, Any, Optional[str], int]:
+        """(status, result, error, retry_after) for one unique text"""
+        async with semaphore:
+            try:
+                result = await self._run_operation(operation, content, max_length, local_first)
+            except AIServiceBusy as e:
+                return "busy", None, str(e), e.retry_after
+            except Exception as e:
+                return "failed", None, str(e), 0
+        if not result:
+            return "failed", None, f"Unable to generate {operation}", 0
+        return "done", result, None, 0
+
+    def _load_articles(self, article_ids: List[int]) -> Dict[int, Article]:
+        db = SessionLocal()
+        try:
+            articles = db.query(Article).filter(Article.id.in_(set(article_ids))).all()
+            db.expunge_all()
+            return {article.id: article for article in articles}
+        finally:
+            db.close()
+
+    @staticmethod
+    def _stored(article: Article, field: str):
+        value = getattr(article, field)
+        # Legacy rows keep ai_topics as a JSON string
+        if field == "ai_topics" and isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                return None
+        return value
+
+    def _store_results(self, field: str, results: Dict[int, Any]):
+        """Write fresh results back to the articles so the next batch is served from the row"""
+        db = SessionLocal()
+        try:
+            for article_id, value in results.items():
+                db.execute(update(Article).where(Article.id == article_id).values({field: value}))
+            db.commit()
+        finally:
+            db.close()
+
+    async def run(self, operation: str, contents: Optional[List[str]] = None, article_ids: Optional[List[int]] = None,
+                  max_length: int = DEFAULT_SUMMARY_LENGTH, local_first: bool = False) -> dict:
+        """Per-item results for `contents` (in order) followed by `article_ids` (in order)"""
+        contents = contents or []
+        article_ids = article_ids or []
+        # Stored summaries were written at the default length; a custom length needs a fresh one
+        stored_field = ARTICLE_FIELDS.get(operation)
+        if operation == "summary" and max_length != DEFAULT_SUMMARY_LENGTH:
+            stored_field = None
+        variant = max_length if operation == "summary" else local_first if operation in ("sentiment", "keywords") else None
+
+        items: List[Dict[str, Any]] = [
+            {"index": i, "article_id": None, "status": None, "result": None, "error": None, "content": content}
+            for i, content in enumerate(contents)
+        ]
+        articles = await asyncio.to_thread(self._load_articles, article_ids) if article_ids else {}
+        for i, article_id in enumerate(article_ids, start=len(contents)):
+            item = {"index": i, "article_id": article_id, "status": None, "result": None, "error": None, "content": None}
+            article = articles.get(article_id)
+            if article is None:
+                item["status"], item["error"] = "not_found", "Article not found"
+            elif stored_field and self._stored(article, stored_field):
+                item["status"], item["result"] = "cached", self._stored(article, stored_field)
+            else:
+                item["content"] = article.content or article.description or article.title
+            items.append(item)
+
+        # Cache lookups and dedup: one generation per distinct text
+        pending: Dict[Tuple[str, Any, str], List[dict]] = {}
+        texts: Dict[Tuple[str, Any, str], str] = {}
+        for item in items:
+            content = item.pop("content")
+            if item["status"] is not None:
+                continue
+            if not content or not content.strip():
+                item["status"], item["error"] = "failed", "No content"
+                continue
+            key = (operation, variant, content_digest(content))
+            cached = self.cache.get(key)
+            if cached is not None:
+                item["status"], item["result"] = "cached", cached
+                continue
+            pending.setdefault(key, []).append(item)
+            texts[key] = content
+
+        retry_after = 0
+        if pending:
+            semaphore = asyncio.Semaphore(ai_service.scheduler.max_concurrency)
+            tasks = {
+                key: asyncio.create_task(self._generate(semaphore, operation, texts[key], max_length, local_first))
+                for key in pending
+            }
+            await asyncio.wait(tasks.values(), timeout=self.timeout)
+
+            fresh: Dict[int, Any] = {}
+            for key, task in tasks.items():
+                if task.done():
+                    status, result, error, wait = task.result()
+                else:
+                    task.cancel()
+                    status, result, error, wait = "timeout", None, f"Not finished within {self.timeout:g}s", 1
+                retry_after = max(retry_after, wait)
+                if status == "done":
+                    self.cache.put(key, result)
+                for item in pending[key]:
+                    item["status"], item["result"], item["error"] = status, result, error
+                    if status == "done" and item["article_id"] is not None and stored_field:
+                        fresh[item["article_id"]] = result
+            if fresh:
+                try:
+                    await asyncio.to_thread(self._store_results, stored_field, fresh)
+                except Exception as e:
+                    logger.error(f"Storing batch {operation} results failed: {e}")
+
+        counts = Counter(item["status"] for item in items)
+        self.stats["batches"] += 1
+        self.stats["items"] += len(items)
+        self.stats["generated"] += len(pending)
+        self.stats.update({f"items_{status}": count for status, count in counts.items()})
+        return {
+            "operation": operation,
+            "results": items,
+            "counts": dict(counts),
+            "unique_generated": len(pending),
+            "retry_after": retry_after,
+        }
+
+    def snapshot(self) -> dict:
+        return {"result_cache_entries": len(self.cache), **self.stats}
+
+
+# Global AI batch instance
+ai_batch = AIBatchService()
@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import AIChat, Article
+from app.services.ai_service import ai_service
+from app.services.content_prep import content_preparer
+from app.services.ollama_scheduler import LANE_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+CHAT_OPTIONS = {"temperature": 0.7, "top_p": 0.9, "num_predict": 400}
+
+
+class ChatSession:
+    """One reader's conversation about one article, kept in memory between turns"""
+
+    def __init__(self, session_id: str, user_id: int, article_id: Optional[int], preamble: str,
+                 turns: List[Tuple[str, str]]):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.article_id = article_id
+        self.preamble = preamble
+        self.turns = turns
+        # Ollama's token context after the last answer; None until the first turn, or after a reset
+        self.context: Optional[List[int]] = None
+        self.backend: Optional[str] = None
+        self.used_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+
+class ChatHistoryBuffer:
+    """Collects answered turns and writes them to ``ai_chats`` in batches.
+
+    Chat turns are append-only and nothing reads them on the hot path, so
+    instead of one INSERT and commit per turn they are flushed every
+    AI_CHAT_FLUSH_SECONDS (or once AI_CHAT_FLUSH_MAX_ROWS are waiting) as a
+    single executemany. Turns still in memory when the process dies are
+    lost; shutdown flushes them.
+    """
+
+    def __init__(self):
+        self.max_rows = settings.AI_CHAT_FLUSH_MAX_ROWS
+        self._rows: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {"rows_written": 0, "flushes": 0}
+
+    def add(self, row: dict) -> bool:
+        """Queue one turn; returns True when a flush is due"""
+        with self._lock:
+            self._rows.append(row)
+            return len(self._rows) >= self.max_rows
+
+    def pending(self) -> int:
+        return len(self._rows)
+
+    def has_pending(self, user_id: int) -> bool:
+        with self._lock:
+            return any(row["user_id"] == user_id for row in self._rows)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            db = SessionLocal()
+            try:
+                db.execute(insert(AIChat), rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    self._rows = rows + self._rows
+                raise
+            finally:
+                db.close()
+            self.stats["rows_written"] += len(rows)
+            self.stats["flushes"] += 1
+            return len(rows)
+
+    def flush_in_background(self):
+        """Start a flush on the running loop unless one is already in flight"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.create_task(asyncio.to_thread(self.flush))
+        self._flush_task.add_done_callback(self._flush_done)
+
+    @staticmethod
+    def _flush_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"AI chat history flush failed: {task.exception()}")
+
+    async def run_periodically(self, interval: Optional[float] = None):
+        """Background flush loop started from the application lifespan"""
+        interval = interval or settings.AI_CHAT_FLUSH_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"AI chat history flush failed: {e}")
+
+    def close(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Final AI chat history flush failed: {e}")
+
+
+class AIChatService:
+    """Article-scoped chat on top of Ollama's /api/generate.
+
+    The first turn sends the article (stored summary plus token-budgeted
+    lead text) together with the question; Ollama returns its token
+    context with the answer, and later turns send only the new question
+    plus that context, so the article is not re-tokenized and re-sent every
+    turn. Turns go back to the backend that answered the previous one while
+    it has room, where the prefix is most likely still in its KV cache.
+    Sessions live in an in-memory LRU; a session that expired or outgrew
+    AI_CHAT_MAX_CONTEXT_TOKENS is rebuilt from the article and its last few
+    turns in ``ai_chats``.
+    """
+
+    def __init__(self):
+        self.max_sessions = settings.AI_CHAT_MAX_SESSIONS
+        self.session_ttl = settings.AI_CHAT_SESSION_TTL_SECONDS
+        self.max_context_tokens = settings.AI_CHAT_MAX_CONTEXT_TOKENS
+        self.history_turns = settings.AI_CHAT_HISTORY_TURNS
+        self.history = ChatHistoryBuffer()
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self.stats = Counter()
+
+    # -- sessions ----------------------------------------------------------
+
+    def _get_session(self, session_id: Optional[str], user_id: int, article_id: Optional[int]) -> Optional[ChatSession]:
+        now = time.monotonic()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.used_at < self.session_ttl and len(self._sessions) <= self.max_sessions:
+                break
+            self._sessions.popitem(last=False)
+
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None or session.user_id != user_id or session.article_id != article_id:
+            return None
+        session.used_at = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _load_context(self, user_id: int, article_id: Optional[int]) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+        """(preamble, recent turns); preamble is None when the article does not exist"""
+        db = SessionLocal()
+        try:
+            article = None
+            if article_id is not None:
+                article = db.query(Article).filter(Article.id == article_id).first()
+                if article is None:
+                    return None, []
+            rows = db.query(AIChat.question, AIChat.answer).filter(
+                AIChat.user_id == user_id, AIChat.article_id == article_id
+            ).order_by(AIChat.created_at.desc(), AIChat.id.desc()).limit(self.history_turns).all()
+            return self._preamble(article), [(q, a) for q, a in reversed(rows)]
+        finally:
+            db.close()
+
+    @staticmethod
+    def _preamble(article: Optional[Article]) -> str:
+        if article is None:
+            return "You are a helpful assistant for a news reading app. Answer the reader's questions concisely.\n\n"
+        parts = [
+            "You are a helpful assistant for a news reading app. Answer the reader's questions about the article "
+            "below concisely, using the article as your main source and saying so when it does not cover something.\n",
+            f"Title: {article.title}",
+        ]
+        if article.ai_summary:
+            parts.append(f"Summary: {article.ai_summary}")
+        body = article.content or article.description
+        if body:
+            parts.append(f"Article:\n{content_preparer.prepare(body, 'chat')}")
+        return "\n".join(parts) + "\n\n"
+
+    async def open(self, user_id: int, article_id: Optional[int], session_id: Optional[str] = None) -> ChatSession:
+        """Existing session for this reader and article, or a new one; LookupError for an unknown article"""
+        session = self._get_session(session_id, user_id, article_id)
+        if session is not None:
+            return session
+        preamble, turns = await asyncio.to_thread(self._load_context, user_id, article_id)
+        if preamble is None:
+            raise LookupError("Article not found")
+        session = ChatSession(uuid.uuid4().hex, user_id, article_id, preamble, turns)
+        self._sessions[session.session_id] = session
+        self.stats["sessions"] += 1
+        return session
+
+    # -- turns -------------------------------------------------------------
+
+    def _prompt(self, session: ChatSession, question: str) -> str:
+        if session.context:
+            return f"\n\nReader: {question}\nAssistant:"
+        history = "".join(f"Reader: {q}\nAssistant: {a}\n\n" for q, a in session.turns[-self.history_turns:])
+        return f"{session.preamble}{history}Reader: {question}\nAssistant:"
+
+    async def reply(self, session: ChatSession, question: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream one answer as {"type": "delta"} events and a final {"type": "done"}.
+
+        Errors before the first event propagate (so the endpoint can answer
+        503/502); later ones end the stream with a {"type": "error"} event.
+        """
+        async with session.lock:
+            reused = bool(session.context)
+            prompt = self._prompt(session, question)
+            parts: List[str] = []
+            final: Dict[str, Any] = {}
+            started = time.monotonic()
+            first_token_ms = None
+            try:
+                async for message in ai_service.stream_generate(
+                    prompt, CHAT_OPTIONS, LANE_INTERACTIVE, context=session.context, prefer=session.backend
+                ):
+                    if message.get("done"):
+                        final = message
+                        break
+                    text = message.get("response", "")
+                    if text:
+                        if first_token_ms is None:
+                            first_token_ms = round((time.monotonic() - started) * 1000, 1)
+                        parts.append(text)
+                        yield {"type": "delta", "session_id": session.session_id, "text": text}
+            except Exception as e:
+                if not parts:
+                    raise
+                logger.warning(f"AI chat stream failed mid-answer: {e}")
+                yield {"type": "error", "session_id": session.session_id, "error": str(e)}
+                return
+
+            answer = "".join(parts).strip()
+            context = final.get("context")
+            if context and len(context) <= self.max_context_tokens:
+                session.context = context
+                session.backend = final.get("backend")
+            else:
+                # Too long to keep extending: the next turn starts over from the article and recent turns
+                session.context = None
+                self.stats["context_resets"] += 1
+            session.turns.append((question, answer))
+            del session.turns[:-self.history_turns]
+
+            self.stats["turns"] += 1
+            self.stats["turns_with_context" if reused else "turns_with_article_prompt"] += 1
+            self.stats["prompt_tokens_evaluated"] += final.get("prompt_eval_count", 0)
+            if self.history.add({
+                "user_id": session.user_id,
+                "article_id": session.article_id,
+                "question": question,
+                "answer": answer,
+                "context_type": "article-specific" if session.article_id is not None else "general",
+                "created_at": datetime.now(timezone.utc),
+            }):
+                self.history.flush_in_background()
+
+            yield {
+                "type": "done",
+                "session_id": session.session_id,
+                "answer": answer,
+                "context_reused": reused,
+                "first_token_ms": first_token_ms,
+            }
+
+    def snapshot(self) -> dict:
+        return {
+            "sessions_active": len(self._sessions),
+            "history_pending": self.history.pending(),
+            **self.history.stats,
+            **self.stats,
+        }
+
+
+# Global AI chat instance
+ai_chat = AIChatService()
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.ai_service import ai_service
+from app.services.ollama_pool import OllamaBackend, model_key
+from app.services.ollama_scheduler import AIServiceBusy, LANE_HEALTH
+
+logger = logging.getLogger(__name__)
+
+# Live traffic below this many calls in the window is too thin to judge the error rate
+MIN_TRAFFIC_SAMPLES = 10
+
+
+class AIHealthService:
+    """Health of the AI subsystem without running a generation.
+
+    The regular check asks each Ollama backend for /api/tags (is the model
+    installed) and /api/ps (is it loaded in memory), both answered without
+    touching the model, and combines that with error rate and latency of
+    recent real traffic. Results are cached for a few seconds and concurrent
+    probes share one check, so frequent liveness/readiness probes cost almost
+    nothing. A real generation is only run by the opt-in deep check, in the
+    scheduler's health lane so it never delays user requests.
+    """
+
+    def __init__(self):
+        self.cache_seconds = settings.AI_HEALTH_CACHE_SECONDS
+        self.probe_timeout = settings.AI_HEALTH_PROBE_TIMEOUT_SECONDS
+        self._report: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def check(self) -> dict:
+        """Cached health report; at most one probe round per cache period"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._report is None or time.monotonic() - self._checked_at >= self.cache_seconds:
+                self._report = await self._probe()
+                self._checked_at = time.monotonic()
+        age = time.monotonic() - self._checked_at
+        return {**self._report, "cache_age_seconds": round(age, 2)}
+
+    async def _probe_backend(self, backend: OllamaBackend, model: str) -> dict:
+        started = time.monotonic()
+        try:
+            tags, ps = await asyncio.gather(
+                backend.probe_client.get("/api/tags", timeout=self.probe_timeout),
+                backend.probe_client.get("/api/ps", timeout=self.probe_timeout),
+            )
+            tags.raise_for_status()
+            ps.raise_for_status()
+            installed = {m.get("model") or m.get("name") for m in tags.json().get("models", [])}
+            loaded = {m.get("model") or m.get("name") for m in ps.json().get("models", [])}
+        except (httpx.HTTPError, ValueError) as e:
+            return {"url": backend.url, "reachable": False, "error": str(e) or type(e).__name__}
+
+        # The router can use the fresh /api/ps answer for model affinity too
+        backend.loaded_models = loaded
+        backend.models_checked_at = time.monotonic()
+        return {
+            "url": backend.url,
+            "reachable": True,
+            "state": "ejected" if backend.ejected else "healthy",
+            "model_installed": model_key(model) in installed,
+            "model_loaded": model_key(model) in loaded,
+            "latency_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+
+    async def _probe(self) -> dict:
+        model = ai_service.model
+        backends = await asyncio.gather(*(self._probe_backend(b, model) for b in ai_service.backends.backends))
+        traffic = ai_service.backends.traffic.snapshot()
+        scheduler = ai_service.scheduler.snapshot()
+
+        usable = [b for b in backends if b["reachable"] and b["model_installed"]]
+        if not usable:
+            status = "unhealthy"
+        elif (
+            len(usable) < len(backends)
+            or (traffic["requests"] >= MIN_TRAFFIC_SAMPLES and traffic["error_rate"] > settings.AI_HEALTH_MAX_ERROR_RATE)
+        ):
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "service": "ai",
+            "model": model,
+            "model_loaded": any(b.get("model_loaded") for b in backends),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "backends": backends,
+            "traffic": traffic,
+            "scheduler": {
+                "in_flight": scheduler["in_flight"],
+                "max_concurrency": scheduler["max_concurrency"],
+                "waiting": sum(lane["waiting"] for lane in scheduler["lanes"].values()),
+            },
+        }
+
+    async def deep_check(self) -> dict:
+        """Run a one-token generation end to end (never cached)"""
+        started = time.monotonic()
+        try:
+            ok = await ai_service.ping(LANE_HEALTH)
+        except AIServiceBusy as e:
+            return {"ok": False, "busy": True, "error": str(e)}
+        except Exception as e:
+            logger.warning(f"AI deep health check failed: {e}")
+            return {"ok": False, "error": str(e)}
+        return {"ok": ok, "latency_ms": round((time.monotonic() - started) * 1000, 1)}
+
+
+# Global AI health instance
+ai_health = AIHealthService()
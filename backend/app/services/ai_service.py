@@ -1,162 +1,182 @@
-import os
-import httpx
-from typing import Optional, Dict, Any
 import json
+import logging
+from typing import Optional, Dict, Any, AsyncIterator, List
+
+from app.core.config import settings
+from app.core.tracing import tracer
+from app.services.content_prep import content_preparer
+from app.services.local_nlp import local_nlp
+from app.services.ollama_pool import OllamaPool
+from app.services.ollama_scheduler import AIServiceBusy, LANE_BACKGROUND, LANE_HEALTH, LANE_INTERACTIVE, ollama_scheduler
+
+logger = logging.getLogger(__name__)
 
 class AIService:
     def __init__(self):
-        self.ollama_url = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-        self.model = os.getenv("OLLAMA_MODEL", "llama2")
-        
-    async def generate_summary(self, content: str, max_length: int = 200) -> Optional[str]:
-        """Generate AI summary of article content"""
-        try:
-            prompt = f"""
-            Please provide a concise summary of the following article content in {max_length} characters or less:
-            
-            {content[:2000]}  # Limit content length for API
-            
-            Summary:
-            """
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.ollama_url}/api/generate",
+        self.model = settings.OLLAMA_MODEL
+        self.scheduler = ollama_scheduler
+        self.backends = OllamaPool()
+
+    async def close(self):
+        """Close the pooled HTTP clients"""
+        await self.backends.close()
+
+    async def _generate(self, prompt: str, options: Dict[str, Any], lane: str) -> Optional[str]:
+        """Run one non-streamed generation under the scheduler; None on an Ollama error.
+
+        AIServiceBusy propagates so callers can answer 503 instead of a degraded result.
+        """
+        # Time spent in this span but not in its ollama.request child is scheduler queue wait
+        with tracer.span("ai.generate", lane=lane, prompt_chars=len(prompt)):
+            async with self.scheduler.slot(lane):
+                response = await self.backends.post(
+                    "/api/generate",
                     json={
                         "model": self.model,
                         "prompt": prompt,
                         "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.9,
-                            "max_tokens": 300
-                        }
-                    }
+                        "options": options
+                    },
+                    model=self.model,
                 )
-                
+        if response.status_code != 200:
+            logger.error(f"Ollama API error: {response.status_code}")
+            return None
+        return response.json().get("response", "").strip()
+
+    async def stream_generate(self, prompt: str, options: Dict[str, Any], lane: str = LANE_INTERACTIVE,
+                              context: Optional[List[int]] = None, prefer: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Streamed generation under the scheduler; yields Ollama's messages as they arrive.
+
+        `context` continues from the token context a previous call returned, so the
+        earlier prompt is not sent again. The final message (done=true) carries the
+        new context plus "backend", the URL that served it, for `prefer` next time.
+        """
+        body = {"model": self.model, "prompt": prompt, "stream": True, "options": options}
+        if context:
+            body["context"] = context
+        async with self.scheduler.slot(lane):
+            async with self.backends.stream("/api/generate", body, model=self.model, prefer=prefer) as (url, response):
+                if response.status_code != 200:
+                    await response.aread()
+                    raise RuntimeError(f"Ollama API error: {response.status_code}")
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    message = json.loads(line)
+                    if message.get("error"):
+                        raise RuntimeError(f"Ollama error: {message['error']}")
+                    if message.get("done"):
+                        message["backend"] = url
+                    yield message
+
+    async def embed(self, texts: List[str], model: str, lane: str = LANE_BACKGROUND) -> List[List[float]]:
+        """Embedding vectors for `texts` from the backend pool, under the scheduler; raises on Ollama errors"""
+        with tracer.span("ai.embed", lane=lane, texts=len(texts)):
+            async with self.scheduler.slot(lane):
+                response = await self.backends.post("/api/embed", json={"model": model, "input": texts}, model=model)
                 if response.status_code == 200:
-                    result = response.json()
-                    summary = result.get("response", "").strip()
-                    return summary if summary else None
-                else:
-                    print(f"Ollama API error: {response.status_code}")
-                    return None
-                    
+                    return response.json()["embeddings"]
+                if response.status_code != 404:
+                    response.raise_for_status()
+
+                # Older Ollama releases only expose the single-prompt endpoint
+                vectors = []
+                for text in texts:
+                    response = await self.backends.post(
+                        "/api/embeddings", json={"model": model, "prompt": text}, model=model
+                    )
+                    response.raise_for_status()
+                    vectors.append(response.json()["embedding"])
+                return vectors
+
+    async def ping(self, lane: str = LANE_HEALTH) -> bool:
+        """One-token generation, to verify the model actually answers"""
+        return await self._generate("Reply with OK.", {"temperature": 0, "num_predict": 1}, lane) is not None
+
+    async def generate_summary(self, content: str, max_length: int = 200, lane: str = LANE_INTERACTIVE) -> Optional[str]:
+        """Generate AI summary of article content"""
+        try:
+            prompt = (
+                f"Please provide a concise summary of the following article content in {max_length} characters or less:\n\n"
+                f"{content_preparer.prepare(content, 'summary')}\n\nSummary:"
+            )
+
+            summary = await self._generate(prompt, {"temperature": 0.7, "top_p": 0.9, "num_predict": 300}, lane)
+            return summary if summary else None
+
+        except AIServiceBusy:
+            raise
         except Exception as e:
-            print(f"AI summary generation failed: {e}")
+            logger.error(f"AI summary generation failed: {e}")
             return None
-    
-    async def analyze_sentiment(self, content: str) -> Optional[str]:
-        """Analyze sentiment of content"""
+
+    async def analyze_sentiment(self, content: str, lane: str = LANE_INTERACTIVE, local_first: bool = False) -> Optional[str]:
+        """Analyze sentiment of content (local_first: lexicon model, LLM only when it is unsure)"""
+        if local_first:
+            sentiment, confidence = local_nlp.sentiment(content_preparer.plain_text(content))
+            if confidence >= settings.LOCAL_NLP_MIN_CONFIDENCE:
+                local_nlp.stats["sentiment_local"] += 1
+                return sentiment
+            local_nlp.stats["sentiment_llm_fallback"] += 1
         try:
-            prompt = f"""
-            Analyze the sentiment of the following text and respond with only one word: positive, negative, or neutral.
-            
-            Text: {content[:500]}
-            
-            Sentiment:
-            """
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.3,
-                            "max_tokens": 10
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    sentiment = result.get("response", "").strip().lower()
-                    if sentiment in ["positive", "negative", "neutral"]:
-                        return sentiment
-                    return "neutral"
-                else:
-                    return "neutral"
-                    
+            prompt = (
+                "Analyze the sentiment of the following text and respond with only one word: positive, negative, or neutral.\n\n"
+                f"Text: {content_preparer.prepare(content, 'sentiment')}\n\nSentiment:"
+            )
+
+            sentiment = (await self._generate(prompt, {"temperature": 0.3, "num_predict": 10}, lane) or "").lower()
+            if sentiment in ["positive", "negative", "neutral"]:
+                return sentiment
+            return "neutral"
+
+        except AIServiceBusy:
+            raise
         except Exception as e:
-            print(f"Sentiment analysis failed: {e}")
+            logger.error(f"Sentiment analysis failed: {e}")
             return "neutral"
-    
-    async def extract_keywords(self, content: str) -> list[str]:
-        """Extract keywords from content"""
+
+    async def extract_keywords(self, content: str, lane: str = LANE_INTERACTIVE, local_first: bool = False) -> list[str]:
+        """Extract keywords from content (local_first: corpus-weighted RAKE, LLM only when it is unsure)"""
+        if local_first:
+            keywords, confidence = local_nlp.keywords(content_preparer.plain_text(content))
+            if confidence >= settings.LOCAL_NLP_MIN_CONFIDENCE:
+                local_nlp.stats["keywords_local"] += 1
+                return keywords
+            local_nlp.stats["keywords_llm_fallback"] += 1
         try:
-            prompt = f"""
-            Extract 5-8 key topics or keywords from the following text. Return only the keywords separated by commas:
-            
-            {content[:1000]}
-            
-            Keywords:
-            """
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.5,
-                            "max_tokens": 100
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    keywords_text = result.get("response", "").strip()
-                    keywords = [kw.strip() for kw in keywords_text.split(",") if kw.strip()]
-                    return keywords[:8]  # Limit to 8 keywords
-                else:
-                    return []
-                    
+            prompt = (
+                "Extract 5-8 key topics or keywords from the following text. Return only the keywords separated by commas:\n\n"
+                f"{content_preparer.prepare(content, 'keywords')}\n\nKeywords:"
+            )
+
+            keywords_text = await self._generate(prompt, {"temperature": 0.5, "num_predict": 100}, lane) or ""
+            keywords = [kw.strip() for kw in keywords_text.split(",") if kw.strip()]
+            return keywords[:8]  # Limit to 8 keywords
+
+        except AIServiceBusy:
+            raise
         except Exception as e:
-            print(f"Keyword extraction failed: {e}")
+            logger.error(f"Keyword extraction failed: {e}")
             return []
-    
-    async def generate_follow_up_questions(self, content: str) -> list[str]:
+
+    async def generate_follow_up_questions(self, content: str, lane: str = LANE_INTERACTIVE) -> list[str]:
         """Generate follow-up questions about the content"""
         try:
-            prompt = f"""
-            Generate 3-5 thoughtful follow-up questions about the following article content:
-            
-            {content[:1500]}
-            
-            Questions:
-            """
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "max_tokens": 200
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    questions_text = result.get("response", "").strip()
-                    # Split by newlines and clean up
-                    questions = [q.strip().lstrip("1234567890.- ") for q in questions_text.split("\n") if q.strip()]
-                    return questions[:5]  # Limit to 5 questions
-                else:
-                    return []
-                    
+            prompt = (
+                "Generate 3-5 thoughtful follow-up questions about the following article content:\n\n"
+                f"{content_preparer.prepare(content, 'questions')}\n\nQuestions:"
+            )
+
+            questions_text = await self._generate(prompt, {"temperature": 0.7, "num_predict": 200}, lane) or ""
+            # Split by newlines and clean up
+            questions = [q.strip().lstrip("1234567890.- ") for q in questions_text.split("\n") if q.strip()]
+            return questions[:5]  # Limit to 5 questions
+
+        except AIServiceBusy:
+            raise
         except Exception as e:
-            print(f"Follow-up questions generation failed: {e}")
+            logger.error(f"Follow-up questions generation failed: {e}")
             return []
 
 # Global AI service instance
@@ -0,0 +1,113 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.responses import ORJSON_OPTIONS
+from app.models.article import Article
+
+# Columns that only change when the article itself is edited (bumping updated_at)
+BODY_FIELDS = (
+    "id", "title", "url", "description", "content", "author", "published_date",
+    "source", "category", "image_url", "created_at", "rss_feed_id",
+)
+# Columns rewritten by counters, trending and AI jobs; always serialized fresh
+STATE_FIELDS = (
+    "ai_summary", "ai_sentiment", "is_featured", "is_trending",
+    "view_count", "share_count", "updated_at",
+)
+
+
+def _json_list(value: Any) -> Optional[list]:
+    # Same tolerance for legacy JSON-string rows as ArticleInDB.parse_json_list
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return []
+
+
+class ArticleSerializer:
+    """Fast ``ArticleResponse``-shaped JSON for trusted ORM rows.
+
+    Rows loaded from our own database do not need Pydantic validation, so
+    they are mapped straight to dicts and encoded with orjson. The large,
+    rarely changing part of each article (title, description, content, ...)
+    is encoded once and kept in an LRU keyed by ``(id, updated_at)``; only
+    the small mutable tail (counters, flags, AI fields) is encoded per
+    request and spliced onto the cached fragment.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.ARTICLE_FRAGMENT_CACHE_SIZE
+        self._fragments: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def body_dict(article: Article) -> Dict[str, Any]:
+        body = {field: getattr(article, field) for field in BODY_FIELDS}
+        body["tags"] = _json_list(article.tags)
+        body["word_count"] = article.word_count or 0
+        body["reading_time"] = article.reading_time or 0
+        return body
+
+    @staticmethod
+    def state_dict(article: Article) -> Dict[str, Any]:
+        state = {field: getattr(article, field) for field in STATE_FIELDS}
+        state["ai_topics"] = _json_list(article.ai_topics)
+        state["is_featured"] = bool(state["is_featured"])
+        state["is_trending"] = bool(state["is_trending"])
+        state["view_count"] = state["view_count"] or 0
+        state["share_count"] = state["share_count"] or 0
+        return state
+
+    def to_dict(self, article: Article) -> Dict[str, Any]:
+        return {**self.body_dict(article), **self.state_dict(article)}
+
+    def _body_fragment(self, article: Article) -> bytes:
+        version = article.updated_at
+        with self._lock:
+            cached = self._fragments.get(article.id)
+            if cached is not None and cached[0] == version:
+                self._fragments.move_to_end(article.id)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        fragment = orjson.dumps(self.body_dict(article), option=ORJSON_OPTIONS)
+        with self._lock:
+            self._fragments[article.id] = (version, fragment)
+            self._fragments.move_to_end(article.id)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def render(self, article: Article) -> bytes:
+        """One article as JSON bytes"""
+        body = self._body_fragment(article)
+        state = orjson.dumps(self.state_dict(article), option=ORJSON_OPTIONS)
+        # Splice {"id":...} and {"ai_summary":...} into a single object
+        return body[:-1] + b"," + state[1:]
+
+    def render_list(self, articles: Iterable[Article]) -> bytes:
+        return b"[" + b",".join(self.render(article) for article in articles) + b"]"
+
+    def render_scored(self, articles: List[Tuple[Article, float]]) -> bytes:
+        """``[{"article": {...}, "score": ...}, ...]`` as used by related-article responses"""
+        return b"[" + b",".join(
+            b'{"article":' + self.render(article) + b',"score":' + orjson.dumps(score) + b"}"
+            for article, score in articles
+        ) + b"]"
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+# Global article serializer instance
+article_serializer = ArticleSerializer()
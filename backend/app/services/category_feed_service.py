@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import Article
+from app.models.rss_feed import RSSFeed
+
+logger = logging.getLogger(__name__)
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class CategoryFeedCache:
+    """Materialized per-category snapshot of active, approved feeds and their latest articles.
+
+    The whole snapshot is rebuilt with two queries (feeds via
+    ``idx_rss_feed_active_category`` and a windowed "latest N per feed"
+    article query), pre-serialized to JSON and tagged with an ETag, so
+    serving ``/rss/category/{category}`` costs no database work until the
+    next rebuild.
+    """
+
+    def __init__(self):
+        self.articles_per_feed = settings.CATEGORY_FEED_ARTICLES_PER_FEED
+        self._entries: Dict[str, Tuple[bytes, str]] = {}
+        self._empty: Tuple[bytes, str] = self._encode([])
+        self._built_at: Optional[float] = None
+        self._stale = True
+        self._rebuild_lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(feeds: list) -> Tuple[bytes, str]:
+        body = json.dumps({"success": True, "data": feeds}, separators=(",", ":")).encode("utf-8")
+        etag = 'W/"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        return body, etag
+
+    @staticmethod
+    def _feed_payload(feed: RSSFeed) -> dict:
+        return {
+            "id": feed.id,
+            "name": feed.name,
+            "url": feed.url,
+            "description": feed.description,
+            "website_url": feed.website_url,
+            "category": feed.category,
+            "language": feed.language,
+            "last_successful_fetch": _isoformat(feed.last_successful_fetch),
+            "latest_articles": [],
+        }
+
+    @staticmethod
+    def _article_payload(article) -> dict:
+        return {
+            "id": article.id,
+            "title": article.title,
+            "url": article.url,
+            "description": article.description,
+            "author": article.author,
+            "source": article.source,
+            "image_url": article.image_url,
+            "published_date": _isoformat(article.published_date),
+            "reading_time": article.reading_time,
+        }
+
+    def rebuild(self, db: Session):
+        """Rebuild every category entry from the database"""
+        started = time.perf_counter()
+        feeds = db.query(RSSFeed).filter(
+            RSSFeed.is_active.is_(True),
+            RSSFeed.is_approved.is_(True),
+            RSSFeed.category.isnot(None),
+        ).order_by(RSSFeed.category, RSSFeed.name).all()
+
+        by_feed = {feed.id: self._feed_payload(feed) for feed in feeds}
+        if by_feed:
+            ranked = db.query(
+                Article.id, Article.title, Article.url, Article.description, Article.author,
+                Article.source, Article.image_url, Article.published_date, Article.reading_time,
+                Article.rss_feed_id,
+                func.row_number().over(
+                    partition_by=Article.rss_feed_id,
+                    order_by=(Article.published_date.desc().nulls_last(), Article.id.desc()),
+                ).label("position"),
+            ).filter(Article.rss_feed_id.in_(list(by_feed))).subquery()
+            latest = db.query(ranked).filter(
+                ranked.c.position <= self.articles_per_feed
+            ).order_by(ranked.c.rss_feed_id, ranked.c.position).all()
+            for article in latest:
+                by_feed[article.rss_feed_id]["latest_articles"].append(self._article_payload(article))
+
+        grouped: Dict[str, list] = {}
+        for feed in feeds:
+            grouped.setdefault(feed.category.lower(), []).append(by_feed[feed.id])
+
+        self._entries = {category: self._encode(items) for category, items in grouped.items()}
+        self._built_at = time.time()
+        self._stale = False
+        logger.info(
+            f"Category feed cache rebuilt: {len(feeds)} feeds in {len(grouped)} categories "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def mark_stale(self):
+        """Called after ingest so the next read triggers a rebuild"""
+        self._stale = True
+
+    def _rebuild_in_session(self):
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+
+    async def refresh(self):
+        """Rebuild off the event loop, coalescing concurrent callers"""
+        async with self._rebuild_lock:
+            await asyncio.to_thread(self._rebuild_in_session)
+
+    async def get(self, category: str) -> Tuple[bytes, str]:
+        """Pre-serialized body and ETag for a category"""
+        if self._stale:
+            async with self._rebuild_lock:
+                if self._stale:
+                    await asyncio.to_thread(self._rebuild_in_session)
+        return self._entries.get(category.lower(), self._empty)
+
+    async def run_periodically(self, interval: Optional[int] = None):
+        """Background loop started from the application lifespan"""
+        interval = interval or settings.CATEGORY_FEED_REFRESH_SECONDS
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Category feed cache rebuild failed: {e}")
+            await asyncio.sleep(interval)
+
+# Global category feed cache instance
+category_feed_cache = CategoryFeedCache()
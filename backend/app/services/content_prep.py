@@ -0,0 +1,168 @@
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+# Rough size of an English token for Llama-family tokenizers; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Elements whose text is never article prose
+SKIP_TAGS = {"script", "style", "noscript", "iframe", "svg", "figure", "figcaption", "nav", "aside", "footer", "form", "button"}
+BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "section", "article", "tr", "table", "pre"}
+
+# Feed boilerplate appended by WordPress, Feedburner and news CMSes
+BOILERPLATE = re.compile(
+    r"^(the post .* appeared first on .*|continue reading.*|read more.*|read the full (story|article).*"
+    r"|click here.*|share this:?|related:?|advertisement|\[?(…|\.\.\.)\]?)$",
+    re.IGNORECASE,
+)
+TRAILING_ELLIPSIS = re.compile(r"\s*\[(…|\.\.\.|&hellip;)\]\s*$")
+WHITESPACE = re.compile(r"[ \t\r\f\v\xa0]+")
+SENTENCE_END = re.compile(r"[.!?][\"')\]]?(?=\s)")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8", "replace")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clean_paragraphs(content: str) -> List[str]:
+    """Plain-text paragraphs of an article body or RSS summary, markup and boilerplate removed"""
+    if "<" in content and ">" in content:
+        extractor = _TextExtractor()
+        extractor.feed(content)
+        extractor.close()
+        text = "".join(extractor.parts)
+    else:
+        text = html.unescape(content)
+
+    paragraphs = []
+    for block in text.split("\n"):
+        paragraph = WHITESPACE.sub(" ", block).strip()
+        if not paragraph or BOILERPLATE.match(paragraph):
+            continue
+        paragraph = TRAILING_ELLIPSIS.sub("", paragraph)
+        # Repeated paragraphs (teaser + body) only cost prompt tokens
+        if paragraphs and paragraph == paragraphs[-1]:
+            continue
+        paragraphs.append(paragraph)
+    return paragraphs
+
+
+def _truncate(paragraph: str, max_chars: int) -> str:
+    """Cut at the last sentence end within max_chars, else at a word boundary"""
+    head = paragraph[:max_chars + 1]
+    ends = [m.end() for m in SENTENCE_END.finditer(head)]
+    if ends and ends[-1] >= max_chars // 2:
+        return head[:ends[-1]]
+    cut = head.rfind(" ", 0, max_chars)
+    return (head[:cut] if cut > 0 else head[:max_chars]).rstrip(",;:- ") + "…"
+
+
+def lead_text(paragraphs: List[str], max_tokens: int) -> str:
+    """Lead paragraphs in order until the token budget is spent"""
+    remaining = max_tokens * CHARS_PER_TOKEN
+    selected = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= remaining:
+            selected.append(paragraph)
+            remaining -= len(paragraph) + 2  # joined with a blank line
+            continue
+        # Only a meaningful fragment of the next paragraph is worth its tokens
+        if remaining >= 80 or not selected:
+            selected.append(_truncate(paragraph, remaining))
+        break
+    return "\n\n".join(selected)
+
+
+class ContentPreparer:
+    """Turns raw article text into a compact, token-budgeted prompt body.
+
+    The same article is prepared for several operations (summary, sentiment,
+    keywords, questions) and again on retries, so results are cached by
+    content hash and operation; the cleaned paragraphs themselves are cached
+    too, so each article is parsed once. Identical input always yields an
+    identical prompt body.
+    """
+
+    def __init__(self):
+        self.budgets = settings.AI_CONTENT_TOKEN_BUDGETS
+        self.max_entries = settings.AI_CONTENT_CACHE_SIZE
+        self._paragraphs: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._prepared: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, cache: OrderedDict, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _store(self, cache: OrderedDict, key, value):
+        with self._lock:
+            cache[key] = value
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
+    def paragraphs(self, content: str, digest: Optional[str] = None) -> List[str]:
+        digest = digest or content_digest(content)
+        paragraphs = self._lookup(self._paragraphs, digest)
+        if paragraphs is None:
+            paragraphs = clean_paragraphs(content)
+            self._store(self._paragraphs, digest, paragraphs)
+        return paragraphs
+
+    def plain_text(self, content: str) -> str:
+        """All cleaned paragraphs, for local (non-LLM) analysis where length costs nothing"""
+        return "\n\n".join(self.paragraphs(content))
+
+    def prepare(self, content: str, operation: str) -> str:
+        """Cleaned lead text of `content` within the token budget for `operation`"""
+        max_tokens = self.budgets[operation]
+        digest = content_digest(content)
+        key = (digest, max_tokens)
+        prepared = self._lookup(self._prepared, key)
+        if prepared is None:
+            prepared = lead_text(self.paragraphs(content, digest), max_tokens)
+            self._store(self._prepared, key, prepared)
+        return prepared
+
+
+# Global content preparer instance
+content_preparer = ContentPreparer()
@@ -0,0 +1,407 @@
+import asyncio
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.article import Article
+from app.services.ai_service import ai_service
+from app.services.ollama_scheduler import LANE_BACKGROUND, LANE_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+# Below this many vectors an exact scan is already sub-millisecond
+BRUTE_FORCE_LIMIT = 20000
+# Rows added after the last IVF build are scanned exhaustively until the next rebuild
+MAX_PENDING_ROWS = 50000
+SEARCH_CHUNK_ROWS = 65536
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so that dot product equals cosine similarity"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class HashingEmbedder:
+    """Deterministic local embedding model based on signed feature hashing.
+
+    Unigrams and bigrams are hashed with blake2b (stable across processes,
+    unlike ``hash()``) so the same text always maps to the same vector.
+    Used for tests and offline development when Ollama is not available.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text or ""):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dim] += sign
+        return _normalize(vectors)
+
+
+class EmbeddingIndex:
+    """Float32 memory-mapped embedding matrix keyed by article id.
+
+    Layout of ``directory``:
+        meta.json      dim, row count, capacity and IVF build state
+        vectors.f32    (capacity, dim) float32 matrix, rows L2-normalized
+        ids.i64        article id per row
+        lists.i32      IVF list assignment per row (-1 = not assigned)
+        centroids.npy  IVF coarse centroids
+
+    Search uses an inverted-file (IVF) layout: vectors are clustered with
+    spherical k-means and a query only scans the ``nprobe`` closest lists,
+    which keeps lookups in the millisecond range for millions of rows.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self.count = 0
+        self.capacity = 0
+        self._lock = threading.RLock()
+        self._row_by_id = {}
+        self._vectors = None
+        self._ids = None
+        self._lists = None
+        self._centroids = None
+        self._list_order = None
+        self._list_offsets = None
+        self._ivf_rows = 0
+        # Highest article id the incremental indexer has covered; on-demand adds do not move it
+        self.indexed_through = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # -- storage -----------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        meta_path = self._path("meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["dim"] != self.dim:
+                raise ValueError(
+                    f"Embedding index at {self.directory} has dim {meta['dim']}, expected {self.dim}"
+                )
+            self.count = meta["count"]
+            self.capacity = meta["capacity"]
+            self._ivf_rows = meta.get("ivf_rows", 0)
+            self.indexed_through = meta.get("indexed_through", 0)
+            self._open_maps()
+            self._row_by_id = {int(article_id): row for row, article_id in enumerate(self._ids[:self.count])}
+            centroids_path = self._path("centroids.npy")
+            if os.path.exists(centroids_path):
+                self._centroids = np.load(centroids_path)
+                self._build_inverted_lists()
+        else:
+            self._grow(1024)
+
+    def _open_maps(self):
+        self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r+",
+                                  shape=(self.capacity, self.dim))
+        self._ids = np.memmap(self._path("ids.i64"), dtype=np.int64, mode="r+", shape=(self.capacity,))
+        self._lists = np.memmap(self._path("lists.i32"), dtype=np.int32, mode="r+", shape=(self.capacity,))
+
+    def _grow(self, min_capacity: int):
+        """Extend the backing files (doubling) so at least ``min_capacity`` rows fit"""
+        new_capacity = max(min_capacity, self.capacity * 2, 1024)
+        if self._vectors is not None:
+            self._flush_maps()
+            self._vectors = self._ids = self._lists = None
+        for name, itemsize in (("vectors.f32", 4 * self.dim), ("ids.i64", 8), ("lists.i32", 4)):
+            with open(self._path(name), "ab") as f:
+                f.truncate(new_capacity * itemsize)
+        old_capacity = self.capacity
+        self.capacity = new_capacity
+        self._open_maps()
+        self._lists[old_capacity:] = -1
+        self._save_meta()
+
+    def _flush_maps(self):
+        for array in (self._vectors, self._ids, self._lists):
+            if array is not None:
+                array.flush()
+
+    def _save_meta(self):
+        tmp_path = self._path("meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "dim": self.dim,
+                "count": self.count,
+                "capacity": self.capacity,
+                "ivf_rows": self._ivf_rows,
+                "indexed_through": self.indexed_through,
+            }, f)
+        os.replace(tmp_path, self._path("meta.json"))
+
+    def flush(self):
+        """Persist the memory maps and metadata to disk"""
+        with self._lock:
+            self._flush_maps()
+            self._save_meta()
+
+    # -- writes ------------------------------------------------------------
+
+    def __contains__(self, article_id: int) -> bool:
+        return article_id in self._row_by_id
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, article_ids: List[int], vectors: np.ndarray):
+        """Insert or overwrite embeddings for the given article ids"""
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(article_ids), self.dim))
+        with self._lock:
+            new_ids = [i for i in article_ids if i not in self._row_by_id]
+            if self.count + len(new_ids) > self.capacity:
+                self._grow(self.count + len(new_ids))
+
+            for article_id, vector in zip(article_ids, vectors):
+                row = self._row_by_id.get(article_id)
+                if row is None:
+                    row = self.count
+                    self.count += 1
+                    self._row_by_id[article_id] = row
+                    self._ids[row] = article_id
+                self._vectors[row] = vector
+                if self._centroids is not None and row < self._ivf_rows:
+                    # Keep an overwritten row in the list that matches its new vector
+                    self._lists[row] = int(np.argmax(self._centroids @ vector))
+                    self._list_order = None
+
+            if self._centroids is not None and self._list_order is None:
+                self._build_inverted_lists()
+            elif self._centroids is not None and self.count - self._ivf_rows > MAX_PENDING_ROWS:
+                self._assign_pending()
+            self._save_meta()
+
+    # -- IVF ---------------------------------------------------------------
+
+    def train(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """Cluster the stored vectors with spherical k-means and assign every row to a list"""
+        with self._lock:
+            if self.count < BRUTE_FORCE_LIMIT:
+                # Exact search is fast enough; drop any stale IVF state
+                self._centroids = None
+                self._list_order = self._list_offsets = None
+                self._ivf_rows = 0
+                centroids_path = self._path("centroids.npy")
+                if os.path.exists(centroids_path):
+                    os.remove(centroids_path)
+                self._save_meta()
+                return
+
+            n_lists = n_lists or int(min(65536, max(16, 4 * np.sqrt(self.count))))
+            rng = np.random.default_rng(seed)
+            sample_size = min(self.count, n_lists * 64)
+            sample = np.asarray(self._vectors[np.sort(rng.choice(self.count, sample_size, replace=False))])
+            centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignment = self._nearest_centroid(sample, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample)
+                counts = np.bincount(assignment, minlength=n_lists)
+                empty = counts == 0
+                if empty.any():
+                    sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+                centroids = _normalize(sums)
+
+            self._centroids = centroids
+            np.save(self._path("centroids.npy"), centroids)
+            self._ivf_rows = 0
+            self._assign_pending()
+            self._flush_maps()
+            logger.info(f"Trained IVF embedding index: {self.count} rows, {n_lists} lists")
+
+    @staticmethod
+    def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        result = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:start + SEARCH_CHUNK_ROWS])
+            result[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return result
+
+    def _assign_pending(self):
+        """Assign rows added since the last build to their nearest list"""
+        if self._ivf_rows < self.count:
+            self._lists[self._ivf_rows:self.count] = self._nearest_centroid(
+                self._vectors[self._ivf_rows:self.count], self._centroids
+            )
+            self._ivf_rows = self.count
+            self._save_meta()
+        self._build_inverted_lists()
+
+    def _build_inverted_lists(self):
+        """Group row numbers by list (CSR layout) for fast candidate gathering"""
+        lists = np.asarray(self._lists[:self._ivf_rows])
+        self._list_order = np.argsort(lists, kind="stable").astype(np.int64)
+        counts = np.bincount(lists, minlength=len(self._centroids))
+        self._list_offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    # -- reads -------------------------------------------------------------
+
+    def get(self, article_id: int) -> Optional[np.ndarray]:
+        row = self._row_by_id.get(article_id)
+        if row is None:
+            return None
+        return np.array(self._vectors[row])
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        nprobe: int = 16,
+        exclude_id: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (article_id, cosine similarity) pairs, best first"""
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+        with self._lock:
+            count = self.count
+            if count == 0:
+                return []
+            if self._centroids is None or self._list_order is None:
+                rows = None
+                scores = np.empty(count, dtype=np.float32)
+                for start in range(0, count, SEARCH_CHUNK_ROWS):
+                    end = min(count, start + SEARCH_CHUNK_ROWS)
+                    scores[start:end] = self._vectors[start:end] @ query
+            else:
+                probes = np.argpartition(
+                    -(self._centroids @ query), min(nprobe, len(self._centroids)) - 1
+                )[:nprobe]
+                parts = [self._list_order[self._list_offsets[c]:self._list_offsets[c + 1]] for c in probes]
+                parts.append(np.arange(self._ivf_rows, count, dtype=np.int64))
+                rows = np.sort(np.concatenate(parts))
+                scores = self._vectors[rows] @ query
+            ids = self._ids[:count] if rows is None else self._ids[rows]
+
+            if exclude_id is not None:
+                scores = np.where(ids == exclude_id, -np.inf, scores)
+            k = min(k, len(scores))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+class EmbeddingService:
+    def __init__(self):
+        self.backend = settings.EMBEDDING_BACKEND
+        self.model = settings.EMBEDDING_MODEL if self.backend == "ollama" else f"hash-{settings.EMBEDDING_HASH_DIM}"
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE
+        self._hasher = HashingEmbedder(settings.EMBEDDING_HASH_DIM)
+        self._index = None
+        self._index_lock = threading.Lock()
+
+    @staticmethod
+    def article_text(article) -> str:
+        """Text used to embed an article: title, description and the start of the body"""
+        parts = [article.title or "", article.description or "", (article.content or "")[:2000]]
+        return "\n".join(p for p in parts if p)
+
+    async def embed(self, texts: List[str], lane: str = LANE_BACKGROUND) -> np.ndarray:
+        """Embed a batch of texts with the configured backend.
+
+        Ollama embeddings go through AIService's backend pool (health
+        checks, ejection) and scheduler lanes like every other model call.
+        """
+        if self.backend == "hash":
+            return self._hasher.embed(texts)
+        vectors = await ai_service.embed(texts, self.model, lane=lane)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _index_dir(self) -> str:
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]", "_", self.model)
+        return os.path.join(settings.EMBEDDING_INDEX_DIR, f"{self.backend}-{safe_model}")
+
+    def get_index(self, dim: Optional[int] = None) -> Optional[EmbeddingIndex]:
+        """Open the on-disk index, creating it when ``dim`` is known"""
+        with self._index_lock:
+            if self._index is None:
+                meta_path = os.path.join(self._index_dir(), "meta.json")
+                if os.path.exists(meta_path):
+                    with open(meta_path) as f:
+                        dim = json.load(f)["dim"]
+                elif self.backend == "hash":
+                    dim = self._hasher.dim
+                if dim is None:
+                    return None
+                self._index = EmbeddingIndex(self._index_dir(), dim)
+            return self._index
+
+    async def index_articles(self, db: Session, limit: Optional[int] = None) -> int:
+        """Embed articles past the indexer's high-water mark in batches.
+
+        The mark is ``indexed_through`` in the index metadata, which only this
+        method advances: related_articles embeds single articles on demand, and
+        a high id added that way must not hide the unindexed ids below it.
+        Articles already embedded on demand are skipped.
+        """
+        index = self.get_index()
+        last_id = index.indexed_through if index else 0
+        indexed = 0
+
+        while limit is None or indexed < limit:
+            batch_size = self.batch_size if limit is None else min(self.batch_size, limit - indexed)
+            articles = db.query(
+                Article.id, Article.title, Article.description, Article.content
+            ).filter(Article.id > last_id).order_by(Article.id).limit(batch_size).all()
+            if not articles:
+                break
+
+            pending = [a for a in articles if index is None or a.id not in index]
+            if pending:
+                vectors = await self.embed([self.article_text(a) for a in pending])
+                index = self.get_index(vectors.shape[1])
+                index.add([a.id for a in pending], vectors)
+                indexed += len(pending)
+            last_id = articles[-1].id
+            index.indexed_through = last_id
+
+        if index is not None:
+            index.flush()
+        return indexed
+
+    async def related_articles(self, db: Session, article: Article, limit: int = 10) -> List[Tuple[int, float]]:
+        """Find the ``limit`` nearest neighbours of an article, embedding it on demand.
+
+        Index I/O and the numpy search run in a worker thread, off the event loop.
+        """
+        index = await asyncio.to_thread(self.get_index)
+        query = index.get(article.id) if index else None
+        if query is None:
+            # A reader is waiting on this one
+            vectors = await self.embed([self.article_text(article)], lane=LANE_INTERACTIVE)
+            index = await asyncio.to_thread(self.get_index, vectors.shape[1])
+            await asyncio.to_thread(index.add, [article.id], vectors)
+            query = vectors[0]
+        return await asyncio.to_thread(index.search, query, k=limit, exclude_id=article.id)
+
+# Global embedding service instance
+embedding_service = EmbeddingService()
@@ -0,0 +1,318 @@
+import asyncio
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import Article
+from app.models.user import User
+from app.services.reading_history_service import reading_history_service
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ("view", "share", "read")
+
+
+class EventBuffer:
+    """Write-behind buffer for view/share counters and reading progress.
+
+    Events are appended to a local log (flushed and fsynced before the
+    request returns) and aggregated in memory per article and per
+    (user, article). A flush rotates the log into a segment, applies the
+    aggregates as one batch of counter increments plus reading-history
+    upserts, and deletes the segment after commit. Each process (uvicorn
+    worker) writes its own log; logs and segments left behind by a process
+    that exited are adopted and replayed by a live one (on startup and on
+    every flush interval), so delivery is at-least-once.
+    """
+
+    def __init__(self, log_dir: Optional[str] = None):
+        self.log_dir = log_dir or settings.EVENT_LOG_DIR
+        self.max_events = settings.EVENT_BUFFER_MAX_EVENTS
+        # Log files are per process; the owner's lock file is held (flock) for the life of the process
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._log = None
+        self._owner_lock = None
+        self._counters: Dict[int, List[int]] = {}
+        self._reads: Dict[Tuple[int, int], dict] = {}
+        self._pending_events = 0
+        self._segments: List[str] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {"events": 0, "flushes": 0, "rows_written": 0, "last_flush_ms": 0.0, "adopted_files": 0, "orphans_dropped": 0}
+
+    # -- log ---------------------------------------------------------------
+
+    def _log_path(self) -> str:
+        return os.path.join(self.log_dir, f"events.{self.owner}.log")
+
+    def _segment_path(self) -> str:
+        return os.path.join(self.log_dir, f"events.{self.owner}.{time.time_ns()}.segment")
+
+    def _open_log(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        if self._owner_lock is None:
+            self._owner_lock = open(os.path.join(self.log_dir, f"events.{self.owner}.lock"), "w")
+            fcntl.flock(self._owner_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._log = open(self._log_path(), "a", encoding="utf-8")
+
+    def _rotate(self) -> Optional[str]:
+        """Move this process's live log into a segment file and start a new one"""
+        if self._log is None:
+            self._open_log()
+        self._log.close()
+        segment = None
+        if os.path.getsize(self._log_path()) > 0:
+            segment = self._segment_path()
+            os.replace(self._log_path(), segment)
+        self._open_log()
+        return segment
+
+    def _orphaned_files(self) -> List[str]:
+        """Logs and segments whose owning process is gone (its lock file is no longer held)"""
+        # Unowned files written before logs were per process
+        orphans = sorted(glob.glob(os.path.join(self.log_dir, "events.[0-9]*[0-9].segment")))
+        orphans = [path for path in orphans if os.path.basename(path).split(".")[1].isdigit()]
+        orphans.extend(glob.glob(os.path.join(self.log_dir, "events.log")))
+        for lock_path in glob.glob(os.path.join(self.log_dir, "events.*.lock")):
+            owner = os.path.basename(lock_path)[len("events."):-len(".lock")]
+            if owner == self.owner:
+                continue
+            try:
+                with open(lock_path, "r+") as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    orphans.extend(sorted(glob.glob(os.path.join(self.log_dir, f"events.{owner}.*.segment"))))
+                    orphans.extend(glob.glob(os.path.join(self.log_dir, f"events.{owner}.log")))
+                    os.remove(lock_path)
+            except BlockingIOError:
+                continue  # owner is alive
+            except FileNotFoundError:
+                continue  # adopted by another process meanwhile
+        return orphans
+
+    def recover(self):
+        """Adopt and replay logs left behind by processes that have exited.
+
+        Files are renamed into this process's segments before they are read,
+        so two processes can never replay the same file; they are deleted
+        by the next successful flush.
+        """
+        with self._lock:
+            os.makedirs(self.log_dir, exist_ok=True)
+            if self._log is None:
+                self._open_log()
+            replayed = adopted = 0
+            for path in self._orphaned_files():
+                segment = self._segment_path()
+                try:
+                    os.replace(path, segment)
+                except FileNotFoundError:
+                    continue
+                adopted += 1
+                self._segments.append(segment)
+                with open(segment, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            self._aggregate(json.loads(line))
+                            replayed += 1
+                        except (ValueError, KeyError):
+                            # A torn final line from a crash mid-write
+                            continue
+            self.stats["adopted_files"] += adopted
+            if replayed:
+                logger.info(f"Recovered {replayed} buffered events from {adopted} log files")
+
+    # -- ingest ------------------------------------------------------------
+
+    def _aggregate(self, event: dict):
+        article_id = int(event["article_id"])
+        kind = event["type"]
+        if kind == "view":
+            self._counters.setdefault(article_id, [0, 0])[0] += 1
+        elif kind == "share":
+            self._counters.setdefault(article_id, [0, 0])[1] += 1
+        elif kind == "read":
+            key = (int(event["user_id"]), article_id)
+            current = self._reads.get(key)
+            if current is None:
+                self._reads[key] = {
+                    "progress": int(event.get("progress") or 0),
+                    "time_spent": int(event.get("time_spent") or 0),
+                    "read_at": event["ts"],
+                }
+            else:
+                current["progress"] = max(current["progress"], int(event.get("progress") or 0))
+                current["time_spent"] += int(event.get("time_spent") or 0)
+                current["read_at"] = max(current["read_at"], event["ts"])
+        self._pending_events += 1
+
+    def record(self, events: List[dict]) -> bool:
+        """Durably log and aggregate events; returns True when a flush is due"""
+        now = datetime.now(timezone.utc).isoformat()
+        lines = []
+        for event in events:
+            event = dict(event, ts=now)
+            lines.append(json.dumps(event, separators=(",", ":")))
+        with self._lock:
+            if self._log is None:
+                self._open_log()
+            self._log.write("\n".join(lines) + "\n")
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            for line in lines:
+                self._aggregate(json.loads(line))
+            self.stats["events"] += len(lines)
+            return self._pending_events >= self.max_events
+
+    # -- flush -------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Apply buffered aggregates to the database; returns rows written"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending_events:
+                    return 0
+                counters, reads = self._counters, self._reads
+                self._counters, self._reads = {}, {}
+                pending = self._pending_events
+                self._pending_events = 0
+                segment = self._rotate()
+                if segment:
+                    self._segments.append(segment)
+                segments = list(self._segments)
+
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                written = self._apply(db, counters, reads)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    # Put the aggregates back; their segments stay on disk for recovery
+                    for article_id, (views, shares) in counters.items():
+                        totals = self._counters.setdefault(article_id, [0, 0])
+                        totals[0] += views
+                        totals[1] += shares
+                    for key, read in reads.items():
+                        current = self._reads.get(key)
+                        if current is None:
+                            self._reads[key] = read
+                        else:
+                            current["progress"] = max(current["progress"], read["progress"])
+                            current["time_spent"] += read["time_spent"]
+                            current["read_at"] = max(current["read_at"], read["read_at"])
+                    self._pending_events += pending
+                raise
+            finally:
+                db.close()
+
+            with self._lock:
+                for path in segments:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                self._segments = [p for p in self._segments if p not in segments]
+
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += written
+            self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            return written
+
+    def _apply(self, db: Session, counters: Dict[int, List[int]], reads: Dict[Tuple[int, int], dict]) -> int:
+        # Events for missing articles or users would fail the reading_history foreign keys and,
+        # since a failed flush keeps its batch, block every later flush; they are dropped instead
+        article_ids = set(counters) | {article_id for _, article_id in reads}
+        known_articles = self._existing_ids(db, Article, article_ids)
+        known_users = self._existing_ids(db, User, {user_id for user_id, _ in reads})
+        orphans = len(counters) + len(reads)
+        counters = {k: v for k, v in counters.items() if k in known_articles}
+        reads = {k: v for k, v in reads.items() if k[0] in known_users and k[1] in known_articles}
+        orphans -= len(counters) + len(reads)
+        if orphans:
+            self.stats["orphans_dropped"] += orphans
+            logger.warning(f"Dropped buffered events for {orphans} unknown articles or users")
+
+        written = 0
+        if counters:
+            table = Article.__table__
+            stmt = table.update().where(table.c.id == bindparam("b_id")).values(
+                view_count=func.coalesce(table.c.view_count, 0) + bindparam("b_views"),
+                share_count=func.coalesce(table.c.share_count, 0) + bindparam("b_shares"),
+            )
+            # Sorted ids keep lock order stable across concurrent flushers
+            db.execute(stmt, [
+                {"b_id": article_id, "b_views": views, "b_shares": shares}
+                for article_id, (views, shares) in sorted(counters.items())
+            ])
+            written += len(counters)
+        if reads:
+            written += reading_history_service.upsert_many(db, {
+                key: dict(read, read_at=datetime.fromisoformat(read["read_at"]))
+                for key, read in reads.items()
+            })
+        return written
+
+    def flush_in_background(self):
+        """Start a flush on the running loop unless one is already in flight"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.create_task(asyncio.to_thread(self.flush))
+        self._flush_task.add_done_callback(self._flush_done)
+
+    @staticmethod
+    def _existing_ids(db: Session, model, ids: Set[int]) -> Set[int]:
+        if not ids:
+            return set()
+        return {row_id for (row_id,) in db.query(model.id).filter(model.id.in_(ids))}
+
+    @staticmethod
+    def _flush_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Event buffer flush failed: {task.exception()}")
+
+    async def run_periodically(self, interval: Optional[float] = None):
+        """Background flush loop started from the application lifespan"""
+        interval = interval or settings.EVENT_BUFFER_FLUSH_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.recover)
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Event buffer flush failed: {e}")
+
+    def close(self):
+        """Final flush on shutdown; anything unflushed stays in the log"""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Final event buffer flush failed: {e}")
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+                if not self._segments and os.path.getsize(self._log_path()) == 0:
+                    os.remove(self._log_path())
+            if self._owner_lock is not None:
+                if not self._segments and not os.path.exists(self._log_path()):
+                    os.remove(self._owner_lock.name)
+                # Releasing the lock lets a live process adopt whatever is left
+                self._owner_lock.close()
+                self._owner_lock = None
+
+# Global event buffer instance
+event_buffer = EventBuffer()
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("categories", "sources")
+WINDOW_HOURS = 24
+
+
+def _hour(value: Optional[datetime]) -> int:
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() // 3600)
+
+
+class FacetService:
+    """In-memory category and source facet counts for ``/news/categories`` and ``/news/sources``.
+
+    A rebuild is one ``GROUP BY source, category`` (covered by
+    ``idx_article_source_category``) for totals plus a scan of the last 24
+    hours for the rolling window, kept as hourly buckets. Ingestion then
+    feeds new articles in through ``add_articles`` so counts stay current
+    without touching the database, and a periodic rebuild picks up articles
+    stored by other workers and the offline importers. Responses are encoded
+    once per change (or once per hour as the window slides) and tagged with
+    an ETag.
+    """
+
+    def __init__(self):
+        self._totals: Dict[str, Counter] = {facet: Counter() for facet in FACETS}
+        self._hourly: Dict[int, Dict[str, Counter]] = {}
+        self._generation = 0
+        self._encoded: Dict[str, Tuple[int, int, bytes, str]] = {}
+        self._loaded = False
+        self._rebuild_lock = asyncio.Lock()
+        # add_articles runs in worker threads while _encode runs on the loop
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(hourly: Dict[int, Dict[str, Counter]], hour: int) -> Dict[str, Counter]:
+        return hourly.setdefault(hour, {facet: Counter() for facet in FACETS})
+
+    def rebuild(self, db: Session):
+        """Recount every facet from the database"""
+        started = time.perf_counter()
+        totals = {facet: Counter() for facet in FACETS}
+        for source, category, count in db.query(
+            Article.source, Article.category, func.count(Article.id)
+        ).group_by(Article.source, Article.category).all():
+            if category:
+                totals["categories"][category] += count
+            if source:
+                totals["sources"][source] += count
+
+        since = datetime.now(timezone.utc) - timedelta(hours=WINDOW_HOURS)
+        timestamp = func.coalesce(Article.published_date, Article.created_at)
+        hourly: Dict[int, Dict[str, Counter]] = {}
+        for source, category, published in db.query(
+            Article.source, Article.category, timestamp
+        ).filter(timestamp >= since).all():
+            bucket = self._bucket(hourly, _hour(published))
+            if category:
+                bucket["categories"][category] += 1
+            if source:
+                bucket["sources"][source] += 1
+
+        with self._lock:
+            self._totals = totals
+            self._hourly = hourly
+            self._generation += 1
+            self._loaded = True
+        logger.info(
+            f"Facet counts rebuilt: {len(totals['categories'])} categories, "
+            f"{len(totals['sources'])} sources in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def add_articles(self, articles: Iterable[Tuple[Optional[str], Optional[str], Optional[datetime]]]):
+        """Fold newly stored ``(category, source, published_date)`` rows into the counts"""
+        if not self._loaded:
+            return  # The first read rebuilds from the database anyway
+        oldest = _hour(None) - WINDOW_HOURS
+        with self._lock:
+            for category, source, published in articles:
+                hour = _hour(published)
+                bucket = self._bucket(self._hourly, hour) if hour >= oldest else None
+                if category:
+                    self._totals["categories"][category] += 1
+                    if bucket is not None:
+                        bucket["categories"][category] += 1
+                if source:
+                    self._totals["sources"][source] += 1
+                    if bucket is not None:
+                        bucket["sources"][source] += 1
+            self._generation += 1
+
+    def _encode(self, facet: str, now_hour: int) -> Tuple[bytes, str]:
+        oldest = now_hour - WINDOW_HOURS
+        with self._lock:
+            for hour in [h for h in self._hourly if h < oldest]:
+                del self._hourly[hour]
+            recent = Counter()
+            for bucket in self._hourly.values():
+                recent.update(bucket[facet])
+            totals = Counter(self._totals[facet])
+
+        names = sorted(totals, key=lambda name: (-totals[name], name.lower()))
+        body = json.dumps({
+            facet: names,
+            "counts": [{"name": name, "total": totals[name], "last_24h": recent[name]} for name in names],
+        }, separators=(",", ":")).encode("utf-8")
+        etag = 'W/"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        return body, etag
+
+    def _rebuild_in_session(self):
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+
+    async def get(self, facet: str) -> Tuple[bytes, str]:
+        """Pre-serialized body and ETag for ``categories`` or ``sources``"""
+        if not self._loaded:
+            async with self._rebuild_lock:
+                if not self._loaded:
+                    await asyncio.to_thread(self._rebuild_in_session)
+
+        now_hour = _hour(None)
+        cached = self._encoded.get(facet)
+        generation = self._generation
+        if cached is None or cached[0] != generation or cached[1] != now_hour:
+            body, etag = self._encode(facet, now_hour)
+            cached = (generation, now_hour, body, etag)
+            self._encoded[facet] = cached
+        return cached[2], cached[3]
+
+    async def run_periodically(self, interval: Optional[int] = None):
+        """Background recount loop started from the application lifespan"""
+        interval = interval or settings.FACET_REFRESH_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            if not self._loaded:
+                continue  # Still lazy: the first read builds the counts
+            try:
+                async with self._rebuild_lock:
+                    await asyncio.to_thread(self._rebuild_in_session)
+            except Exception as e:
+                logger.error(f"Facet count rebuild failed: {e}")
+
+# Global facet service instance
+facet_service = FacetService()
@@ -0,0 +1,268 @@
+import asyncio
+import calendar
+import heapq
+import ipaddress
+import logging
+import socket
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_REDIRECTS = 5
+
+
+class UnsafeFeedURL(ValueError):
+    """Raised for feed URLs (or redirect targets) that are not public http(s) addresses"""
+
+
+def _is_public_address(address) -> bool:
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def _parse_timestamp(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _item(
+    feed_url: str, index: int, title: str, url: str,
+    content: str, author: Optional[str], timestamp: float, image_url: Optional[str]
+) -> Dict[str, Any]:
+    """Cached, caller-independent part of an item; source and category are added by ``_present``"""
+    word_count = len(content.split()) if content else 0
+    return {
+        "id": f"{zlib.crc32(feed_url.encode('utf-8')):08x}_{index}",
+        "title": title or "No Title",
+        "content": content,
+        "excerpt": content[:200] + "..." if len(content) > 200 else content,
+        "author": author,
+        "url": url or "#",
+        "publishedAt": datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None,
+        "imageUrl": image_url,
+        "feedUrl": feed_url,
+        "wordCount": word_count,
+        "readingTime": max(1, -(-word_count // 200)),
+        "_ts": timestamp,
+    }
+
+
+def _present(item: Dict[str, Any], source: str, category: Optional[str]) -> Dict[str, Any]:
+    """Response item with the requesting caller's feed name and category"""
+    result = {k: v for k, v in item.items() if k != "_ts"}
+    result["author"] = item["author"] or source
+    result["source"] = source
+    result["category"] = category
+    return result
+
+
+class CachedFeed:
+    """Parsed feed as cached: upstream title plus items sorted newest-first"""
+
+    __slots__ = ("expires_at", "title", "items", "error")
+
+    def __init__(self, expires_at: float, title: Optional[str], items: List[dict], error: Optional[str]):
+        self.expires_at = expires_at
+        self.title = title
+        self.items = items
+        self.error = error
+
+
+class FeedAggregator:
+    """Fetches upstream feeds server-side and merges them newest-first.
+
+    Each feed is fetched through one pooled HTTP client and cached for
+    ``RSS_AGGREGATE_TTL_SECONDS`` as an already-sorted item list, in an LRU
+    of at most ``RSS_AGGREGATE_CACHE_MAX_FEEDS`` feeds (expired entries are
+    swept once per TTL). The cache holds only what the upstream feed says;
+    each caller's feed name and category are applied to the items it
+    returns. Concurrent requests for a feed that is being fetched await the
+    same in-flight task, so any number of clients share one upstream request
+    per feed per TTL. Feed URLs are caller-supplied, so every request and
+    redirect hop must resolve to public addresses only (no private,
+    loopback or link-local targets) unless RSS_AGGREGATE_ALLOW_PRIVATE_HOSTS
+    is set.
+    Aggregation is then a k-way ``heapq.merge`` over the sorted streams that
+    stops after ``limit`` items.
+    """
+
+    def __init__(self):
+        self.ttl = settings.RSS_AGGREGATE_TTL_SECONDS
+        self.max_items_per_feed = settings.RSS_AGGREGATE_MAX_ITEMS_PER_FEED
+        self._semaphore = asyncio.Semaphore(settings.RSS_AGGREGATE_MAX_CONCURRENCY)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.max_cached_feeds = settings.RSS_AGGREGATE_CACHE_MAX_FEEDS
+        self.allow_private_hosts = settings.RSS_AGGREGATE_ALLOW_PRIVATE_HOSTS
+        self._cache: "OrderedDict[str, CachedFeed]" = OrderedDict()
+        self._next_sweep = time.monotonic() + self.ttl
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"upstream_fetches": 0, "cache_hits": 0, "coalesced": 0, "evictions": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=15.0,
+                # Redirects are followed in _get so every hop is checked
+                follow_redirects=False,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            )
+        return self._client
+
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _parse(self, feed_url: str, response: httpx.Response) -> Tuple[Optional[str], List[dict]]:
+        """Normalize a JSON Feed or RSS/Atom document into (feed title, items sorted newest-first)"""
+        items = []
+        content_type = response.headers.get("content-type", "")
+        if "json" in content_type or response.content[:1] in (b"{", b"["):
+            data = response.json()
+            title = data.get("title")
+            for index, entry in enumerate(data.get("items", [])[:self.max_items_per_feed]):
+                authors = entry.get("authors") or []
+                items.append(_item(
+                    feed_url, index,
+                    title=entry.get("title"),
+                    url=entry.get("url"),
+                    content=entry.get("content_text") or entry.get("content_html") or entry.get("summary") or "",
+                    author=(authors[0].get("name") if authors else None) or entry.get("author"),
+                    timestamp=_parse_timestamp(entry.get("date_published") or entry.get("pubDate")),
+                    image_url=entry.get("image") or entry.get("thumbnail"),
+                ))
+        else:
+            import feedparser  # deferred: only RSS/Atom feeds need it, and it is slow to import
+
+            parsed = feedparser.parse(response.content)
+            title = parsed.feed.get("title")
+            for index, entry in enumerate(parsed.entries[:self.max_items_per_feed]):
+                published = entry.get("published_parsed") or entry.get("updated_parsed")
+                media = entry.get("media_thumbnail") or entry.get("media_content") or []
+                items.append(_item(
+                    feed_url, index,
+                    title=entry.get("title"),
+                    url=entry.get("link"),
+                    content=entry.get("summary", ""),
+                    author=entry.get("author"),
+                    timestamp=float(calendar.timegm(published)) if published else 0.0,
+                    image_url=media[0].get("url") if media else None,
+                ))
+        items.sort(key=lambda item: item["_ts"], reverse=True)
+        return title, items
+
+    def _store(self, feed_url: str, entry: CachedFeed):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            for url in [url for url, cached in self._cache.items() if cached.expires_at <= now]:
+                del self._cache[url]
+                self.stats["evictions"] += 1
+            self._next_sweep = now + self.ttl
+        self._cache[feed_url] = entry
+        self._cache.move_to_end(feed_url)
+        while len(self._cache) > self.max_cached_feeds:
+            self._cache.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def _check_public(self, url: httpx.URL):
+        if url.scheme not in ("http", "https") or not url.host:
+            raise UnsafeFeedURL(f"Unsupported feed URL: {url}")
+        if self.allow_private_hosts:
+            return
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                url.host, url.port or (443 if url.scheme == "https" else 80), type=socket.SOCK_STREAM
+            )
+        except socket.gaierror as e:
+            raise UnsafeFeedURL(f"Cannot resolve {url.host}: {e}") from e
+        for info in infos:
+            if not _is_public_address(ipaddress.ip_address(info[4][0].split("%")[0])):
+                raise UnsafeFeedURL(f"Feed host {url.host} resolves to a non-public address")
+
+    async def _get(self, feed_url: str) -> httpx.Response:
+        """GET following at most MAX_REDIRECTS redirects, each target checked before it is requested"""
+        url = httpx.URL(feed_url)
+        for _ in range(MAX_REDIRECTS + 1):
+            await self._check_public(url)
+            response = await self._get_client().get(url)
+            if response.next_request is None:
+                return response
+            url = response.next_request.url
+        raise httpx.TooManyRedirects(f"More than {MAX_REDIRECTS} redirects", request=response.request)
+
+    async def _fetch(self, feed_url: str) -> CachedFeed:
+        async with self._semaphore:
+            self.stats["upstream_fetches"] += 1
+            try:
+                response = await self._get(feed_url)
+                response.raise_for_status()
+                title, items = await asyncio.to_thread(self._parse, feed_url, response)
+                error = None
+            except Exception as e:
+                logger.warning(f"Feed fetch failed for {feed_url}: {e}")
+                title, items, error = None, [], str(e)
+        # Failed fetches are cached briefly too so a dead feed is not hammered
+        ttl = self.ttl if error is None else min(self.ttl, 30)
+        entry = CachedFeed(time.monotonic() + ttl, title, items, error)
+        self._store(feed_url, entry)
+        return entry
+
+    async def get_feed(self, feed_url: str) -> Tuple[CachedFeed, bool]:
+        """Parsed feed, shared across concurrent callers; returns (feed, cached)"""
+        cached = self._cache.get(feed_url)
+        if cached is not None and cached.expires_at > time.monotonic():
+            self._cache.move_to_end(feed_url)
+            self.stats["cache_hits"] += 1
+            return cached, True
+
+        task = self._inflight.get(feed_url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(feed_url))
+            self._inflight[feed_url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(feed_url, None))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task), False
+
+    async def aggregate(self, feeds: List[Dict[str, Optional[str]]], limit: int = 20) -> Dict[str, Any]:
+        """Fetch feeds concurrently and k-way merge them into the newest ``limit`` items"""
+        results = await asyncio.gather(*[self.get_feed(feed["url"]) for feed in feeds])
+        streams = [
+            [(item, feed, parsed.title) for item in parsed.items]
+            for feed, (parsed, _) in zip(feeds, results) if parsed.items
+        ]
+        merged = islice(heapq.merge(*streams, key=lambda entry: entry[0]["_ts"], reverse=True), limit)
+        return {
+            "items": [
+                _present(item, feed.get("name") or title or feed["url"], feed.get("category"))
+                for item, feed, title in merged
+            ],
+            "feeds": [
+                {
+                    "url": feed["url"], "ok": parsed.error is None, "items": len(parsed.items),
+                    "cached": cached, "error": parsed.error,
+                }
+                for feed, (parsed, cached) in zip(feeds, results)
+            ],
+        }
+
+# Global feed aggregator instance
+feed_aggregator = FeedAggregator()
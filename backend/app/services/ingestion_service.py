@@ -0,0 +1,309 @@
+import asyncio
+import calendar
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import Article, ArticleCreate
+from app.models.ingestion import IngestionState
+from app.models.rss_feed import RSSFeed
+from app.services.category_feed_service import category_feed_cache
+from app.services.facet_service import facet_service
+from app.services.news_api_service import news_api_service
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class IngestionThrottled(Exception):
+    """Raised when a run is triggered sooner than INGEST_MIN_INTERVAL_SECONDS after the last one"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Ingestion ran recently; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class IngestionService:
+    """In-app incremental ingestion from NewsAPI and approved RSS feeds.
+
+    Every source keeps a high-water mark (newest ``published_date`` stored)
+    in ``ingestion_state``: NewsAPI is queried with ``from`` set just past it
+    and RSS feeds are fetched with conditional GETs and filtered to entries
+    newer than it. Candidates are deduplicated against ``articles`` with one
+    ``url IN (...)`` query per run. NewsAPI returns newest first, so a
+    run pages back until it reaches the mark; a pull cut short by the page
+    limit leaves the mark where it was. Concurrent triggers share the run that
+    is already in progress; a new run starts at most once per
+    INGEST_MIN_INTERVAL_SECONDS, measured from ``ingestion_state`` so the
+    limit holds across worker processes.
+    """
+
+    def __init__(self):
+        self.categories = settings.INGEST_NEWSAPI_CATEGORIES
+        self.initial_lookback = timedelta(days=settings.INGEST_INITIAL_LOOKBACK_DAYS)
+        self.min_interval = settings.INGEST_MIN_INTERVAL_SECONDS
+        self.newsapi_page_size = settings.INGEST_NEWSAPI_PAGE_SIZE
+        self.newsapi_max_pages = settings.INGEST_NEWSAPI_MAX_PAGES
+        self._client: Optional[httpx.AsyncClient] = None
+        self._current: Optional[asyncio.Task] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=20.0, follow_redirects=True)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # -- state -------------------------------------------------------------
+
+    def _load_state(self, db: Session) -> Dict[str, IngestionState]:
+        return {state.source_key: state for state in db.query(IngestionState).all()}
+
+    def _last_run_at(self) -> Optional[datetime]:
+        db = SessionLocal()
+        try:
+            return _as_utc(db.query(func.max(IngestionState.last_run_at)).scalar())
+        finally:
+            db.close()
+
+    def _since(self, states: Dict[str, IngestionState], key: str) -> datetime:
+        state = states.get(key)
+        if state is not None and state.high_water_mark is not None:
+            return _as_utc(state.high_water_mark)
+        return datetime.now(timezone.utc) - self.initial_lookback
+
+    # -- sources -----------------------------------------------------------
+
+    async def _pull_newsapi(self, category: str, since: datetime) -> Tuple[List[ArticleCreate], bool]:
+        """New articles for a category, paging back (newest first) until ``since``.
+
+        Returns the articles and whether the whole window was covered. It
+        was not if INGEST_NEWSAPI_MAX_PAGES full pages came back, or a later
+        page failed.
+        """
+        articles: List[ArticleCreate] = []
+        for page in range(1, self.newsapi_max_pages + 1):
+            try:
+                batch = await news_api_service.search_articles(
+                    query=category,
+                    from_date=since + timedelta(seconds=1),
+                    max_articles=self.newsapi_page_size,
+                    page=page
+                )
+            except Exception as e:
+                if page == 1:
+                    raise
+                # e.g. the plan's result cap; keep what the earlier pages returned
+                logger.warning(f"NewsAPI paging for {category} stopped at page {page}: {e}")
+                return articles, False
+            for article in batch:
+                article.category = category
+            articles.extend(a for a in batch if a.published_date is None or _as_utc(a.published_date) > since)
+            dates = [_as_utc(a.published_date) for a in batch if a.published_date]
+            if len(batch) < self.newsapi_page_size or (dates and min(dates) <= since):
+                return articles, True
+        return articles, False
+
+    async def _pull_rss(self, feed: Dict[str, Any], since: datetime) -> Tuple[List[ArticleCreate], Dict[str, Any]]:
+        headers = {}
+        if feed["etag"]:
+            headers["If-None-Match"] = feed["etag"]
+        if feed["last_modified"]:
+            headers["If-Modified-Since"] = feed["last_modified"]
+
+        response = await self._get_client().get(feed["url"], headers=headers)
+        validators = {
+            "etag": response.headers.get("etag") or feed["etag"],
+            "last_modified": response.headers.get("last-modified") or feed["last_modified"],
+        }
+        if response.status_code == 304:
+            return [], validators
+        response.raise_for_status()
+
+        import feedparser  # deferred to first fetch to keep application import fast
+
+        parsed = await asyncio.to_thread(feedparser.parse, response.content)
+        articles = []
+        for entry in parsed.entries:
+            published = entry.get("published_parsed") or entry.get("updated_parsed")
+            published_date = datetime.fromtimestamp(calendar.timegm(published), timezone.utc) if published else None
+            if published_date is not None and published_date <= since:
+                continue
+            if not entry.get("link"):
+                continue
+            articles.append(ArticleCreate(
+                title=(entry.get("title") or "")[:500],
+                url=entry.get("link"),
+                description=entry.get("summary"),
+                author=entry.get("author"),
+                published_date=published_date,
+                source=feed["name"],
+                category=feed["category"],
+                rss_feed_id=feed["id"],
+                tags=[]
+            ))
+        return articles, validators
+
+    # -- run ---------------------------------------------------------------
+
+    def _save(self, db: Session, candidates: Dict[str, List[ArticleCreate]]) -> Tuple[Dict[str, int], List[Article]]:
+        """Insert articles whose URL is not stored yet; returns saved count per source"""
+        by_url: Dict[str, Tuple[str, ArticleCreate]] = {}
+        for key, articles in candidates.items():
+            for article in articles:
+                if article.url and article.url not in by_url:
+                    by_url[article.url] = (key, article)
+
+        existing = set()
+        urls = list(by_url)
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            existing.update(url for (url,) in db.query(Article.url).filter(Article.url.in_(chunk)).all())
+
+        saved: Dict[str, int] = {key: 0 for key in candidates}
+        new_articles = []
+        for url, (key, data) in by_url.items():
+            if url in existing:
+                continue
+            content = data.content or data.description or ""
+            word_count = len(content.split()) if content else 0
+            new_articles.append(Article(
+                title=data.title,
+                url=data.url,
+                description=data.description,
+                content=data.content,
+                author=data.author,
+                published_date=data.published_date,
+                source=data.source,
+                category=data.category,
+                image_url=data.image_url,
+                word_count=word_count,
+                reading_time=max(1, word_count // 200),
+                tags=data.tags or [],
+                rss_feed_id=data.rss_feed_id
+            ))
+            saved[key] += 1
+
+        db.add_all(new_articles)
+        return saved, new_articles
+
+    async def _run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            states = await asyncio.to_thread(self._load_state, db)
+            feeds = await asyncio.to_thread(lambda: [
+                {
+                    "id": f.id, "url": f.url, "name": f.name, "category": f.category,
+                    "etag": f.etag, "last_modified": f.last_modified,
+                }
+                for f in db.query(RSSFeed).filter(RSSFeed.is_active.is_(True), RSSFeed.is_approved.is_(True)).all()
+            ])
+
+            pulls = {f"newsapi:{c}": self._pull_newsapi(c, self._since(states, f"newsapi:{c}")) for c in self.categories}
+            pulls.update({f"rss:{f['id']}": self._pull_rss(f, self._since(states, f"rss:{f['id']}")) for f in feeds})
+            results = await asyncio.gather(*pulls.values(), return_exceptions=True)
+
+            candidates: Dict[str, List[ArticleCreate]] = {}
+            errors: Dict[str, str] = {}
+            validators: Dict[int, Dict[str, Any]] = {}
+            truncated = set()
+            for key, result in zip(pulls, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Ingestion pull failed for {key}: {result}")
+                    errors[key] = str(result)
+                    candidates[key] = []
+                elif key.startswith("rss:"):
+                    candidates[key], validators[int(key[4:])] = result
+                else:
+                    candidates[key], complete = result
+                    if not complete:
+                        truncated.add(key)
+
+            def persist():
+                saved, new_articles = self._save(db, candidates)
+                facets = [(a.category, a.source, a.published_date) for a in new_articles]
+                now = datetime.now(timezone.utc)
+                for key, articles in candidates.items():
+                    state = states.get(key) or IngestionState(source_key=key)
+                    dates = [_as_utc(a.published_date) for a in articles if a.published_date]
+                    if key in truncated:
+                        # Only the newest part of the window was fetched (newest first), so the mark
+                        # stays put and the next run pages back over the rest; URLs already saved dedupe
+                        logger.warning(f"Ingestion for {key} hit the page limit; keeping its high-water mark")
+                    elif dates:
+                        current = _as_utc(state.high_water_mark)
+                        state.high_water_mark = max(dates + ([current] if current else []))
+                    state.last_run_at = now
+                    state.last_fetched = len(articles)
+                    state.last_saved = saved.get(key, 0)
+                    db.add(state)
+                for feed_id, headers in validators.items():
+                    db.query(RSSFeed).filter(RSSFeed.id == feed_id).update({
+                        RSSFeed.etag: headers["etag"],
+                        RSSFeed.last_modified: headers["last_modified"],
+                        RSSFeed.last_fetched: now,
+                        RSSFeed.last_successful_fetch: now,
+                        RSSFeed.fetch_errors: 0,
+                    }, synchronize_session=False)
+                for key, error in errors.items():
+                    if key.startswith("rss:"):
+                        db.query(RSSFeed).filter(RSSFeed.id == int(key[4:])).update({
+                            RSSFeed.last_fetched: now,
+                            RSSFeed.fetch_errors: RSSFeed.fetch_errors + 1,
+                            RSSFeed.last_error: error[:1000],
+                        }, synchronize_session=False)
+                db.commit()
+                facet_service.add_articles(facets)
+                return saved
+
+            saved = await asyncio.to_thread(persist)
+        finally:
+            db.close()
+
+        total_saved = sum(saved.values())
+        if total_saved:
+            category_feed_cache.mark_stale()
+        return {
+            "message": f"Fetched {sum(len(a) for a in candidates.values())} new items, saved {total_saved}",
+            "total_fetched": sum(len(a) for a in candidates.values()),
+            "saved_count": total_saved,
+            "errors": errors,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        """Run one ingestion pass, or join the pass already in progress.
+
+        Raises IngestionThrottled when the last pass finished less than
+        INGEST_MIN_INTERVAL_SECONDS ago.
+        """
+        if self._current is None or self._current.done():
+            last_run_at = await asyncio.to_thread(self._last_run_at)
+            if last_run_at is not None:
+                wait = self.min_interval - (datetime.now(timezone.utc) - last_run_at).total_seconds()
+                if wait > 0:
+                    raise IngestionThrottled(math.ceil(wait))
+            # Another caller may have started a pass while the state was being read
+            if self._current is None or self._current.done():
+                self._current = asyncio.create_task(self._run())
+        return await asyncio.shield(self._current)
+
+# Global ingestion service instance
+ingestion_service = IngestionService()
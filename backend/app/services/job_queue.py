@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.query_stats import query_stats
+from app.core.tracing import tracer
+from app.models.ai_job import AIJob, PRIORITY_INTERACTIVE
+from app.models.article import Article
+from app.services.ai_service import ai_service
+from app.services.ollama_scheduler import LANE_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobQueue:
+    """Database-backed priority queue for AI enrichment jobs.
+
+    Jobs live in the ``ai_jobs`` table so they survive restarts. A bounded
+    pool of asyncio workers claims the lowest (priority, id) queued job with
+    a conditional UPDATE, so several API processes can share one table
+    without double-processing. Submitting for an article that already has an
+    active job returns that job (raising its priority if needed); a partial
+    unique index on (article_id, kind) backs this against concurrent
+    submissions. A failed attempt is retried after an exponential backoff
+    (``available_at``) until AI_JOB_MAX_ATTEMPTS is reached.
+    """
+
+    def __init__(self):
+        self.worker_count = settings.AI_JOB_WORKERS
+        self.max_attempts = settings.AI_JOB_MAX_ATTEMPTS
+        self.poll_interval = settings.AI_JOB_POLL_SECONDS
+        self.stale_after = settings.AI_JOB_STALE_SECONDS
+        self.retry_base = settings.AI_JOB_RETRY_BASE_SECONDS
+        self.retry_max = settings.AI_JOB_RETRY_MAX_SECONDS
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+
+    # -- submission --------------------------------------------------------
+
+    def submit(self, db: Session, article_id: int, priority: int = PRIORITY_INTERACTIVE, kind: str = "enrich") -> AIJob:
+        """Queue a job, deduplicated per article and kind"""
+        job = self._active_job(db, article_id, kind)
+        if job is None:
+            job = AIJob(article_id=article_id, kind=kind, priority=priority, status="queued", attempts=0)
+            db.add(job)
+            try:
+                db.commit()
+                db.refresh(job)
+            except IntegrityError:
+                # A concurrent submission inserted the active job first
+                db.rollback()
+                job = self._active_job(db, article_id, kind)
+                if job is None:
+                    raise
+
+        if priority < job.priority:
+            job.priority = priority
+            db.commit()
+
+        if self._loop is not None:
+            # Submissions arrive from threadpool endpoints; wake a worker on the loop thread
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return job
+
+    @staticmethod
+    def _active_job(db: Session, article_id: int, kind: str) -> Optional[AIJob]:
+        return db.query(AIJob).filter(
+            AIJob.article_id == article_id,
+            AIJob.kind == kind,
+            AIJob.status.in_(ACTIVE_STATUSES)
+        ).order_by(AIJob.id).first()
+
+    def get(self, db: Session, job_id: int) -> Optional[AIJob]:
+        return db.query(AIJob).filter(AIJob.id == job_id).first()
+
+    # -- workers -----------------------------------------------------------
+
+    def _claim(self) -> Optional[int]:
+        """Atomically move the next due queued job to running; returns its id"""
+        db = SessionLocal()
+        try:
+            for _ in range(5):
+                candidate = db.query(AIJob.id).filter(
+                    AIJob.status == "queued",
+                    or_(AIJob.available_at.is_(None), AIJob.available_at <= datetime.now(timezone.utc))
+                ).order_by(AIJob.priority, AIJob.id).first()
+                if candidate is None:
+                    return None
+                claimed = db.query(AIJob).filter(
+                    AIJob.id == candidate.id, AIJob.status == "queued"
+                ).update({
+                    AIJob.status: "running",
+                    AIJob.started_at: datetime.now(timezone.utc),
+                    AIJob.attempts: AIJob.attempts + 1,
+                }, synchronize_session=False)
+                db.commit()
+                if claimed == 1:
+                    return candidate.id
+            return None
+        finally:
+            db.close()
+
+    def _load_article(self, job_id: int):
+        db = SessionLocal()
+        try:
+            job = self.get(db, job_id)
+            article = db.query(Article).filter(Article.id == job.article_id).first()
+            if article is None:
+                return None
+            return article.content or article.description or article.title
+        finally:
+            db.close()
+
+    def _finish(self, job_id: int, result: Optional[dict], error: Optional[str]):
+        db = SessionLocal()
+        try:
+            job = self.get(db, job_id)
+            article = None
+            if error is None:
+                article = db.query(Article).filter(Article.id == job.article_id).first()
+                if article is None:
+                    # Deleted while the job ran; nothing left to retry
+                    error = "Article not found"
+                    job.attempts = max(job.attempts, self.max_attempts)
+            if error is None:
+                article.ai_summary = result["summary"]
+                article.ai_sentiment = result["sentiment"]
+                article.ai_topics = result["keywords"]
+                job.status = "done"
+                job.result = json.dumps(result)
+                job.error = None
+            elif job.attempts < self.max_attempts:
+                job.status = "queued"
+                job.error = error
+                job.available_at = datetime.now(timezone.utc) + timedelta(seconds=self.retry_delay(job.attempts))
+            else:
+                job.status = "failed"
+                job.error = error
+            if job.status in ("done", "failed"):
+                job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+        finally:
+            db.close()
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the next attempt after `attempts` failed ones"""
+        return min(self.retry_max, self.retry_base * 2 ** max(attempts - 1, 0))
+
+    async def _process(self, job_id: int):
+        content = await asyncio.to_thread(self._load_article, job_id)
+        if content is None:
+            await asyncio.to_thread(self._finish, job_id, None, "Article not found")
+            return
+
+        try:
+            summary, sentiment, keywords = await asyncio.gather(
+                ai_service.generate_summary(content, lane=LANE_BACKGROUND),
+                ai_service.analyze_sentiment(content, lane=LANE_BACKGROUND, local_first=settings.LOCAL_NLP_ENABLED),
+                ai_service.extract_keywords(content, lane=LANE_BACKGROUND, local_first=settings.LOCAL_NLP_ENABLED),
+            )
+            if summary is None:
+                raise RuntimeError("Summary generation failed")
+            result, error = {"summary": summary, "sentiment": sentiment, "keywords": keywords}, None
+        except Exception as e:
+            result, error = None, str(e)
+        await asyncio.to_thread(self._finish, job_id, result, error)
+
+    async def _worker(self, number: int):
+        while True:
+            try:
+                job_id = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.error(f"AI job worker {number} failed to claim a job: {e}")
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    if number == 0:
+                        try:
+                            await asyncio.to_thread(self._requeue_interrupted)
+                        except Exception as e:
+                            logger.error(f"Requeueing interrupted AI jobs failed: {e}")
+                continue
+
+            try:
+                with tracer.trace("ai_job", kind="internal", job_id=job_id), query_stats.scope("ai_job"):
+                    await self._process(job_id)
+            except Exception as e:
+                logger.error(f"AI job {job_id} crashed: {e}")
+
+    def _requeue_interrupted(self):
+        """Jobs stuck in running (their process died) go back to the queue, or fail once out of attempts"""
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            stale = [AIJob.status == "running", AIJob.started_at < now - timedelta(seconds=self.stale_after)]
+            failed = db.query(AIJob).filter(*stale, AIJob.attempts >= self.max_attempts).update({
+                AIJob.status: "failed",
+                AIJob.error: "Interrupted on its last attempt",
+                AIJob.finished_at: now,
+            }, synchronize_session=False)
+            count = db.query(AIJob).filter(*stale).update(
+                {AIJob.status: "queued", AIJob.available_at: now}, synchronize_session=False
+            )
+            db.commit()
+            if count or failed:
+                logger.info(f"Requeued {count} interrupted AI jobs, failed {failed} out of attempts")
+        finally:
+            db.close()
+
+    async def start(self):
+        """Start the worker pool (called from the application lifespan)"""
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        await asyncio.to_thread(self._requeue_interrupted)
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+# Global job queue instance
+job_queue = JobQueue()
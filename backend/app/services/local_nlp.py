@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, try_advisory_xact_lock
+from app.models.article import Article
+from app.models.corpus import BUILT_AT_TERM, CorpusTerm, TOTAL_DOCUMENTS_TERM
+
+logger = logging.getLogger(__name__)
+
+# How often workers look for statistics rebuilt by another process
+CORPUS_CHECK_SECONDS = 300
+
+WORD = re.compile(r"[a-z][a-z'\-]*[a-z]|[a-z]")
+# Phrase boundaries for RAKE candidates: sentence and clause punctuation
+PHRASE_BREAK = re.compile(r"[.,;:!?()\[\]{}\"“”‘’|/\\—–]+|\s-\s|\n")
+
+STOPWORDS = frozenset("""
+a about above after again against all almost also although am among an and another any are aren't around as at
+be because been before being below between both but by can can't cannot could couldn't did didn't do does doesn't
+doing don't down during each either else even ever every few for from further get gets got had hadn't has hasn't
+have haven't having he he'd he'll he's her here here's hers herself him himself his how how's however i i'd i'll
+i'm i've if in into is isn't it it's its itself just least less let's like made make many may me might more most
+much must mustn't my myself neither no nor not now of off often on once one only or other others otherwise ought
+our ours ourselves out over own per perhaps quite rather really said same say says shall shan't she she'd she'll
+she's should shouldn't since so some still such than that that's the their theirs them themselves then there
+there's these they they'd they'll they're they've this those though through thus to too toward towards under
+until up upon us very via was wasn't we we'd we'll we're we've were weren't what what's whatever when when's where
+where's whether which while who who's whom whose why why's will with within without won't would wouldn't yet you
+you'd you'll you're you've your yours yourself yourselves new news year years week day days today yesterday
+according told amid including us also mr mrs ms
+""".split())
+
+POSITIVE = frozenset("""
+achieve achieved achievement advance advanced advances agreement approve approved award awarded benefit benefits
+best better boom boost boosted breakthrough bright celebrate celebrated champion cheer clean comeback confident
+cure cured delight delighted easing efficient encouraging enjoy excellent exciting expand expanded expansion
+fantastic favorable gain gained gains generous glad good great grow growing growth happy healthy help helped
+hope hopeful impressive improve improved improvement improving innovative inspiring
+love lucky milestone optimism optimistic outperform peace positive praise praised profit profitable progress
+promising prosper prosperity rally rebound recover recovered recovery relief resolve resolved reward rise
+rising robust safe safety save saved secure strong stronger succeed success successful support surge surged
+thrive thriving triumph upbeat upgrade upgraded victory welcome win winner winning wins
+""".split())
+
+NEGATIVE = frozenset("""
+abuse accident accused afraid alarm anger angry arrest arrested attack attacked ban bankrupt bankruptcy bad
+battle blast bleak breach bribery broke broken collapse collapsed conflict corrupt corruption crash crashed crime
+crisis critical criticism criticized damage damaged danger dangerous dead deadly death deaths decline declined
+default deficit delay delayed destroy destroyed disaster dispute downturn drop dropped fail failed failing failure
+fall fallen falling fear fears fined fired flood fraud grim guilty halt harm hurt illegal injured
+injury inflation investigation jail kill killed killing lawsuit layoff layoffs lose losing loss losses murder
+negative outage outbreak panic plunge plunged poor poverty problem protest recall recession risk risks scandal
+shooting shortage shot shutdown slump slow slowdown steal strike struggle struggling sue sued suffer suspect
+tension terror threat threatened toxic tragedy trouble turmoil unemployment victim victims violence violent war
+warn warned warning weak weaker worse worst wound wounded
+""".split())
+
+NEGATIONS = frozenset({"not", "no", "never", "without", "hardly", "barely", "isn't", "wasn't", "aren't", "don't",
+                       "doesn't", "didn't", "won't", "can't", "cannot", "couldn't", "shouldn't", "nor"})
+
+
+def tokenize(text: str) -> List[str]:
+    return WORD.findall(text.lower().replace("’", "'"))
+
+
+def _candidate_phrases(text: str, max_words: int = 3) -> List[Tuple[str, ...]]:
+    """RAKE candidates: runs of content words between stopwords and punctuation"""
+    phrases = []
+    for fragment in PHRASE_BREAK.split(text.lower().replace("’", "'")):
+        run: List[str] = []
+        for word in WORD.findall(fragment):
+            if word in STOPWORDS or len(word) < 3 or word.isdigit():
+                if run:
+                    phrases.append(tuple(run[:max_words]))
+                run = []
+            else:
+                run.append(word)
+        if run:
+            phrases.append(tuple(run[:max_words]))
+    return phrases
+
+
+class LocalNLP:
+    """CPU-only sentiment and keyword extraction for bulk enrichment.
+
+    Sentiment is a news-oriented lexicon count with negation handling;
+    keywords are RAKE phrases re-weighted by inverse document frequency from
+    the ``corpus_terms`` table, which is rebuilt periodically from
+    ``articles``. Both return a confidence so AIService can fall back to the
+    LLM when the local answer is weak. Only one process rebuilds the table
+    per refresh interval (under an advisory lock); the others reload it
+    when its build time changes.
+    """
+
+    def __init__(self):
+        self.document_frequency: Dict[str, int] = {}
+        self.documents = 0
+        self.built_at: Optional[int] = None
+        self.stats = Counter()
+
+    # -- sentiment ---------------------------------------------------------
+
+    def sentiment(self, text: str) -> Tuple[str, float]:
+        """(label, confidence in 0..1)"""
+        tokens = tokenize(text)
+        positive = negative = 0
+        for index, token in enumerate(tokens):
+            polarity = 1 if token in POSITIVE else -1 if token in NEGATIVE else 0
+            if not polarity:
+                continue
+            if any(t in NEGATIONS for t in tokens[max(0, index - 3):index]):
+                polarity = -polarity
+            if polarity > 0:
+                positive += 1
+            else:
+                negative += 1
+
+        hits = positive + negative
+        if hits == 0:
+            # Plenty of text with no loaded words at all is what neutral reporting looks like
+            return "neutral", 0.6 if len(tokens) >= 40 else 0.3
+        score = (positive - negative) / hits
+        evidence = min(1.0, hits / 4)
+        if score > 0.3:
+            return "positive", round(evidence * score, 3)
+        if score < -0.3:
+            return "negative", round(evidence * -score, 3)
+        return "neutral", round(0.55 * evidence, 3)
+
+    # -- keywords ----------------------------------------------------------
+
+    def _idf(self, word: str) -> float:
+        if not self.documents:
+            return 1.0
+        return math.log((self.documents + 1) / (self.document_frequency.get(word, 1) + 1)) + 1.0
+
+    def keywords(self, text: str, limit: int = 8) -> Tuple[List[str], float]:
+        """(keywords, confidence in 0..1)"""
+        phrases = _candidate_phrases(text)
+        frequency: Counter = Counter()
+        degree: Counter = Counter()
+        for phrase in phrases:
+            for word in phrase:
+                frequency[word] += 1
+                degree[word] += len(phrase)
+
+        word_score = {word: degree[word] / frequency[word] * self._idf(word) for word in frequency}
+        scored: Dict[Tuple[str, ...], float] = {}
+        for phrase in phrases:
+            scored[phrase] = max(scored.get(phrase, 0.0), sum(word_score[w] for w in phrase))
+
+        keywords: List[str] = []
+        seen_words = set()
+        for phrase, _ in sorted(scored.items(), key=lambda item: (-item[1], item[0])):
+            # Skip phrases that only repeat words of a better-ranked phrase
+            if set(phrase) <= seen_words:
+                continue
+            keywords.append(" ".join(phrase))
+            seen_words.update(phrase)
+            if len(keywords) == limit:
+                break
+
+        confidence = min(1.0, len(keywords) / 5) * (1.0 if self.documents >= settings.LOCAL_NLP_MIN_CORPUS_DOCUMENTS else 0.6)
+        return keywords, round(confidence, 3)
+
+    # -- corpus statistics -------------------------------------------------
+
+    def rebuild(self, db: Session):
+        """Recount document frequencies over all articles and store them in corpus_terms"""
+        started = time.perf_counter()
+        frequency: Counter = Counter()
+        documents = 0
+        query = db.query(Article.title, Article.description, Article.content).yield_per(1000)
+        for title, description, content in query:
+            terms = {
+                t for t in tokenize(" ".join(filter(None, (title, description, content))))
+                if t not in STOPWORDS and 2 < len(t) <= 100
+            }
+            frequency.update(terms)
+            documents += 1
+
+        # Terms seen once carry no more information than unseen ones (df defaults to 1)
+        rows = [{"term": term, "document_count": count} for term, count in frequency.items() if count > 1]
+        terms = len(rows)
+        built_at = int(time.time())
+        rows.append({"term": TOTAL_DOCUMENTS_TERM, "document_count": documents})
+        rows.append({"term": BUILT_AT_TERM, "document_count": built_at})
+        db.execute(delete(CorpusTerm))
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(CorpusTerm), rows[start:start + 5000])
+        db.commit()
+
+        self.document_frequency = {row["term"]: row["document_count"] for row in rows[:terms]}
+        self.documents = documents
+        self.built_at = built_at
+        logger.info(
+            f"Corpus statistics rebuilt: {documents} articles, {terms} terms "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    def load(self, db: Session) -> bool:
+        """Load stored statistics; False when none have been built yet"""
+        counts = dict(db.query(CorpusTerm.term, CorpusTerm.document_count).all())
+        documents = counts.pop(TOTAL_DOCUMENTS_TERM, 0)
+        built_at = counts.pop(BUILT_AT_TERM, None)
+        if not documents:
+            return False
+        self.document_frequency = counts
+        self.documents = documents
+        self.built_at = built_at
+        return True
+
+    @staticmethod
+    def _stored_built_at(db: Session) -> Optional[int]:
+        return db.query(CorpusTerm.document_count).filter(CorpusTerm.term == BUILT_AT_TERM).scalar()
+
+    def refresh(self, db: Session, max_age: int):
+        """Rebuild when the stored statistics are older than `max_age` seconds, else load them if they changed.
+
+        The rebuild runs under an advisory lock, so of several workers due
+        at the same time one recounts and the rest keep their current
+        statistics until the next check picks up the new table.
+        """
+        built_at = self._stored_built_at(db)
+        if built_at is None or time.time() - built_at >= max_age:
+            if try_advisory_xact_lock(db, "corpus_terms"):
+                # Re-read under the lock: another worker may have just finished
+                built_at = self._stored_built_at(db)
+                if built_at is None or time.time() - built_at >= max_age:
+                    self.rebuild(db)
+                    return
+            db.rollback()
+        if built_at is not None and built_at != self.built_at:
+            self.load(db)
+
+    def _refresh_in_session(self, max_age: int):
+        db = SessionLocal()
+        try:
+            self.refresh(db, max_age)
+        finally:
+            db.close()
+
+    async def run_periodically(self, interval: Optional[int] = None):
+        """Background loop started from the application lifespan"""
+        interval = interval or settings.LOCAL_NLP_CORPUS_REFRESH_SECONDS
+        while True:
+            try:
+                await asyncio.to_thread(self._refresh_in_session, interval)
+            except Exception as e:
+                logger.error(f"Corpus statistics refresh failed: {e}")
+            await asyncio.sleep(min(interval, CORPUS_CHECK_SECONDS))
+
+    def snapshot(self) -> dict:
+        return {"corpus_documents": self.documents, "corpus_terms": len(self.document_frequency), **self.stats}
+
+
+# Global local NLP instance
+local_nlp = LocalNLP()
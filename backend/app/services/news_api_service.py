@@ -4,6 +4,7 @@ from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import json
 from app.core.config import settings
+from app.core.tracing import tracer
 from app.models.article import Article, ArticleCreate
 import logging
 
@@ -13,12 +14,33 @@ class NewsAPIService:
     def __init__(self):
         self.api_key = settings.NEWS_API_KEY
         self.base_url = "https://newsapi.org/v2"
-        self.client = httpx.AsyncClient(timeout=30.0)
-        
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use so importing the service does not open a connection pool
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        return self._client
+
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
+    async def _get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        # The span records the endpoint only; params carry the API key
+        with tracer.span("newsapi.request", kind="client", endpoint=url[len(self.base_url):]) as span:
+            try:
+                response = await self._get_client().get(url, params=params)
+                if span is not None:
+                    span.set(status=response.status_code)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                logger.error(f"NewsAPI request failed: {e}")
+                raise
+
     async def get_top_headlines(
         self, 
         country: str = "us",
@@ -55,13 +77,7 @@ class NewsAPIService:
         if q:
             params["q"] = q
             
-        try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"NewsAPI request failed: {e}")
-            raise
+        return await self._get(url, params)
     
     async def get_everything(
         self,
@@ -113,13 +129,7 @@ class NewsAPIService:
         if to_date:
             params["to"] = to_date.isoformat()
             
-        try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"NewsAPI request failed: {e}")
-            raise
+        return await self._get(url, params)
     
     async def get_sources(
         self,
@@ -146,13 +156,7 @@ class NewsAPIService:
         if country:
             params["country"] = country
             
-        try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"NewsAPI request failed: {e}")
-            raise
+        return await self._get(url, params)
     
     def _parse_newsapi_article(self, article_data: Dict[str, Any]) -> ArticleCreate:
         """
@@ -251,44 +255,46 @@ class NewsAPIService:
         from_date: Optional[datetime] = None,
         to_date: Optional[datetime] = None,
         sources: Optional[List[str]] = None,
-        max_articles: int = 100
+        max_articles: int = 100,
+        page: int = 1
     ) -> List[ArticleCreate]:
         """
-        Search for articles using a specific query
+        Search for articles using a specific query, newest first
         
         Args:
             query: Search query
             from_date: Start date for search
             to_date: End date for search
             sources: List of source IDs to search within
-            max_articles: Maximum number of articles to return
+            max_articles: Maximum number of articles to return (page size, at most 100)
+            page: Page number to retrieve
+
+        Raises on request failures and NewsAPI error responses so callers
+        can tell "no new articles" from "NewsAPI is failing".
         """
-        try:
-            response = await self.get_everything(
-                q=query,
-                sources=",".join(sources) if sources else None,
-                from_date=from_date,
-                to_date=to_date,
-                sort_by="publishedAt",
-                page_size=min(100, max_articles)
-            )
-            
-            articles = []
-            if response.get("status") == "ok":
-                for article_data in response.get("articles", []):
-                    try:
-                        article = self._parse_newsapi_article(article_data)
-                        articles.append(article)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse article: {e}")
-                        continue
-            
-            return articles
-            
-        except Exception as e:
-            logger.error(f"Failed to search articles: {e}")
-            return []
-    
+        response = await self.get_everything(
+            q=query,
+            sources=",".join(sources) if sources else None,
+            from_date=from_date,
+            to_date=to_date,
+            sort_by="publishedAt",
+            page_size=min(100, max_articles),
+            page=page
+        )
+        if response.get("status") != "ok":
+            raise RuntimeError(f"NewsAPI error: {response.get('code')}: {response.get('message')}")
+
+        articles = []
+        for article_data in response.get("articles", []):
+            try:
+                article = self._parse_newsapi_article(article_data)
+                articles.append(article)
+            except Exception as e:
+                logger.warning(f"Failed to parse article: {e}")
+                continue
+
+        return articles
+
     def search_articles_sync(
         self,
         query: str,
@@ -0,0 +1,315 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 500
+
+# Health checks fetch /api/tags and /api/ps concurrently
+PROBE_CONNECTIONS = 2
+
+
+def configured_hosts() -> List[str]:
+    return settings.OLLAMA_HOSTS or [settings.OLLAMA_HOST]
+
+
+def model_key(model: str) -> str:
+    """Ollama reports "llama2:latest" for a model requested as "llama2" """
+    return model if ":" in model else f"{model}:latest"
+
+
+class NoBackendAvailable(Exception):
+    pass
+
+
+class TrafficWindow:
+    """Outcomes of recent AI calls, for health reporting from live traffic"""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._events: Deque[tuple] = deque(maxlen=10000)
+
+    def record(self, latency: float, ok: bool):
+        self._events.append((time.monotonic(), latency, ok))
+
+    def snapshot(self) -> dict:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+        latencies = sorted(latency for _, latency, ok in self._events if ok)
+        errors = sum(1 for _, _, ok in self._events if not ok)
+
+        def pct(q: float) -> float:
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else 0.0
+
+        return {
+            "window_seconds": self.window_seconds,
+            "requests": len(self._events),
+            "errors": errors,
+            "error_rate": round(errors / len(self._events), 3) if self._events else 0.0,
+            "latency_ms": {"p50": pct(0.5), "p95": pct(0.95)},
+        }
+
+
+class OllamaBackend:
+    def __init__(self, url: str, max_connections: int):
+        self.url = url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            base_url=self.url,
+            timeout=settings.AI_REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        # Health and /api/ps probes get their own connections so a saturated generation pool cannot starve them
+        self.probe_client = httpx.AsyncClient(
+            base_url=self.url,
+            timeout=settings.AI_HEALTH_PROBE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=PROBE_CONNECTIONS, max_keepalive_connections=PROBE_CONNECTIONS),
+        )
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.backoff = settings.AI_BACKEND_EJECT_SECONDS
+        self.loaded_models: Set[str] = set()
+        self.models_checked_at = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._probe_lock = asyncio.Lock()
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > 0
+
+    def record_success(self, latency: float, model: Optional[str]):
+        self.requests += 1
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+        if model:
+            self.loaded_models.add(model_key(model))
+
+    def record_failure(self, error: str):
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.AI_BACKEND_EJECT_AFTER_FAILURES and not self.ejected:
+            self.eject(error)
+
+    def eject(self, error: str):
+        self.ejected_until = time.monotonic() + self.backoff
+        logger.warning(f"Ollama backend {self.url} ejected for {self.backoff:.0f}s: {error}")
+        self.backoff = min(self.backoff * 2, settings.AI_BACKEND_EJECT_MAX_SECONDS)
+
+    def restore(self):
+        if self.ejected:
+            logger.info(f"Ollama backend {self.url} is back")
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        self.backoff = settings.AI_BACKEND_EJECT_SECONDS
+
+    async def close(self):
+        await asyncio.gather(self.client.aclose(), self.probe_client.aclose())
+
+    async def refresh_models(self) -> bool:
+        """Re-read the loaded models from /api/ps; doubles as the re-probe for an ejected backend"""
+        async with self._probe_lock:
+            if time.monotonic() - self.models_checked_at < 1.0:
+                return not self.ejected
+            try:
+                response = await self.probe_client.get("/api/ps", timeout=5.0)
+                response.raise_for_status()
+                self.loaded_models = {m.get("model") or m.get("name") for m in response.json().get("models", [])}
+                self.models_checked_at = time.monotonic()
+                self.restore()
+                return True
+            except (httpx.HTTPError, ValueError) as e:
+                self.models_checked_at = time.monotonic()
+                if self.ejected:
+                    self.eject(f"re-probe failed: {e}")
+                else:
+                    self.record_failure(str(e))
+                return False
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def pct(q: float) -> float:
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else 0.0
+
+        return {
+            "url": self.url,
+            "state": "ejected" if self.ejected else "healthy",
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "loaded_models": sorted(self.loaded_models),
+            "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": round(latencies[-1] * 1000, 1) if latencies else 0.0},
+        }
+
+
+class OllamaPool:
+    """Routes Ollama requests across several servers.
+
+    Picks the healthy backend with the fewest outstanding requests,
+    preferring ones that already have the requested model loaded (a cold
+    model costs seconds to load). Health is tracked passively: consecutive
+    connection errors or 5xx responses eject a backend, and once its backoff
+    expires a cheap /api/ps call re-probes it before traffic returns; each
+    failed re-probe doubles the backoff.
+    """
+
+    def __init__(self, urls: Optional[List[str]] = None):
+        self.urls = urls or configured_hosts()
+        self._backends: Optional[List[OllamaBackend]] = None
+        self.traffic = TrafficWindow(settings.AI_HEALTH_TRAFFIC_WINDOW_SECONDS)
+
+    @property
+    def backends(self) -> List[OllamaBackend]:
+        # Clients are created on first use, not at import
+        if self._backends is None:
+            self._backends = [OllamaBackend(url, settings.AI_MAX_CONCURRENCY) for url in self.urls]
+        return self._backends
+
+    async def close(self):
+        if self._backends is not None:
+            await asyncio.gather(*(backend.close() for backend in self._backends))
+            self._backends = None
+
+    async def _candidates(self, model: Optional[str]) -> List[OllamaBackend]:
+        now = time.monotonic()
+        stale = [
+            b for b in self.backends
+            if (b.ejected and now >= b.ejected_until)
+            or (model and not b.ejected and now - b.models_checked_at > settings.AI_BACKEND_MODELS_REFRESH_SECONDS)
+        ]
+        if stale:
+            await asyncio.gather(*(b.refresh_models() for b in stale))
+        return [b for b in self.backends if not b.ejected]
+
+    def _pick(self, candidates: List[OllamaBackend], model: Optional[str], exclude: Set[str],
+              prefer: Optional[str] = None) -> Optional[OllamaBackend]:
+        candidates = [b for b in candidates if b.url not in exclude]
+        if not candidates:
+            return None
+        # Follow-up requests (chat turns) go back to the backend holding their KV cache while it has room
+        for b in candidates:
+            if b.url == prefer and b.outstanding < settings.AI_MAX_CONCURRENCY:
+                return b
+        if model:
+            warm = [b for b in candidates if model_key(model) in b.loaded_models]
+            # Affinity yields once every warm host is busier than a cold one by a full slot's worth
+            if warm and min(b.outstanding for b in warm) < min(b.outstanding for b in candidates) + settings.AI_MAX_CONCURRENCY:
+                candidates = warm
+
+        def median_latency(b: OllamaBackend) -> float:
+            return sorted(b.latencies)[len(b.latencies) // 2] if b.latencies else 0.0
+
+        return min(candidates, key=lambda b: (b.outstanding, median_latency(b)))
+
+    async def post(self, path: str, json: Dict[str, Any], model: Optional[str] = None) -> httpx.Response:
+        """POST to the best backend; connection failures are retried once on another backend"""
+        started = time.monotonic()
+        try:
+            response = await self._post(path, json, model)
+        except Exception:
+            self.traffic.record(time.monotonic() - started, ok=False)
+            raise
+        self.traffic.record(time.monotonic() - started, ok=response.status_code < 500)
+        return response
+
+    async def _post(self, path: str, json: Dict[str, Any], model: Optional[str]) -> httpx.Response:
+        candidates = await self._candidates(model)
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+        for _ in range(2):
+            backend = self._pick(candidates, model, tried)
+            if backend is None:
+                break
+            tried.add(backend.url)
+            backend.outstanding += 1
+            started = time.monotonic()
+            span = tracer.start_span("ollama.request", kind="client", backend=backend.url, path=path, model=model)
+            try:
+                response = await backend.client.post(path, json=json)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # Nothing reached the server, so trying elsewhere cannot duplicate work
+                tracer.end_span(span, error=e)
+                backend.record_failure(str(e))
+                last_error = e
+                continue
+            except httpx.HTTPError as e:
+                tracer.end_span(span, error=e)
+                backend.record_failure(str(e))
+                raise
+            finally:
+                backend.outstanding -= 1
+            tracer.end_span(span, status=response.status_code)
+            if response.status_code >= 500:
+                backend.record_failure(f"HTTP {response.status_code}")
+            else:
+                backend.record_success(time.monotonic() - started, model if response.status_code == 200 else None)
+            return response
+        raise NoBackendAvailable(f"No Ollama backend available: {last_error or 'all backends ejected'}")
+
+    @asynccontextmanager
+    async def stream(self, path: str, json: Dict[str, Any], model: Optional[str] = None,
+                     prefer: Optional[str] = None) -> AsyncIterator[Tuple[str, httpx.Response]]:
+        """Streamed POST; yields (backend url, response) with the body still unread.
+
+        Routing and the connect-error retry are the same as post(); latency is
+        recorded when the caller has finished reading the body.
+        """
+        started = time.monotonic()
+        candidates = await self._candidates(model)
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+        for _ in range(2):
+            backend = self._pick(candidates, model, tried, prefer)
+            if backend is None:
+                break
+            tried.add(backend.url)
+            backend.outstanding += 1
+            span = tracer.start_span("ollama.stream", kind="client", backend=backend.url, path=path, model=model)
+            try:
+                request = backend.client.build_request("POST", path, json=json)
+                try:
+                    response = await backend.client.send(request, stream=True)
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    tracer.end_span(span, error=e)
+                    backend.record_failure(str(e))
+                    last_error = e
+                    continue
+                try:
+                    yield backend.url, response
+                finally:
+                    await response.aclose()
+            except httpx.HTTPError as e:
+                tracer.end_span(span, error=e)
+                backend.record_failure(str(e))
+                self.traffic.record(time.monotonic() - started, ok=False)
+                raise
+            finally:
+                backend.outstanding -= 1
+            tracer.end_span(span, status=response.status_code)
+
+            latency = time.monotonic() - started
+            if response.status_code >= 500:
+                backend.record_failure(f"HTTP {response.status_code}")
+            else:
+                backend.record_success(latency, model if response.status_code == 200 else None)
+            self.traffic.record(latency, ok=response.status_code < 500)
+            return
+        self.traffic.record(time.monotonic() - started, ok=False)
+        raise NoBackendAvailable(f"No Ollama backend available: {last_error or 'all backends ejected'}")
+
+    def snapshot(self) -> List[dict]:
+        return [backend.snapshot() for backend in self.backends]
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings
+from app.services.ollama_pool import configured_hosts
+
+# Lanes in priority order: a free slot always goes to the oldest waiter of the first non-empty lane
+LANE_INTERACTIVE = "interactive"
+LANE_BACKGROUND = "background"
+LANE_HEALTH = "health"
+LANES = (LANE_INTERACTIVE, LANE_BACKGROUND, LANE_HEALTH)
+
+WAIT_SAMPLES = 1000
+
+
+class AIServiceBusy(Exception):
+    """Raised when a request cannot get an Ollama slot within its lane's limits"""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"AI service busy ({lane} lane {reason})")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LaneStats:
+    def __init__(self):
+        self.admitted = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def snapshot(self, waiting: int) -> dict:
+        waits = sorted(self.waits)
+
+        def pct(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 1) if waits else 0.0
+
+        return {
+            "waiting": waiting,
+            "max_depth": self.max_depth,
+            "admitted": self.admitted,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "p50": pct(0.5),
+                "p95": pct(0.95),
+                "max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            },
+        }
+
+
+class OllamaScheduler:
+    """Admission control in front of Ollama.
+
+    Ollama only runs a few generations at once and queues the rest
+    internally, where interactive calls, enrichment jobs and health probes
+    wait behind each other until the HTTP timeout fires. Here at most
+    ``max_concurrency`` requests (per-backend slots times backends) are in
+    flight; the rest wait in per-lane FIFO queues and a released slot is
+    handed to the highest-priority lane.
+    A waiter that exceeds its lane's queue timeout, or arrives at a full
+    queue, fails fast with AIServiceBusy.
+    """
+
+    def __init__(self):
+        self.max_concurrency = settings.AI_MAX_CONCURRENCY * len(configured_hosts())
+        self.max_waiting = settings.AI_QUEUE_MAX_WAITING
+        self.queue_timeouts = {
+            LANE_INTERACTIVE: settings.AI_QUEUE_TIMEOUT_INTERACTIVE,
+            LANE_BACKGROUND: settings.AI_QUEUE_TIMEOUT_BACKGROUND,
+            LANE_HEALTH: settings.AI_QUEUE_TIMEOUT_HEALTH,
+        }
+        self._in_flight = 0
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._stats = {lane: LaneStats() for lane in LANES}
+
+    @asynccontextmanager
+    async def slot(self, lane: str = LANE_INTERACTIVE, timeout: Optional[float] = None):
+        """Hold one Ollama slot for the duration of the block"""
+        await self._acquire(lane, self.queue_timeouts[lane] if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, lane: str, timeout: float):
+        stats = self._stats[lane]
+        if self._in_flight < self.max_concurrency and not any(self._waiters.values()):
+            self._in_flight += 1
+            stats.admitted += 1
+            stats.waits.append(0.0)
+            return
+
+        queue = self._waiters[lane]
+        if len(queue) >= self.max_waiting:
+            stats.rejected += 1
+            raise AIServiceBusy(lane, "queue full", self._retry_after(lane))
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        stats.max_depth = max(stats.max_depth, len(queue))
+        started = time.monotonic()
+        try:
+            # asyncio.wait (unlike wait_for) never cancels the future, so a slot handed
+            # over at the same moment as the timeout is seen below and not lost
+            done, _ = await asyncio.wait({future}, timeout=timeout)
+        except asyncio.CancelledError:
+            if future.done():
+                self._release()
+            else:
+                queue.remove(future)
+            raise
+
+        if not done:
+            queue.remove(future)
+            stats.timeouts += 1
+            raise AIServiceBusy(lane, f"queue wait exceeded {timeout:g}s", self._retry_after(lane))
+        stats.admitted += 1
+        stats.waits.append(time.monotonic() - started)
+
+    def _release(self):
+        # Hand the slot straight to the next waiter so a newcomer cannot jump the queue
+        for lane in LANES:
+            queue = self._waiters[lane]
+            if queue:
+                queue.popleft().set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _retry_after(self, lane: str) -> int:
+        waits = self._stats[lane].waits
+        typical = sorted(waits)[len(waits) // 2] if waits else 1.0
+        return max(1, int(typical + 0.999))
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "lanes": {lane: self._stats[lane].snapshot(len(self._waiters[lane])) for lane in LANES},
+        }
+
+
+# Global scheduler instance
+ollama_scheduler = OllamaScheduler()
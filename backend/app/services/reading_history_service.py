@@ -0,0 +1,236 @@
+import asyncio
+import base64
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import ReadingHistory, ReadingHistoryDaily
+
+logger = logging.getLogger(__name__)
+
+# Progress at or above this percentage counts as a completed read in rollups
+COMPLETED_PROGRESS = 90
+
+# Dialect INSERT constructs that support ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+class ReadingHistoryService:
+    """Reading progress storage: one row per (user, article) plus daily rollups.
+
+    Recent activity lives in ``reading_history`` and is upserted on
+    ``(user_id, article_id)`` so repeated reads never add rows. Rows older
+    than the retention window are compacted into ``reading_history_daily``
+    (one row per user per day) and deleted, which keeps the hot table and
+    its indexes bounded by the number of active readers in the window.
+    """
+
+    def __init__(self):
+        self.retention_days = settings.READING_HISTORY_RETENTION_DAYS
+
+    # -- writes ------------------------------------------------------------
+
+    def upsert_many(self, db: Session, reads: Dict[Tuple[int, int], dict]) -> int:
+        """Upsert ``{(user_id, article_id): {progress, time_spent, read_at}}`` in one statement.
+
+        INSERT ... ON CONFLICT on the unique (user_id, article_id) index, so
+        concurrent writers (requests and event-buffer flushes) merge into the
+        same row. Progress keeps the furthest point reached, time spent
+        accumulates and ``read_at`` moves to the latest read. The caller commits.
+        """
+        if not reads:
+            return 0
+        dialect = db.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise NotImplementedError(f"Reading history upsert is not supported on {dialect}")
+
+        table = ReadingHistory.__table__
+        statement = UPSERT_INSERTS[dialect](table)
+        progress = func.coalesce(table.c.reading_progress, 0)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.article_id],
+            set_={
+                "read_at": statement.excluded.read_at,
+                "reading_progress": case(
+                    (progress > statement.excluded.reading_progress, progress),
+                    else_=statement.excluded.reading_progress,
+                ),
+                "time_spent": func.coalesce(table.c.time_spent, 0) + statement.excluded.time_spent,
+            },
+        )
+        # Sorted so concurrent batches take row locks in the same order
+        db.execute(statement, [
+            {
+                "user_id": user_id, "article_id": article_id, "read_at": read["read_at"],
+                "reading_progress": read["progress"], "time_spent": read["time_spent"],
+            }
+            for (user_id, article_id), read in sorted(reads.items())
+        ])
+        return len(reads)
+
+    def record_progress(
+        self, db: Session, user_id: int, article_id: int, progress: int, time_spent: int
+    ) -> ReadingHistory:
+        """Upsert a single reading-progress update and return the stored row"""
+        self.upsert_many(db, {
+            (user_id, article_id): {
+                "progress": progress,
+                "time_spent": time_spent,
+                "read_at": datetime.now(timezone.utc),
+            }
+        })
+        db.commit()
+        return db.query(ReadingHistory).filter(
+            ReadingHistory.user_id == user_id, ReadingHistory.article_id == article_id
+        ).first()
+
+    # -- reads -------------------------------------------------------------
+
+    @staticmethod
+    def encode_cursor(row: ReadingHistory) -> str:
+        raw = f"{row.read_at.isoformat()}|{row.id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Raises ValueError for malformed cursors"""
+        try:
+            read_at, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit("|", 1)
+            return datetime.fromisoformat(read_at), int(row_id)
+        except Exception as e:
+            raise ValueError("Invalid cursor") from e
+
+    def list_history(
+        self, db: Session, user_id: int, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[ReadingHistory], Optional[str]]:
+        """Most recent reads first, keyset-paginated on (read_at, id)"""
+        query = db.query(ReadingHistory).filter(ReadingHistory.user_id == user_id)
+        if cursor:
+            read_at, row_id = self.decode_cursor(cursor)
+            query = query.filter(or_(
+                ReadingHistory.read_at < read_at,
+                and_(ReadingHistory.read_at == read_at, ReadingHistory.id < row_id),
+            ))
+        rows = query.order_by(ReadingHistory.read_at.desc(), ReadingHistory.id.desc()).limit(limit + 1).all()
+        next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def list_daily(self, db: Session, user_id: int, days: int = 30) -> List[ReadingHistoryDaily]:
+        since = date.today() - timedelta(days=days)
+        return db.query(ReadingHistoryDaily).filter(
+            ReadingHistoryDaily.user_id == user_id, ReadingHistoryDaily.day >= since
+        ).order_by(ReadingHistoryDaily.day.desc()).all()
+
+    def daily_stamp(self, db: Session, user_id: int) -> Tuple:
+        """Cheap version of a user's daily rollups for ETags; changes whenever a rollup touches them"""
+        return tuple(db.query(
+            func.count(ReadingHistoryDaily.id),
+            func.max(ReadingHistoryDaily.day),
+            func.sum(ReadingHistoryDaily.articles_read),
+            func.sum(ReadingHistoryDaily.total_time_spent),
+        ).filter(ReadingHistoryDaily.user_id == user_id).one())
+
+    # -- retention ---------------------------------------------------------
+
+    def rollup(self, db: Session, retention_days: Optional[int] = None, batch_days: int = 1) -> int:
+        """Compact rows older than the retention window into daily aggregates.
+
+        Works through the expired range one ``batch_days`` slice at a time so
+        each transaction stays small. Returns the number of rows compacted.
+        """
+        retention_days = retention_days or self.retention_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        oldest = db.query(func.min(ReadingHistory.read_at)).filter(ReadingHistory.read_at < cutoff).scalar()
+        compacted = 0
+
+        while oldest is not None:
+            if oldest.tzinfo is None:
+                oldest = oldest.replace(tzinfo=timezone.utc)
+            slice_start = datetime.combine(oldest.date(), datetime.min.time(), tzinfo=timezone.utc)
+            slice_end = min(cutoff, slice_start + timedelta(days=batch_days))
+            in_slice = and_(ReadingHistory.read_at >= slice_start, ReadingHistory.read_at < slice_end)
+
+            aggregates = db.query(
+                ReadingHistory.user_id,
+                func.date(ReadingHistory.read_at).label("day"),
+                func.count(ReadingHistory.id),
+                func.sum(case((ReadingHistory.reading_progress >= COMPLETED_PROGRESS, 1), else_=0)),
+                func.sum(func.coalesce(ReadingHistory.time_spent, 0)),
+            ).filter(in_slice).group_by(ReadingHistory.user_id, func.date(ReadingHistory.read_at)).all()
+
+            if aggregates:
+                self._merge_daily(db, aggregates)
+                compacted += db.query(ReadingHistory).filter(in_slice).delete(synchronize_session=False)
+            db.commit()
+
+            oldest = db.query(func.min(ReadingHistory.read_at)).filter(
+                ReadingHistory.read_at >= slice_end, ReadingHistory.read_at < cutoff
+            ).scalar()
+
+        if compacted:
+            logger.info(f"Rolled up {compacted} reading history rows older than {retention_days} days")
+        return compacted
+
+    def _merge_daily(self, db: Session, aggregates):
+        rows = {}
+        for user_id, day, articles_read, completed, time_spent in aggregates:
+            if isinstance(day, str):
+                day = date.fromisoformat(day)
+            rows[(user_id, day)] = (int(articles_read), int(completed or 0), int(time_spent or 0))
+
+        existing = {
+            (user_id, day): row_id
+            for row_id, user_id, day in db.query(
+                ReadingHistoryDaily.id, ReadingHistoryDaily.user_id, ReadingHistoryDaily.day
+            ).filter(tuple_(ReadingHistoryDaily.user_id, ReadingHistoryDaily.day).in_(list(rows))).all()
+        }
+
+        table = ReadingHistoryDaily.__table__
+        updates, inserts = [], []
+        for (user_id, day), (articles_read, completed, time_spent) in rows.items():
+            row_id = existing.get((user_id, day))
+            if row_id is None:
+                inserts.append({
+                    "user_id": user_id, "day": day, "articles_read": articles_read,
+                    "completed_count": completed, "total_time_spent": time_spent,
+                })
+            else:
+                updates.append({
+                    "b_id": row_id, "b_read": articles_read,
+                    "b_completed": completed, "b_time": time_spent,
+                })
+        if updates:
+            db.execute(table.update().where(table.c.id == bindparam("b_id")).values(
+                articles_read=table.c.articles_read + bindparam("b_read"),
+                completed_count=table.c.completed_count + bindparam("b_completed"),
+                total_time_spent=table.c.total_time_spent + bindparam("b_time"),
+            ), updates)
+        if inserts:
+            db.execute(table.insert(), inserts)
+
+    def _rollup_in_session(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.rollup(db)
+        finally:
+            db.close()
+
+    async def run_periodically(self, interval: Optional[int] = None):
+        """Background retention loop started from the application lifespan"""
+        interval = interval or settings.READING_HISTORY_ROLLUP_SECONDS
+        while True:
+            try:
+                await asyncio.to_thread(self._rollup_in_session)
+            except Exception as e:
+                logger.error(f"Reading history rollup failed: {e}")
+            await asyncio.sleep(interval)
+
+# Global reading history service instance
+reading_history_service = ReadingHistoryService()
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, try_advisory_xact_lock
+from app.models.article import Article, ArticleResponse, ReadingHistory
+from app.models.trending import TrendingState
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each engagement signal
+VIEW_WEIGHT = 1.0
+SHARE_WEIGHT = 3.0
+READ_WEIGHT = 2.0
+# Age penalty exponent (score / (age_hours + 2) ** GRAVITY)
+GRAVITY = 1.5
+
+
+class TrendingService:
+    """Scores articles by time-decayed engagement velocity.
+
+    Each run aggregates ``reading_history`` events in 1h/6h/24h windows with a
+    single grouped query, turns ``view_count``/``share_count`` growth since the
+    previous run into exponentially decayed velocities and publishes an
+    immutable snapshot that the trending endpoints serve without touching
+    the database.
+
+    Baselines and velocities live in ``trending_state`` so every worker
+    scores from the same numbers. One worker at a time (advisory lock on
+    PostgreSQL), and at most once per half refresh interval, advances that
+    state and writes ``Article.is_trending``; the others build their
+    snapshot from the stored velocities without writing. The first run
+    only records the counts as a baseline, so lifetime totals are not
+    mistaken for growth.
+    """
+
+    def __init__(self):
+        self.half_life_hours = settings.TRENDING_HALF_LIFE_HOURS
+        self.min_advance_seconds = settings.TRENDING_REFRESH_SECONDS / 2
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refresh_lock = asyncio.Lock()
+
+    @staticmethod
+    def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def _read_windows(self, db: Session, now: datetime) -> Dict[int, float]:
+        """Weighted reading events per article over the last 24 hours"""
+        hour_ago = now - timedelta(hours=1)
+        six_hours_ago = now - timedelta(hours=6)
+        rows = db.query(
+            ReadingHistory.article_id,
+            func.sum(case((ReadingHistory.read_at >= hour_ago, 1), else_=0)),
+            func.sum(case((ReadingHistory.read_at >= six_hours_ago, 1), else_=0)),
+            func.count(ReadingHistory.id),
+        ).filter(
+            ReadingHistory.read_at >= now - timedelta(hours=24)
+        ).group_by(ReadingHistory.article_id).all()
+
+        reads = {}
+        for article_id, last_hour, last_six, last_day in rows:
+            last_hour, last_six = int(last_hour or 0), int(last_six or 0)
+            reads[article_id] = last_hour + 0.5 * (last_six - last_hour) + 0.2 * (last_day - last_six)
+        return reads
+
+    def compute(self, db: Session) -> Dict[str, Any]:
+        """Score candidate articles, update ``is_trending`` in bulk and publish a snapshot"""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        reads = self._read_windows(db, now)
+
+        window_start = now - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+        candidates = db.query(
+            Article.id, Article.category, Article.published_date, Article.created_at,
+            Article.view_count, Article.share_count,
+        ).filter(
+            or_(
+                Article.published_date >= window_start,
+                Article.created_at >= window_start,
+                Article.id.in_(list(reads)) if reads else False,
+            )
+        ).all()
+
+        # One worker at a time advances the shared state; the lock is released at commit/rollback
+        leader = try_advisory_xact_lock(db, "trending_refresh")
+        state = {row.article_id: row for row in db.query(TrendingState).all()}
+        last_run_at = max((self._as_utc(row.computed_at) for row in state.values()), default=None)
+        advance = leader and (last_run_at is None or (now - last_run_at).total_seconds() >= self.min_advance_seconds)
+
+        elapsed_hours = None if last_run_at is None else (now - last_run_at).total_seconds() / 3600
+        decay = 1.0 if elapsed_hours is None else 0.5 ** (elapsed_hours / self.half_life_hours)
+
+        scores: Dict[int, float] = {}
+        categories: Dict[int, Optional[str]] = {}
+        counts: Dict[int, Tuple[int, int]] = {}
+        velocity: Dict[int, float] = {}
+        for row in candidates:
+            views, shares = row.view_count or 0, row.share_count or 0
+            previous = state.get(row.id)
+            if not advance:
+                velocity[row.id] = previous.velocity if previous is not None else 0.0
+            else:
+                if previous is not None:
+                    baseline = (previous.view_count, previous.share_count)
+                else:
+                    # Lifetime counts are not growth: the first pass (and any article first seen
+                    # now but created before the previous pass) only records a baseline
+                    created = self._as_utc(row.created_at)
+                    is_new = last_run_at is not None and created is not None and created >= last_run_at
+                    baseline = (0, 0) if is_new else (views, shares)
+                last_views, last_shares = baseline
+                growth = VIEW_WEIGHT * max(0, views - last_views) + SHARE_WEIGHT * max(0, shares - last_shares)
+                velocity[row.id] = (previous.velocity if previous is not None else 0.0) * decay + growth
+            counts[row.id] = (views, shares)
+
+            engagement = velocity[row.id] + READ_WEIGHT * reads.get(row.id, 0.0)
+            if engagement <= 0:
+                continue
+            published = self._as_utc(row.published_date or row.created_at) or now
+            age_hours = max(0.0, (now - published).total_seconds() / 3600)
+            scores[row.id] = engagement / math.pow(age_hours + 2, GRAVITY)
+            categories[row.id] = row.category
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        trending_ids = ranked[:settings.TRENDING_LIMIT]
+        by_category_ids: Dict[str, List[int]] = {}
+        for article_id in ranked:
+            category = categories[article_id]
+            if category is None:
+                continue
+            bucket = by_category_ids.setdefault(category.lower(), [])
+            if len(bucket) < settings.TRENDING_CATEGORY_LIMIT:
+                bucket.append(article_id)
+
+        flagged = set(trending_ids)
+        for bucket in by_category_ids.values():
+            flagged.update(bucket)
+        if advance:
+            self._save_state(db, counts, velocity, now)
+            self._update_flags(db, flagged)
+        else:
+            db.rollback()
+
+        articles = {}
+        if flagged:
+            for article in db.query(Article).filter(Article.id.in_(list(flagged))).all():
+                item = ArticleResponse.model_validate(article).model_dump(mode="json")
+                item["trending_score"] = round(scores[article.id], 6)
+                articles[article.id] = item
+
+        snapshot = {
+            "generated_at": now.isoformat(),
+            "articles": [articles[i] for i in trending_ids if i in articles],
+            "by_category": {
+                category: [articles[i] for i in ids if i in articles]
+                for category, ids in by_category_ids.items()
+            },
+        }
+
+        self._snapshot = snapshot
+        logger.info(
+            f"Trending snapshot: {len(candidates)} candidates, {len(flagged)} trending "
+            f"({'advanced state' if advance else 'from stored state'}) "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return snapshot
+
+    def _save_state(self, db: Session, counts: Dict[int, Tuple[int, int]], velocity: Dict[int, float], now: datetime):
+        """Replace the shared baselines with this run's counts and velocities (committed with the flags)"""
+        db.query(TrendingState).delete(synchronize_session=False)
+        if counts:
+            db.execute(TrendingState.__table__.insert(), [
+                {
+                    "article_id": article_id, "view_count": views, "share_count": shares,
+                    "velocity": velocity[article_id] if velocity[article_id] > 0.01 else 0.0,
+                    "computed_at": now,
+                }
+                for article_id, (views, shares) in counts.items()
+            ])
+
+    def _update_flags(self, db: Session, trending_ids: set):
+        """Bulk-flip ``is_trending`` so only changed rows are written"""
+        ids = list(trending_ids)
+        clear = db.query(Article).filter(Article.is_trending.is_(True))
+        if ids:
+            clear = clear.filter(Article.id.notin_(ids))
+            db.query(Article).filter(
+                Article.id.in_(ids), or_(Article.is_trending.is_(False), Article.is_trending.is_(None))
+            ).update({Article.is_trending: True}, synchronize_session=False)
+        clear.update({Article.is_trending: False}, synchronize_session=False)
+        db.commit()
+
+    def _compute_in_session(self) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            return self.compute(db)
+        finally:
+            db.close()
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Recompute the snapshot off the event loop, coalescing concurrent callers"""
+        async with self._refresh_lock:
+            return await asyncio.to_thread(self._compute_in_session)
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """Current snapshot, computing the first one on demand"""
+        if self._snapshot is None:
+            async with self._refresh_lock:
+                if self._snapshot is None:
+                    await asyncio.to_thread(self._compute_in_session)
+        return self._snapshot
+
+    async def run_periodically(self, interval: Optional[int] = None):
+        """Background loop started from the application lifespan"""
+        interval = interval or settings.TRENDING_REFRESH_SECONDS
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Trending computation failed: {e}")
+            await asyncio.sleep(interval)
+
+# Global trending service instance
+trending_service = TrendingService()
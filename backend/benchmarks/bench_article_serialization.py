@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark article list serialization: Pydantic response model vs the orjson fast path.
+
+Builds in-memory ``Article`` rows with realistic content and compares:
+  pydantic   - ArticleResponse validation from ORM attributes + JSON dump (what
+               a ``response_model=List[ArticleResponse]`` route does)
+  orjson     - trusted-row dicts encoded with orjson, fragment cache cold
+  fragments  - same, with every article body already in the fragment cache
+
+Usage:
+    cd backend
+    python benchmarks/bench_article_serialization.py --sizes 100 500 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Models import the engine module; nothing here touches the database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from pydantic import TypeAdapter
+
+from app.models.article import Article, ArticleResponse
+from app.services.article_serializer import ArticleSerializer
+
+PARAGRAPH = (
+    "The quarterly results beat analyst expectations as cloud revenue grew faster than "
+    "forecast, while hardware sales slowed amid supply constraints in several regions. "
+)
+
+
+def make_articles(count: int) -> List[Article]:
+    now = datetime.now(timezone.utc)
+    return [
+        Article(
+            id=i,
+            title=f"Article {i}: markets, models and the week in technology",
+            url=f"https://example.com/news/{i}",
+            description=PARAGRAPH * 2,
+            content=PARAGRAPH * 40,
+            author="Staff Writer",
+            published_date=now - timedelta(minutes=i),
+            source="Example News",
+            category="technology",
+            tags='["ai", "cloud", "earnings"]',
+            image_url=f"https://example.com/img/{i}.jpg",
+            word_count=1000,
+            reading_time=5,
+            ai_summary=PARAGRAPH,
+            ai_sentiment="positive",
+            ai_topics='["cloud", "revenue"]',
+            is_featured=False,
+            is_trending=i % 10 == 0,
+            view_count=i * 3,
+            share_count=i,
+            created_at=now,
+            updated_at=now,
+            rss_feed_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+def measure(fn, min_seconds: float = 1.0):
+    runs, started = 0, time.perf_counter()
+    while True:
+        payload = fn()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return runs / elapsed, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[ArticleResponse])
+
+    print(f"{'articles':>8} {'variant':>10} {'lists/s':>10} {'articles/s':>12} {'MB/s':>8} {'speedup':>8}")
+    for size in args.sizes:
+        rows = make_articles(size)
+
+        def pydantic_path():
+            return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+        def orjson_cold():
+            return ArticleSerializer(max_entries=size).render_list(rows)
+
+        warm = ArticleSerializer(max_entries=size)
+        warm.render_list(rows)
+
+        def orjson_warm():
+            return warm.render_list(rows)
+
+        baseline = None
+        for name, fn in (("pydantic", pydantic_path), ("orjson", orjson_cold), ("fragments", orjson_warm)):
+            rate, length = measure(fn, args.seconds)
+            baseline = baseline or rate
+            print(
+                f"{size:>8} {name:>10} {rate:>10.1f} {rate * size:>12.0f} "
+                f"{rate * length / 1e6:>8.1f} {rate / baseline:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark repeated polling of cached read endpoints with and without If-None-Match.
+
+Seeds a throwaway SQLite database, then polls each endpoint with plain GETs
+(full body every time) and with conditional GETs (304 once the client holds
+the current ETag) and reports requests per second.
+
+Usage:
+    cd backend
+    python benchmarks/bench_http_cache.py --articles 2000 --requests 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(article_count: int):
+    from app.core.database import SessionLocal
+    from app.models.article import Article
+    from app.models.rss_feed import RSSFeed
+
+    db = SessionLocal()
+    try:
+        feed = RSSFeed(name="Bench", url="http://bench.invalid/rss", category="Technology", is_active=True, is_approved=True)
+        db.add(feed)
+        db.flush()
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            Article(
+                title=f"Article {i}",
+                url=f"http://bench.invalid/{i}",
+                description="Lorem ipsum dolor sit amet " * 10,
+                source="Bench",
+                category="Technology",
+                published_date=now - timedelta(minutes=i),
+                view_count=article_count - i,
+                share_count=i % 7,
+                rss_feed_id=feed.id,
+            )
+            for i in range(article_count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def poll(client, path: str, requests: int, conditional: bool) -> float:
+    etag = client.get(path).headers.get("etag")
+    headers = {"If-None-Match": etag} if conditional and etag else {}
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+        assert response.status_code == (304 if headers else 200), response.status_code
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_http_cache_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["EVENT_LOG_DIR"] = f"{workdir}/events"
+    os.environ.setdefault("EMBEDDING_BACKEND", "hash")
+
+    from fastapi.testclient import TestClient
+    import main as app_main
+
+    paths = [
+        "/api/v1/rss/trending?limit=100",
+        "/api/v1/rss/category/technology",
+        "/api/v1/news/categories",
+    ]
+
+    from app.core.migrations import upgrade
+
+    upgrade()
+    seed(args.articles)
+
+    with TestClient(app_main.app) as client:
+        print(f"{args.articles} articles, {args.requests} requests per run")
+        print(f"{'endpoint':40} {'full req/s':>12} {'304 req/s':>12} {'speedup':>8}")
+        for path in paths:
+            full = poll(client, path, args.requests, conditional=False)
+            not_modified = poll(client, path, args.requests, conditional=True)
+            print(f"{path:40} {full:12.0f} {not_modified:12.0f} {not_modified / full:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark local sentiment/keyword extraction against the LLM path.
+
+Builds corpus statistics from a seeded SQLite database, then runs every
+article through the local model and through AIService's LLM prompts, and
+reports articles/sec for each path, how often the local answer would be
+kept (confidence above LOCAL_NLP_MIN_CONFIDENCE), and agreement with the
+LLM: sentiment label match rate and keyword word-overlap (Jaccard).
+
+By default the "LLM" is benchmarks/fake_ollama.py acting as an oracle that
+answers with the labels and topics the synthetic articles were generated
+from, so agreement is accuracy on synthetic data. Pass --ollama-url (and
+optionally --database-url with real articles) to measure agreement with a
+real model instead.
+
+Usage:
+    cd backend
+    python benchmarks/bench_local_nlp.py --articles 2000 --llm-articles 100
+    python benchmarks/bench_local_nlp.py --ollama-url http://localhost:11434 --database-url postgresql://...
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+SUBJECTS = ["Acme Robotics", "The city council", "Northwind Energy", "The health ministry", "Globex Bank",
+            "The national team", "Initech Software", "The port authority", "Stark Pharmaceuticals", "The university"]
+TOPICS = ["battery storage", "housing policy", "wind turbines", "vaccine rollout", "interest rates",
+          "world cup qualifiers", "cloud security", "shipping delays", "cancer therapy", "research funding"]
+EVENTS = {
+    "positive": ["reported strong growth in {topic}", "celebrated a breakthrough in {topic}",
+                 "won praise for progress on {topic}", "saw profits surge thanks to {topic}",
+                 "announced an impressive recovery in {topic}"],
+    "negative": ["warned of layoffs linked to {topic}", "faces a fraud investigation over {topic}",
+                 "suffered heavy losses on {topic}", "was criticized after a crisis in {topic}",
+                 "reported a sharp decline in {topic}"],
+    "neutral": ["published a report on {topic}", "scheduled a meeting about {topic}",
+                "released figures on {topic}", "outlined plans for {topic}", "discussed {topic} with officials"],
+}
+FILLER = ["The statement was released on Monday morning.", "Officials are expected to provide details later.",
+          "The announcement follows a review that began in March.", "A spokesperson confirmed the timeline.",
+          "Further information will be published on the website."]
+
+
+def synthetic_article(rng: random.Random):
+    label = rng.choice(list(EVENTS))
+    subject, topic = rng.choice(SUBJECTS), rng.choice(TOPICS)
+    sentences = [f"{subject} {rng.choice(EVENTS[label]).format(topic=topic)}."]
+    for _ in range(rng.randint(2, 5)):
+        if rng.random() < 0.5:
+            sentences.append(f"{subject} {rng.choice(EVENTS[label]).format(topic=topic)} again.")
+        else:
+            sentences.append(rng.choice(FILLER))
+    return f"{subject} and {topic}", " ".join(sentences), label, [topic, subject.lower().replace("the ", "")]
+
+
+def seed(count: int, rng: random.Random):
+    from app.core.database import SessionLocal
+    from app.models.article import Article
+
+    truth = {}
+    db = SessionLocal()
+    try:
+        for i in range(count):
+            title, body, label, keywords = synthetic_article(rng)
+            db.add(Article(title=title, url=f"http://bench.invalid/{i}", content=body, source="Bench", category="General"))
+            truth[body] = (label, keywords)
+        db.commit()
+    finally:
+        db.close()
+    return truth
+
+
+def load_articles(limit: int):
+    from app.core.database import SessionLocal
+    from app.models.article import Article
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Article.content, Article.description, Article.title).limit(limit).all()
+        return [content or description or title for content, description, title in rows]
+    finally:
+        db.close()
+
+
+def words(keywords):
+    return {w for k in keywords for w in k.lower().split()}
+
+
+async def run_llm(ai_service, texts):
+    from app.services.ollama_scheduler import LANE_BACKGROUND
+
+    results = []
+
+    async def one(text):
+        sentiment, keywords = await asyncio.gather(
+            ai_service.analyze_sentiment(text, lane=LANE_BACKGROUND),
+            ai_service.extract_keywords(text, lane=LANE_BACKGROUND),
+        )
+        results.append((text, sentiment, keywords))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    elapsed = time.perf_counter() - started
+    await ai_service.close()
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=2000, help="synthetic articles to seed")
+    parser.add_argument("--llm-articles", type=int, default=100, help="articles sent through the LLM path")
+    parser.add_argument("--database-url", help="use existing articles instead of synthetic ones")
+    parser.add_argument("--ollama-url", help="real Ollama to compare against (default: fake oracle)")
+    parser.add_argument("--fake-latency-ms", type=float, default=300, help="fake Ollama generation time")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    workdir = tempfile.mkdtemp(prefix="bench_local_nlp_")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.core.migrations import upgrade
+
+    truth = {}
+    if not args.database_url:
+        upgrade()
+        truth = seed(args.articles, rng)
+    texts = load_articles(args.articles)
+
+    server = None
+    if args.ollama_url:
+        settings.OLLAMA_HOSTS = [args.ollama_url]
+    else:
+        import fake_ollama
+
+        def oracle(prompt: str) -> str:
+            for body, (label, keywords) in truth.items():
+                if body[:60] in prompt:
+                    return label if "Sentiment:" in prompt else ", ".join(keywords)
+            return "neutral"
+
+        server, url = fake_ollama.start(first_token_ms=args.fake_latency_ms, tokens=1, responder=oracle)
+        settings.OLLAMA_HOSTS = [url]
+
+    from app.services.ai_service import AIService
+    from app.services.local_nlp import local_nlp
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    local_nlp.rebuild(db)
+    db.close()
+    print(f"corpus statistics: {local_nlp.documents} articles, {len(local_nlp.document_frequency)} terms "
+          f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    started = time.perf_counter()
+    local = {text: (local_nlp.sentiment(text), local_nlp.keywords(text)) for text in texts}
+    local_rate = len(texts) / (time.perf_counter() - started)
+
+    sample = texts[:args.llm_articles]
+    llm_results, llm_elapsed = asyncio.run(run_llm(AIService(), sample))
+
+    threshold = settings.LOCAL_NLP_MIN_CONFIDENCE
+    sentiment_kept = sum(1 for (_, c), _ in local.values() if c >= threshold) / len(local)
+    keywords_kept = sum(1 for _, (_, c) in local.values() if c >= threshold) / len(local)
+    agree = sum(1 for text, sentiment, _ in llm_results if local[text][0][0] == sentiment) / len(llm_results)
+    kept_agree = [local[text][0][0] == sentiment for text, sentiment, _ in llm_results if local[text][0][1] >= threshold]
+    jaccard = [
+        len(words(local[text][1][0]) & words(keywords)) / max(1, len(words(local[text][1][0]) | words(keywords)))
+        for text, _, keywords in llm_results
+    ]
+
+    print(f"local path:  {local_rate:10.0f} articles/s (sentiment + keywords)")
+    print(f"LLM path:    {len(sample) / llm_elapsed:10.1f} articles/s "
+          f"({'real Ollama' if args.ollama_url else f'fake Ollama, {args.fake_latency_ms:.0f}ms per call'}, "
+          f"{settings.AI_MAX_CONCURRENCY} concurrent)")
+    print(f"kept locally at confidence >= {threshold}: sentiment {sentiment_kept:.0%}, keywords {keywords_kept:.0%}")
+    print(f"sentiment agreement with LLM: {agree:.0%} overall, "
+          f"{sum(kept_agree) / max(1, len(kept_agree)):.0%} where the local answer is kept")
+    print(f"keyword overlap with LLM (Jaccard): {sum(jaccard) / len(jaccard):.2f}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Exercise multi-backend Ollama routing against several local fake servers.
+
+Starts fake Ollama servers with different speeds and loaded models, plus
+one address where nothing listens, points OLLAMA_HOSTS at them and sends
+concurrent generations through AIService (scheduler + backend pool). The
+report shows throughput for one backend vs all of them and how requests
+were spread: the dead host should be ejected after a few failures, the
+host without the model loaded should only take overflow (after which it
+counts as warm), and the slow host should get fewer requests than the
+fast one.
+
+Usage:
+    cd backend
+    python benchmarks/bench_ollama_backends.py --requests 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fake_ollama  # noqa: E402
+
+
+def dead_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+async def run(urls, requests: int, concurrency: int):
+    from app.core.config import settings
+    from app.services.ai_service import AIService
+    from app.services.ollama_scheduler import OllamaScheduler
+
+    # Fresh instances so the scheduler's cap scales with this run's backend count
+    settings.OLLAMA_HOSTS = urls
+    service = AIService()
+    service.scheduler = OllamaScheduler()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await service.analyze_sentiment(f"article {i}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    snapshot = service.backends.snapshot()
+    await service.close()
+    return requests / elapsed, snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--json", action="store_true", help="print per-backend stats as JSON")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    servers = {
+        "fast": fake_ollama.start(first_token_ms=40, tokens=1),
+        "slow": fake_ollama.start(first_token_ms=120, tokens=1),
+        "cold": fake_ollama.start(first_token_ms=40, tokens=1, loaded_models=()),
+    }
+    urls = {name: url for name, (_, url) in servers.items()}
+    urls["dead"] = dead_url()
+    names = {url: name for name, url in urls.items()}
+
+    single, _ = asyncio.run(run([urls["fast"]], args.requests, args.concurrency))
+    multi, snapshot = asyncio.run(run(list(urls.values()), args.requests, args.concurrency))
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(f"  one backend:   {single:8.1f} req/s")
+    print(f"  all backends:  {multi:8.1f} req/s  ({multi / single:.1f}x)")
+    print(f"\n{'backend':8} {'state':8} {'requests':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8}  models")
+    for backend in snapshot:
+        print(f"{names[backend['url']]:8} {backend['state']:8} {backend['requests']:8d} {backend['errors']:7d} "
+              f"{backend['latency_ms']['p50']:8.1f} {backend['latency_ms']['p95']:8.1f}  {','.join(backend['loaded_models'])}")
+    if args.json:
+        print(json.dumps(snapshot, indent=2))
+
+    for server, _ in servers.values():
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Ollama CORS proxy: original Flask mode vs the async streaming mode.
+
+Starts a fake Ollama (benchmarks/fake_ollama.py) and both proxy modes as
+separate processes, then drives them with concurrent clients:
+
+  tags       small GET /api/tags calls (per-request overhead, connection reuse)
+  generate   non-streamed /api/generate (end-to-end latency under concurrency)
+  first      time to first token; the Flask proxy cannot stream, so its
+             figure is the full buffered response
+
+Usage:
+    cd backend
+    python benchmarks/bench_ollama_proxy.py --requests 100 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(BENCH_DIR))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def launch(args, ready_url: str) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable] + args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(ready_url, timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    sys.exit(f"{' '.join(args)} did not start")
+
+
+async def drive(base_url: str, requests: int, concurrency: int, request_fn) -> dict:
+    latencies, first_bytes, errors = [], [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                first = await request_fn(client)
+                if first is None:
+                    errors += 1
+                    return
+                latencies.append(time.perf_counter() - started)
+                first_bytes.append(first - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    def pct(values, q):
+        return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else float("nan")
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": pct(latencies, 50),
+        "p95": pct(latencies, 95),
+        "first_p50": pct(first_bytes, 50),
+        "errors": errors,
+    }
+
+
+async def get_tags(client):
+    response = await client.get("/api/tags")
+    return time.perf_counter() if response.status_code == 200 else None
+
+
+async def generate_buffered(client):
+    response = await client.post("/api/generate", json={"model": "llama2", "prompt": "hi", "stream": False})
+    return time.perf_counter() if response.status_code == 200 else None
+
+
+async def generate_streamed(client):
+    first = None
+    async with client.stream("POST", "/api/generate", json={"model": "llama2", "prompt": "hi"}) as response:
+        if response.status_code != 200:
+            return None
+        async for _ in response.aiter_raw():
+            first = first or time.perf_counter()
+    return first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--first-token-ms", type=float, default=50)
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--token-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    ollama_port = free_port()
+    ollama_url = f"http://127.0.0.1:{ollama_port}"
+    processes = [launch([
+        os.path.join(BENCH_DIR, "fake_ollama.py"), "--port", str(ollama_port),
+        "--first-token-ms", str(args.first_token_ms), "--tokens", str(args.tokens), "--token-ms", str(args.token_ms),
+    ], f"{ollama_url}/api/tags")]
+
+    proxies = {}
+    try:
+        for mode in ("flask", "async"):
+            port = free_port()
+            proxies[mode] = f"http://127.0.0.1:{port}"
+            processes.append(launch([
+                os.path.join(REPO_DIR, "ollama_proxy.py"), "--mode", mode, "--host", "127.0.0.1",
+                "--port", str(port), "--upstream", ollama_url, "--max-concurrency", str(args.concurrency),
+            ], f"{proxies[mode]}/health"))
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, "
+              f"fake Ollama {args.first_token_ms:.0f}ms + {args.tokens}x{args.token_ms:.0f}ms tokens")
+        print(f"{'scenario':10} {'mode':6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'1st byte':>9} {'errors':>7}")
+        scenarios = [
+            ("tags", {"flask": get_tags, "async": get_tags}),
+            ("generate", {"flask": generate_buffered, "async": generate_buffered}),
+            ("first", {"flask": generate_buffered, "async": generate_streamed}),
+        ]
+        for name, fns in scenarios:
+            for mode, base_url in proxies.items():
+                result = asyncio.run(drive(base_url, args.requests, args.concurrency, fns[mode]))
+                print(f"{name:10} {mode:6} {result['rps']:8.1f} {result['p50']:8.1f} {result['p95']:8.1f} "
+                      f"{result['first_p50']:9.1f} {result['errors']:7d}")
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start cost of the API: `import main` and time until lifespan startup completes.
+
+Each run is a fresh interpreter started with `python -X importtime`, so the
+numbers include everything a worker pays on boot. Self time is grouped by
+top-level package to show what the import graph actually pulls in; heavy
+optional dependencies (numpy, feedparser, ...) should not appear until the
+feature that needs them is used.
+
+Usage:
+    cd backend
+    python benchmarks/bench_startup.py --runs 7
+    python benchmarks/bench_startup.py --write-baseline startup.json
+    python benchmarks/bench_startup.py --baseline startup.json --budget-ms 1500   # exits 1 on regression
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay out of the startup import graph; they are loaded on first use
+DEFERRED_MODULES = ["numpy", "feedparser", "psutil", "uvicorn", "alembic"]
+
+READY_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app):
+    ready = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000, "ready_ms": (ready - started) * 1000}))
+"""
+
+
+def parse_importtime(stderr: str):
+    """Return (cumulative ms of `main`, self ms per top-level package) from -X importtime output"""
+    main_ms = 0.0
+    packages = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        module = name.strip()
+        packages[module.split(".")[0]] += int(self_us) / 1000
+        # Nested imports are indented; the top-level `main` line carries the whole application's cost
+        if name == " main":
+            main_ms = int(cumulative_us) / 1000
+    return main_ms, packages
+
+
+def run(env, code: str, importtime: bool):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    result = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"Startup failed:\n{result.stderr[-4000:]}")
+    return result
+
+
+def measure(runs: int, env) -> dict:
+    import_ms, ready_ms = [], []
+    packages = defaultdict(list)
+    for _ in range(runs):
+        main_ms, per_package = parse_importtime(run(env, "import main", importtime=True).stderr)
+        import_ms.append(main_ms)
+        for name, ms in per_package.items():
+            packages[name].append(ms)
+        ready = json.loads(run(env, READY_SCRIPT, importtime=False).stdout.strip().splitlines()[-1])
+        ready_ms.append(ready["ready_ms"])
+
+    # Packages missing from some runs count as zero there so medians stay comparable
+    package_ms = {name: statistics.median(values + [0.0] * (runs - len(values))) for name, values in packages.items()}
+    return {
+        "runs": runs,
+        "import_main_ms": round(statistics.median(import_ms), 1),
+        "lifespan_ready_ms": round(statistics.median(ready_ms), 1),
+        "packages_ms": {name: round(ms, 1) for name, ms in sorted(package_ms.items(), key=lambda kv: -kv[1])},
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    for key in ("import_main_ms", "lifespan_ready_ms"):
+        limit = baseline[key] * (1 + tolerance)
+        if result[key] > limit:
+            problems.append(f"{key} {result[key]:.0f}ms exceeds baseline {baseline[key]:.0f}ms (+{tolerance:.0%})")
+    new_packages = {
+        name: ms for name, ms in result["packages_ms"].items()
+        if name not in baseline["packages_ms"] and ms >= 5.0
+    }
+    for name, ms in new_packages.items():
+        problems.append(f"new import at startup: {name} ({ms:.1f}ms)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="packages to list by self time")
+    parser.add_argument("--budget-ms", type=float, help="fail if median `import main` exceeds this")
+    parser.add_argument("--baseline", help="JSON from --write-baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline")
+    parser.add_argument("--write-baseline", help="save this run's results as a baseline")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    env.setdefault("EVENT_LOG_DIR", f"{workdir}/events")
+    # Measure boot against an up-to-date schema, as a deployed worker would see it
+    run(env, "from app.core.migrations import upgrade; upgrade()", importtime=False)
+
+    result = measure(args.runs, env)
+    result["deferred_loaded"] = [name for name in DEFERRED_MODULES if name in result["packages_ms"]]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{args.runs} runs (median)")
+        print(f"  import main:      {result['import_main_ms']:8.1f} ms")
+        print(f"  lifespan ready:   {result['lifespan_ready_ms']:8.1f} ms")
+        print(f"\n{'package':30} {'self ms':>8}")
+        for name, ms in list(result["packages_ms"].items())[:args.top]:
+            print(f"{name:30} {ms:8.1f}")
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as f:
+            json.dump(result, f, indent=2)
+
+    problems = [f"deferred module imported at startup: {name}" for name in result["deferred_loaded"]]
+    if args.budget_ms is not None and result["import_main_ms"] > args.budget_ms:
+        problems.append(f"import main {result['import_main_ms']:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems += compare(result, json.load(f), args.tolerance)
+
+    for problem in problems:
+        print(f"❌ {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark topic/tag filter queries: LIKE over JSON text vs native JSON containment.
+
+"before" is the only filter possible while tags/topics were JSON strings in
+Text columns (a LIKE '%"topic"%' scan); "after" is json_array_contains, i.e.
+JSONB @> backed by the jsonb_path_ops GIN index on PostgreSQL, json_each on
+SQLite. Seeds its own rows, so point --database-url at a scratch database.
+
+Usage:
+    cd backend
+    python benchmarks/bench_tag_filter.py --articles 100000
+    python benchmarks/bench_tag_filter.py --database-url postgresql://localhost/dscvr_bench
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TOPICS = [f"topic-{i}" for i in range(500)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='bench_tags_')}/bench.db"
+
+    from sqlalchemy import String, cast, insert, text
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import Article
+    from app.models.types import json_array_contains
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        if db.query(Article.id).filter(Article.url.like("bench://%")).first() is None:
+            print(f"Seeding {args.articles} articles on {engine.dialect.name}...")
+            for start in range(0, args.articles, 5000):
+                db.execute(insert(Article), [
+                    {
+                        "title": f"Bench {i}",
+                        "url": f"bench://{i}",
+                        "tags": rng.sample(TOPICS, 3),
+                        "ai_topics": rng.sample(TOPICS, 5),
+                    }
+                    for i in range(start, min(start + 5000, args.articles))
+                ])
+            db.commit()
+            if engine.dialect.name == "postgresql":
+                db.execute(text("ANALYZE articles"))
+                db.commit()
+
+        topics = [rng.choice(TOPICS) for _ in range(args.queries)]
+
+        def before(topic):
+            return db.query(Article.id).filter(
+                cast(Article.ai_topics, String).like(f'%"{topic}"%')
+            ).order_by(Article.id.desc()).limit(50).all()
+
+        def after(topic):
+            return db.query(Article.id).filter(
+                json_array_contains(Article.ai_topics, [topic])
+            ).order_by(Article.id.desc()).limit(50).all()
+
+        results = {}
+        for name, fn in (("before (LIKE on JSON text)", before), ("after (JSON containment)", after)):
+            fn(topics[0])  # warm up
+            started = time.perf_counter()
+            rows = [len(fn(topic)) for topic in topics]
+            elapsed = (time.perf_counter() - started) / len(topics)
+            results[name] = elapsed
+            print(f"{name:30} {elapsed * 1000:8.2f} ms/query  ({sum(rows) / len(rows):.0f} rows avg)")
+
+        first, second = results.values()
+        print(f"speedup: {first / second:.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in for an Ollama server, for benchmarks.
+
+Implements enough of the API for the proxy and AI services: /api/tags, /api/ps,
+/api/show, /api/generate and /api/chat (streamed as NDJSON unless
+"stream": false, like Ollama), and /api/embed. Each generation waits
+`--first-token-ms` (prompt processing) and then emits `--tokens` tokens
+`--token-ms` apart, so time-to-first-token and total latency are both visible.
+
+Usage:
+    python benchmarks/fake_ollama.py --port 11500 --first-token-ms 50 --tokens 20 --token-ms 5
+
+Or in-process:
+    server, url = start(first_token_ms=50)
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODEL = "llama2:latest"
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, payload: dict):
+        line = json.dumps(payload).encode() + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": MODEL, "model": MODEL, "size": 3_826_793_677}]})
+        elif self.path == "/api/ps":
+            loaded = self.server.config["loaded_models"]
+            self._send_json({"models": [{"name": name, "model": name, "size_vram": 3_826_793_677} for name in loaded]})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        self.server.record(self.path, body)
+
+        if self.path == "/api/show":
+            self._send_json({"modelfile": "", "details": {"family": "llama"}})
+        elif self.path == "/api/embed":
+            texts = body.get("input") or []
+            texts = [texts] if isinstance(texts, str) else texts
+            self._send_json({"model": body.get("model"), "embeddings": [_embedding(t, config["embedding_dim"]) for t in texts]})
+        elif self.path in ("/api/generate", "/api/chat"):
+            self._generate(body, chat=self.path == "/api/chat")
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _generate(self, body: dict, chat: bool):
+        config = self.server.config
+        tokens = [f"token{i} " for i in range(config["tokens"])]
+        prompt = body.get("prompt") or " ".join(m.get("content", "") for m in body.get("messages", []))
+        if config["responder"] is not None:
+            tokens = [config["responder"](prompt)]
+
+        def message(text: str, done: bool) -> dict:
+            payload = {"model": body.get("model", MODEL), "created_at": "2024-01-01T00:00:00Z", "done": done}
+            if chat:
+                payload["message"] = {"role": "assistant", "content": text}
+            else:
+                payload["response"] = text
+            if done:
+                payload.update(prompt_eval_count=len(prompt.split()), eval_count=len(tokens))
+                if not chat:
+                    payload["context"] = [1, 2, 3]
+            return payload
+
+        time.sleep(config["first_token_ms"] / 1000)
+        if body.get("stream", True) is False:
+            time.sleep(config["token_ms"] * max(0, len(tokens) - 1) / 1000)
+            self._send_json(message("".join(tokens), done=True))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, token in enumerate(tokens):
+            if index:
+                time.sleep(config["token_ms"] / 1000)
+            self._send_chunk(message(token, done=False))
+        self._send_chunk(message("", done=True))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def _embedding(text: str, dim: int) -> list:
+    digest = hashlib.sha256(text.encode()).digest()
+    return [((digest[i % len(digest)] / 255.0) - 0.5) for i in range(dim)]
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops bursts of new connections (1s SYN retry), unlike a real Ollama
+    request_queue_size = 256
+
+    def __init__(self, address, config: dict):
+        super().__init__(address, FakeOllamaHandler)
+        self.config = config
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def record(self, path: str, body: dict):
+        with self._lock:
+            self.requests.append((path, body))
+
+
+def start(port: int = 0, first_token_ms: float = 50, tokens: int = 20, token_ms: float = 5,
+          embedding_dim: int = 384, responder=None, loaded_models=(MODEL,)):
+    """Run a fake Ollama in a background thread; returns (server, base_url)"""
+    server = FakeOllamaServer(("127.0.0.1", port), {
+        "first_token_ms": first_token_ms,
+        "tokens": tokens,
+        "token_ms": token_ms,
+        "embedding_dim": embedding_dim,
+        # What /api/ps reports as resident, for model-affinity routing
+        "loaded_models": list(loaded_models),
+        # Optional callable(prompt) -> full response text, for services that parse the output
+        "responder": responder,
+    })
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--first-token-ms", type=float, default=50)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--token-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    server, url = start(args.port, args.first_token_ms, args.tokens, args.token_ms)
+    print(f"Fake Ollama listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build or update the article embedding index used by /articles/{id}/related
+
+Embeds articles newer than the index high-water mark in batches, then
+(re)trains the IVF lists so nearest-neighbour lookups stay fast.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.core.database import SessionLocal
+from app.core.query_stats import query_stats
+from app.core.tracing import configure_logging, tracer
+from app.services.embedding_service import embedding_service
+
+# Configure logging (LOG_LEVEL / LOG_FORMAT, shared with the API)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+async def main(limit: int = None, train: bool = True):
+    """Embed new articles and retrain the index"""
+    db = SessionLocal()
+    try:
+        logger.info(f"Embedding articles with {embedding_service.backend}:{embedding_service.model}")
+        indexed = await embedding_service.index_articles(db, limit=limit)
+        logger.info(f"Embedded {indexed} new articles")
+
+        index = embedding_service.get_index()
+        if index is None:
+            logger.info("No articles to index")
+            return
+        if train:
+            index.train()
+        logger.info(f"Embedding index contains {len(index)} articles")
+    except Exception as e:
+        logger.error(f"Embedding build failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the article embedding index")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of articles to embed")
+    parser.add_argument("--no-train", action="store_true", help="Skip retraining the IVF lists")
+    args = parser.parse_args()
+
+    with tracer.trace("build_embeddings", kind="internal", sampled=True), query_stats.scope("build_embeddings"):
+        asyncio.run(main(limit=args.limit, train=not args.no_train))
@@ -2,27 +2,26 @@
 """
 Database initialization script for Dscvr AI News Discovery Platform
 
-This script creates all database tables and sets up initial data.
+This script applies all schema migrations and sets up initial data.
 Run this after setting up your PostgreSQL database.
 """
 
 import os
 import sys
 from sqlalchemy import create_engine, text
-from app.core.database import Base, engine
-from app.models import *  # Import all models to register them with Base
+from app.core.database import engine
+from app.core.migrations import upgrade
 
 # Determine database type
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dscvr_news.db")
 is_postgresql = "postgresql" in DATABASE_URL
 
 def create_database_tables():
-    """Create all database tables"""
-    print("Creating database tables...")
+    """Create all database tables by applying migrations"""
+    print("Applying database migrations...")
     
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        upgrade()
         print("✅ Database tables created successfully!")
         
         # Verify tables were created
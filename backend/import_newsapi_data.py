@@ -16,14 +16,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.core.database import engine, SessionLocal
+from app.core.query_stats import query_stats
+from app.core.tracing import configure_logging, tracer
 from app.models.article import Article, ArticleCreate
 from app.services.news_api_service import news_api_service
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (LOG_LEVEL / LOG_FORMAT, shared with the API)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 class NewsAPIImporter:
@@ -102,7 +101,7 @@ class NewsAPIImporter:
                         image_url=article_data.image_url,
                         word_count=word_count,
                         reading_time=reading_time,
-                        tags="[]",  # Empty tags for now
+                        tags=[],  # Empty tags for now
                         created_at=datetime.utcnow()
                     )
                     
@@ -181,7 +180,7 @@ Import completed:
                             image_url=article_data.image_url,
                             word_count=word_count,
                             reading_time=reading_time,
-                            tags="[]",
+                            tags=[],
                             is_trending=True,
                             created_at=datetime.utcnow()
                         )
@@ -232,7 +231,8 @@ if __name__ == "__main__":
     print("-" * 50)
     
     # Run the import
-    asyncio.run(main())
+    with tracer.trace("import_newsapi_data", kind="internal", sampled=True), query_stats.scope("import_newsapi_data"):
+        asyncio.run(main())
     
     print("-" * 50)
     print("Import completed! Check the logs above for details.")
\ No newline at end of file
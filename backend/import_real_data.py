@@ -20,13 +20,15 @@ import logging
 
 # Import your models
 from app.core.database import SessionLocal, engine
+from app.core.query_stats import query_stats
+from app.core.tracing import configure_logging, tracer
 from app.models.article import Article
 from app.models.rss_feed import RSSFeed, FeedCategory
 from app.models.user import User
 from app.services.news_api_service import news_api_service
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (LOG_LEVEL / LOG_FORMAT, shared with the API)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 class RealDataImporter:
@@ -91,7 +93,7 @@ class RealDataImporter:
                         word_count=word_count,
                         reading_time=reading_time,
                         rss_feed_id=rss_feed.id,
-                        tags="[]"
+                        tags=[]
                     )
                     
                     self.db.add(article)
@@ -320,4 +322,5 @@ def main():
     logger.info("Real data import completed successfully!")
 
 if __name__ == "__main__":
-    main()
+    with tracer.trace("import_real_data", kind="internal", sampled=True), query_stats.scope("import_real_data"):
+        main()
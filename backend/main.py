@@ -1,34 +1,69 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-import uvicorn
-from typing import List, Optional
-import os
-from dotenv import load_dotenv
+import asyncio
+import logging
+from typing import Literal
 
-# Load environment variables from .env file in parent directory
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
-
-from app.core.config import settings
-from app.core.database import engine, Base
+# Importing the database module loads .env and builds the (lazy, not yet connected) engine
+from app.core.database import engine
+from app.core.migrations import ensure_schema
+from app.core.compression import CompressionMiddleware, compression_stats, variant_cache
+from app.core.tracing import TracingMiddleware, configure_logging, tracer
+from app.core.query_stats import QueryStatsMiddleware, query_stats
 from app.api.v1.api import api_router
-from app.core.security import get_current_user
-from app.models.article import Article as ArticleModel
-from app.models.user import User
 
-from app.services.ai_service import AIService
+from app.services.trending_service import trending_service
+from app.services.category_feed_service import category_feed_cache
+from app.services.facet_service import facet_service
+from app.services.event_buffer import event_buffer
+from app.services.reading_history_service import reading_history_service
+from app.services.feed_aggregator import feed_aggregator
+from app.services.job_queue import job_queue
+from app.services.ingestion_service import ingestion_service
+from app.services.news_api_service import news_api_service
+from app.services.ai_service import ai_service
+from app.services.local_nlp import local_nlp
+from app.services.ai_batch import ai_batch
+from app.services.ai_chat import ai_chat
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+configure_logging()
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀 Starting Dscvr AI News Discovery Platform...")
+    logger.info("🚀 Starting Dscvr AI News Discovery Platform...")
+    await asyncio.to_thread(ensure_schema)
+    trending_task = asyncio.create_task(trending_service.run_periodically())
+    category_feed_task = asyncio.create_task(category_feed_cache.run_periodically())
+    facet_task = asyncio.create_task(facet_service.run_periodically())
+    event_buffer.recover()
+    event_flush_task = asyncio.create_task(event_buffer.run_periodically())
+    rollup_task = asyncio.create_task(reading_history_service.run_periodically())
+    corpus_task = asyncio.create_task(local_nlp.run_periodically())
+    chat_flush_task = asyncio.create_task(ai_chat.history.run_periodically())
+    trace_export_task = asyncio.create_task(tracer.run_periodically())
+    await job_queue.start()
     yield
     # Shutdown
-    print("👋 Shutting down Dscvr AI News Discovery Platform...")
+    trending_task.cancel()
+    category_feed_task.cancel()
+    facet_task.cancel()
+    event_flush_task.cancel()
+    rollup_task.cancel()
+    corpus_task.cancel()
+    chat_flush_task.cancel()
+    trace_export_task.cancel()
+    await feed_aggregator.close()
+    await job_queue.stop()
+    await ingestion_service.close()
+    await news_api_service.close()
+    await ai_service.close()
+    event_buffer.close()
+    ai_chat.history.close()
+    await tracer.close()
+    logger.info("👋 Shutting down Dscvr AI News Discovery Platform...")
 
 app = FastAPI(
     title="Dscvr AI News Discovery Platform",
@@ -53,6 +88,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON/XML responses (added after CORS so it wraps the CORS headers too)
+app.add_middleware(CompressionMiddleware)
+
+# Per-request SQL statement tally (inside tracing, so the counts land on the request's root span)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request ids and tracing (added last so the root span covers every other middleware)
+app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -85,6 +129,13 @@ async def performance_check():
             "memory_total": memory.total
         },
         "cache": cache_stats,
+        "compression": compression_stats.snapshot(variant_cache),
+        "ai_scheduler": ai_service.scheduler.snapshot(),
+        "ai_backends": ai_service.backends.snapshot(),
+        "local_nlp": local_nlp.snapshot(),
+        "ai_batch": ai_batch.snapshot(),
+        "ai_chat": ai_chat.snapshot(),
+        "tracing": tracer.snapshot(),
         "database": {
             "pool_size": engine.pool.size(),
             "checked_in": engine.pool.checkedin(),
@@ -93,6 +144,11 @@ async def performance_check():
         }
     }
 
+@app.get("/performance/queries")
+async def performance_queries(limit: int = 20, order_by: Literal["total_ms", "count", "max_ms"] = "total_ms"):
+    """Top SQL statements since startup (normalized), slow-query count and suspected N+1 patterns per route"""
+    return query_stats.top(min(limit, 200), order_by)
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -104,6 +160,8 @@ async def root():
 
 if __name__ == "__main__":
     import os
+    import uvicorn
+
     port = int(os.environ.get("PORT", 8000))
     uvicorn.run(
         "main:app",
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Schema migration CLI for Dscvr AI News Discovery Platform
+
+Wraps Alembic with the project's configuration. Index changes in the
+migrations use CREATE INDEX CONCURRENTLY on PostgreSQL, so `upgrade` can be
+run against a live database.
+
+Usage:
+    python migrate.py upgrade [revision]      # apply migrations (default: head)
+    python migrate.py downgrade <revision>    # roll back to a revision
+    python migrate.py current                 # show the database's revision
+    python migrate.py history                 # list migrations
+    python migrate.py stamp <revision>        # record a revision without running it
+    python migrate.py check                   # verify SCHEMA_HEAD and the database are at head
+    python migrate.py revision -m "message" [--autogenerate]
+"""
+
+import argparse
+import logging
+import sys
+
+from alembic import command
+from alembic.script import ScriptDirectory
+
+from app.core.migrations import SCHEMA_HEAD, alembic_config, current_revision, upgrade
+
+
+def check(config) -> int:
+    head = ScriptDirectory.from_config(config).get_current_head()
+    revision = current_revision()
+    print(f"Migration head: {head}")
+    print(f"SCHEMA_HEAD:    {SCHEMA_HEAD}")
+    print(f"Database:       {revision or 'no version'}")
+    if head != SCHEMA_HEAD:
+        print("❌ Update SCHEMA_HEAD in app/core/migrations.py to the newest revision")
+        return 1
+    if revision != head:
+        print("❌ Database is not at head; run `python migrate.py upgrade`")
+        return 1
+    print("✅ Schema is up to date")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply and manage database schema migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade_parser = subparsers.add_parser("upgrade")
+    upgrade_parser.add_argument("revision", nargs="?", default="head")
+
+    downgrade_parser = subparsers.add_parser("downgrade")
+    downgrade_parser.add_argument("revision")
+
+    subparsers.add_parser("current")
+    subparsers.add_parser("history")
+
+    stamp_parser = subparsers.add_parser("stamp")
+    stamp_parser.add_argument("revision")
+
+    subparsers.add_parser("check")
+
+    revision_parser = subparsers.add_parser("revision")
+    revision_parser.add_argument("-m", "--message", required=True)
+    revision_parser.add_argument("--autogenerate", action="store_true")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    config = alembic_config()
+
+    if args.command == "upgrade":
+        upgrade(args.revision)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config, verbose=True)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "check":
+        sys.exit(check(config))
+    elif args.command == "revision":
+        head = ScriptDirectory.from_config(config).get_current_head()
+        rev_id = f"{int(head) + 1:04d}"
+        command.revision(config, message=args.message, autogenerate=args.autogenerate, rev_id=rev_id)
+        print(f"Set SCHEMA_HEAD = \"{rev_id}\" in app/core/migrations.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from alembic import context
+from sqlalchemy import JSON, Text, text
+
+from app.core.database import Base, engine
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+# Arbitrary constant shared by every process applying migrations
+MIGRATION_LOCK_ID = 4_172_903
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # GIN indexes are PostgreSQL-only (see ddl_if on the models); autogenerate should not expect them elsewhere
+    if type_ == "index" and not reflected and context.get_bind().dialect.name != "postgresql":
+        return obj.dialect_options["postgresql"].get("using") != "gin"
+    return True
+
+
+def compare_type(migration_context, inspected_column, metadata_column, inspected_type, metadata_type):
+    # SQLite keeps JSON columns as TEXT; that is the intended storage, not drift
+    if migration_context.dialect.name == "sqlite" and isinstance(metadata_type, JSON) and isinstance(inspected_type, Text):
+        return False
+    return None
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        is_postgresql = connection.dialect.name == "postgresql"
+        if is_postgresql:
+            # Several workers may start at once with auto-migrate enabled; only one applies migrations
+            connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.commit()
+        try:
+            context.configure(
+                connection=connection,
+                target_metadata=Base.metadata,
+                include_object=include_object,
+                compare_type=compare_type,
+                # One transaction per revision so autocommit_block() (CONCURRENTLY) works inside a revision
+                transaction_per_migration=True,
+                render_as_batch=connection.dialect.name == "sqlite",
+            )
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if is_postgresql:
+                connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                connection.commit()
+
+
+# Migrations inspect the live schema to stay idempotent, so offline (--sql) mode is not supported
+run_migrations_online()
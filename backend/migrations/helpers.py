@@ -0,0 +1,69 @@
+"""Idempotent, online-safe building blocks for migration scripts.
+
+Databases that predate migrations were built by ``create_all`` from whatever
+models were current at the time, so tables and indexes added since the
+baseline may already exist. These helpers skip work that is already done,
+and build indexes with ``CREATE INDEX CONCURRENTLY`` on PostgreSQL so
+applying a migration never blocks writes to a live table.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+def is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_index(table: str, name: str) -> bool:
+    return any(index["name"] == name for index in sa.inspect(op.get_bind()).get_indexes(table))
+
+
+def column_type(table: str, column: str) -> str:
+    for info in sa.inspect(op.get_bind()).get_columns(table):
+        if info["name"] == column:
+            return str(info["type"]).lower()
+    return ""
+
+
+def add_column_if_missing(table: str, column: sa.Column):
+    if not column_type(table, column.name):
+        op.add_column(table, column)
+
+
+def create_table_if_missing(table: str, *columns, **kw):
+    if not has_table(table):
+        op.create_table(table, *columns, **kw)
+
+
+def _invalid_postgresql_index(name: str) -> bool:
+    """A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind"""
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+    ), {"name": name}).scalar())
+
+
+def create_index_online(name: str, table: str, columns, **kw):
+    """Create an index unless it exists; CONCURRENTLY (outside the transaction) on PostgreSQL"""
+    if not is_postgresql():
+        if not has_index(table, name):
+            op.create_index(name, table, columns, **kw)
+        return
+
+    with op.get_context().autocommit_block():
+        if _invalid_postgresql_index(name):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def drop_index_online(name: str, table: str):
+    if not is_postgresql():
+        if has_index(table, name):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
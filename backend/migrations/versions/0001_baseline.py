@@ -0,0 +1,193 @@
+"""Baseline schema (tables as created by create_all before migrations existed)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('feed_categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('slug', sa.String(length=100), nullable=False),
+    sa.Column('color', sa.String(length=7), nullable=True),
+    sa.Column('icon', sa.String(length=50), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_feed_categories_id'), 'feed_categories', ['id'], unique=False)
+    op.create_index(op.f('ix_feed_categories_slug'), 'feed_categories', ['slug'], unique=True)
+    op.create_table('rss_feeds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=2000), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('website_url', sa.String(length=2000), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('language', sa.String(length=10), nullable=True),
+    sa.Column('last_fetched', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_modified', sa.String(length=255), nullable=True),
+    sa.Column('etag', sa.String(length=255), nullable=True),
+    sa.Column('fetch_frequency', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_approved', sa.Boolean(), nullable=True),
+    sa.Column('fetch_errors', sa.Integer(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('last_successful_fetch', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('total_articles', sa.Integer(), nullable=True),
+    sa.Column('articles_this_month', sa.Integer(), nullable=True),
+    sa.Column('avg_articles_per_day', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('url')
+    )
+    op.create_index('idx_rss_feed_active_category', 'rss_feeds', ['is_active', 'category'], unique=False)
+    op.create_index('idx_rss_feed_fetch_frequency', 'rss_feeds', ['fetch_frequency'], unique=False)
+    op.create_index('idx_rss_feed_last_fetched', 'rss_feeds', ['last_fetched'], unique=False)
+    op.create_index(op.f('ix_rss_feeds_category'), 'rss_feeds', ['category'], unique=False)
+    op.create_index(op.f('ix_rss_feeds_id'), 'rss_feeds', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('interests', sa.Text(), nullable=True),
+    sa.Column('reading_preferences', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('articles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('url', sa.String(length=2000), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('author', sa.String(length=255), nullable=True),
+    sa.Column('published_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('source', sa.String(length=255), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('tags', sa.Text(), nullable=True),
+    sa.Column('image_url', sa.String(length=2000), nullable=True),
+    sa.Column('word_count', sa.Integer(), nullable=True),
+    sa.Column('reading_time', sa.Integer(), nullable=True),
+    sa.Column('ai_summary', sa.Text(), nullable=True),
+    sa.Column('ai_sentiment', sa.String(length=50), nullable=True),
+    sa.Column('ai_topics', sa.Text(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('is_trending', sa.Boolean(), nullable=True),
+    sa.Column('view_count', sa.Integer(), nullable=True),
+    sa.Column('share_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rss_feed_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['rss_feed_id'], ['rss_feeds.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('url')
+    )
+    op.create_index('idx_article_published_date', 'articles', ['published_date'], unique=False)
+    op.create_index('idx_article_source_category', 'articles', ['source', 'category'], unique=False)
+    op.create_index('idx_article_trending_featured', 'articles', ['is_trending', 'is_featured'], unique=False)
+    op.create_index(op.f('ix_articles_category'), 'articles', ['category'], unique=False)
+    op.create_index(op.f('ix_articles_id'), 'articles', ['id'], unique=False)
+    op.create_index(op.f('ix_articles_source'), 'articles', ['source'], unique=False)
+    op.create_index(op.f('ix_articles_title'), 'articles', ['title'], unique=False)
+    op.create_table('user_feed_subscriptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('rss_feed_id', sa.Integer(), nullable=False),
+    sa.Column('subscribed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('notification_enabled', sa.Boolean(), nullable=True),
+    sa.Column('custom_name', sa.String(length=255), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('categories_filter', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['rss_feed_id'], ['rss_feeds.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_user_feed_subscription', 'user_feed_subscriptions', ['user_id', 'rss_feed_id'], unique=True)
+    op.create_index('idx_user_subscriptions_active', 'user_feed_subscriptions', ['user_id', 'is_active'], unique=False)
+    op.create_index(op.f('ix_user_feed_subscriptions_id'), 'user_feed_subscriptions', ['id'], unique=False)
+    op.create_table('ai_chats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=True),
+    sa.Column('question', sa.Text(), nullable=False),
+    sa.Column('answer', sa.Text(), nullable=False),
+    sa.Column('context_type', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_ai_chat_user_created', 'ai_chats', ['user_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_ai_chats_id'), 'ai_chats', ['id'], unique=False)
+    op.create_table('reading_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('read_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('reading_progress', sa.Integer(), nullable=True),
+    sa.Column('time_spent', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_reading_history_read_at', 'reading_history', ['read_at'], unique=False)
+    op.create_index('idx_reading_history_user_article', 'reading_history', ['user_id', 'article_id'], unique=False)
+    op.create_index(op.f('ix_reading_history_id'), 'reading_history', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_reading_history_id'), table_name='reading_history')
+    op.drop_index('idx_reading_history_user_article', table_name='reading_history')
+    op.drop_index('idx_reading_history_read_at', table_name='reading_history')
+    op.drop_table('reading_history')
+    op.drop_index(op.f('ix_ai_chats_id'), table_name='ai_chats')
+    op.drop_index('idx_ai_chat_user_created', table_name='ai_chats')
+    op.drop_table('ai_chats')
+    op.drop_index(op.f('ix_user_feed_subscriptions_id'), table_name='user_feed_subscriptions')
+    op.drop_index('idx_user_subscriptions_active', table_name='user_feed_subscriptions')
+    op.drop_index('idx_user_feed_subscription', table_name='user_feed_subscriptions')
+    op.drop_table('user_feed_subscriptions')
+    op.drop_index(op.f('ix_articles_title'), table_name='articles')
+    op.drop_index(op.f('ix_articles_source'), table_name='articles')
+    op.drop_index(op.f('ix_articles_id'), table_name='articles')
+    op.drop_index(op.f('ix_articles_category'), table_name='articles')
+    op.drop_index('idx_article_trending_featured', table_name='articles')
+    op.drop_index('idx_article_source_category', table_name='articles')
+    op.drop_index('idx_article_published_date', table_name='articles')
+    op.drop_table('articles')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_rss_feeds_id'), table_name='rss_feeds')
+    op.drop_index(op.f('ix_rss_feeds_category'), table_name='rss_feeds')
+    op.drop_index('idx_rss_feed_last_fetched', table_name='rss_feeds')
+    op.drop_index('idx_rss_feed_fetch_frequency', table_name='rss_feeds')
+    op.drop_index('idx_rss_feed_active_category', table_name='rss_feeds')
+    op.drop_table('rss_feeds')
+    op.drop_index(op.f('ix_feed_categories_slug'), table_name='feed_categories')
+    op.drop_index(op.f('ix_feed_categories_id'), table_name='feed_categories')
+    op.drop_table('feed_categories')
@@ -0,0 +1,75 @@
+"""Reading-history rollups, AI job queue, ingestion state and performance indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_online, create_table_if_missing, drop_index_online
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table_if_missing('reading_history_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('articles_read', sa.Integer(), nullable=True),
+    sa.Column('completed_count', sa.Integer(), nullable=True),
+    sa.Column('total_time_spent', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index_online('idx_reading_history_daily_user_day', 'reading_history_daily', ['user_id', 'day'], unique=True)
+    create_index_online(op.f('ix_reading_history_daily_id'), 'reading_history_daily', ['id'])
+
+    create_table_if_missing('ai_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index_online('idx_ai_job_article_status', 'ai_jobs', ['article_id', 'status'])
+    create_index_online('idx_ai_job_status_priority', 'ai_jobs', ['status', 'priority', 'id'])
+    create_index_online(op.f('ix_ai_jobs_id'), 'ai_jobs', ['id'])
+
+    create_table_if_missing('ingestion_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_key', sa.String(length=255), nullable=False),
+    sa.Column('high_water_mark', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_fetched', sa.Integer(), nullable=True),
+    sa.Column('last_saved', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_key')
+    )
+    create_index_online(op.f('ix_ingestion_state_id'), 'ingestion_state', ['id'])
+
+    # Reading history by user, newest first (cursor pagination and trending windows)
+    create_index_online('idx_reading_history_user_read_at', 'reading_history', ['user_id', 'read_at'])
+    # Latest N articles per feed (category feed cache)
+    create_index_online('idx_article_feed_published', 'articles', ['rss_feed_id', 'published_date'])
+
+
+def downgrade():
+    drop_index_online('idx_article_feed_published', 'articles')
+    drop_index_online('idx_reading_history_user_read_at', 'reading_history')
+    op.drop_table('ingestion_state')
+    op.drop_table('ai_jobs')
+    op.drop_table('reading_history_daily')
@@ -0,0 +1,72 @@
+"""Native JSON columns for tags, topics, interests and preferences, with GIN indexes
+
+On PostgreSQL the JSON-in-Text columns become JSONB (values that are not
+valid JSON become NULL) and get jsonb_path_ops GIN indexes for containment
+filters. SQLite stores JSON as text, so existing values need no conversion.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import column_type, create_index_online, drop_index_online, is_postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = [
+    ("articles", "tags"),
+    ("articles", "ai_topics"),
+    ("users", "interests"),
+    ("users", "reading_preferences"),
+    ("user_feed_subscriptions", "categories_filter"),
+]
+
+GIN_INDEXES = [
+    ("idx_article_tags_gin", "articles", "tags"),
+    ("idx_article_ai_topics_gin", "articles", "ai_topics"),
+    ("idx_user_interests_gin", "users", "interests"),
+]
+
+TRY_JSONB = """
+CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb AS $$
+BEGIN
+    IF value IS NULL OR btrim(value) = '' THEN
+        RETURN NULL;
+    END IF;
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE
+"""
+
+
+def upgrade():
+    if not is_postgresql():
+        return
+
+    op.execute(TRY_JSONB)
+    for table, column in JSON_COLUMNS:
+        if column_type(table, column) != "jsonb":
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING pg_temp.try_jsonb({column}::text)")
+
+    for name, table, column in GIN_INDEXES:
+        create_index_online(
+            name, table, [column],
+            postgresql_using="gin", postgresql_ops={column: "jsonb_path_ops"}
+        )
+
+
+def downgrade():
+    if not is_postgresql():
+        return
+
+    for name, table, _ in GIN_INDEXES:
+        drop_index_online(name, table)
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=sa.Text(), postgresql_using=f"{column}::text")
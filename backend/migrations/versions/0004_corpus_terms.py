@@ -0,0 +1,27 @@
+"""Corpus term statistics for local keyword extraction
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_table_if_missing
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table_if_missing('corpus_terms',
+    sa.Column('term', sa.String(length=100), nullable=False),
+    sa.Column('document_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('term')
+    )
+
+
+def downgrade():
+    op.drop_table('corpus_terms')
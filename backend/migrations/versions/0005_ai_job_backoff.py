@@ -0,0 +1,42 @@
+"""Retry backoff for AI jobs and one active job per article and kind
+
+Adds ai_jobs.available_at (a failed attempt is not retried before it) and
+a partial unique index on (article_id, kind) for queued/running jobs, so
+concurrent submissions cannot queue the same work twice. Active duplicates
+left by earlier versions are marked failed first, keeping the oldest.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column_if_missing, create_index_online, drop_index_online
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+ACTIVE = "status IN ('queued', 'running')"
+
+
+def upgrade():
+    add_column_if_missing('ai_jobs', sa.Column('available_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(f"""
+        UPDATE ai_jobs SET status = 'failed', error = 'Duplicate of an earlier active job'
+        WHERE {ACTIVE} AND id NOT IN (
+            SELECT MIN(id) FROM ai_jobs WHERE {ACTIVE} GROUP BY article_id, kind
+        )
+    """)
+    create_index_online(
+        'uq_ai_job_active_article_kind', 'ai_jobs', ['article_id', 'kind'], unique=True,
+        postgresql_where=sa.text(ACTIVE), sqlite_where=sa.text(ACTIVE)
+    )
+
+
+def downgrade():
+    drop_index_online('uq_ai_job_active_article_kind', 'ai_jobs')
+    op.drop_column('ai_jobs', 'available_at')
@@ -0,0 +1,44 @@
+"""Unique (user_id, article_id) on reading_history
+
+Reading progress is upserted with ON CONFLICT on this pair. Duplicate rows
+written by concurrent upserts before the constraint existed are merged into
+the oldest one first (furthest progress, summed time, latest read).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+from migrations.helpers import create_index_online, drop_index_online
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+SAME_PAIR = "r.user_id = reading_history.user_id AND r.article_id = reading_history.article_id"
+
+
+def upgrade():
+    op.execute(f"""
+        UPDATE reading_history SET
+            reading_progress = (SELECT MAX(COALESCE(r.reading_progress, 0)) FROM reading_history r WHERE {SAME_PAIR}),
+            time_spent = (SELECT SUM(COALESCE(r.time_spent, 0)) FROM reading_history r WHERE {SAME_PAIR}),
+            read_at = (SELECT MAX(r.read_at) FROM reading_history r WHERE {SAME_PAIR})
+        WHERE id IN (
+            SELECT MIN(id) FROM reading_history GROUP BY user_id, article_id HAVING COUNT(*) > 1
+        )
+    """)
+    op.execute("""
+        DELETE FROM reading_history WHERE id NOT IN (
+            SELECT MIN(id) FROM reading_history GROUP BY user_id, article_id
+        )
+    """)
+    create_index_online('uq_reading_history_user_article', 'reading_history', ['user_id', 'article_id'], unique=True)
+    drop_index_online('idx_reading_history_user_article', 'reading_history')
+
+
+def downgrade():
+    create_index_online('idx_reading_history_user_article', 'reading_history', ['user_id', 'article_id'])
+    drop_index_online('uq_reading_history_user_article', 'reading_history')
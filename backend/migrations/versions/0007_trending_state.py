@@ -0,0 +1,30 @@
+"""Shared trending velocity state
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_table_if_missing
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table_if_missing('trending_state',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('view_count', sa.Integer(), nullable=False),
+    sa.Column('share_count', sa.Integer(), nullable=False),
+    sa.Column('velocity', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('article_id')
+    )
+
+
+def downgrade():
+    op.drop_table('trending_state')
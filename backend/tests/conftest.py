@@ -0,0 +1,58 @@
+"""
+Shared fixtures: a throwaway SQLite database migrated to head.
+
+The environment is set before any app module is imported, since
+app.core.database builds its engine from DATABASE_URL at import time.
+"""
+
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="dscvr-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["EVENT_LOG_DIR"] = os.path.join(TEST_DIR, "events")
+
+import pytest  # noqa: E402
+
+from app.core.database import Base, SessionLocal  # noqa: E402
+from app.core.migrations import upgrade  # noqa: E402
+from app.models.article import Article  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    upgrade()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="reader@example.com", username="reader", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def make_article(db):
+    def make(**fields):
+        article = Article(**{"title": "Article", "url": f"https://example.com/{make.count}", **fields})
+        make.count += 1
+        db.add(article)
+        db.commit()
+        return article
+    make.count = 0
+    return make
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from app.core.config import settings
+from app.services.ai_health import AIHealthService
+from app.services.ollama_pool import OllamaPool
+from benchmarks import fake_ollama
+
+
+def test_probe_answers_while_generations_fill_the_pool():
+    server, url = fake_ollama.start(first_token_ms=2000, tokens=1)
+
+    async def scenario():
+        pool = OllamaPool([url])
+        backend = pool.backends[0]
+        health = AIHealthService()
+        health.probe_timeout = 0.5
+        generations = [
+            asyncio.create_task(pool.post("/api/generate", json={"model": "llama2", "prompt": "hi", "stream": False}))
+            for _ in range(settings.AI_MAX_CONCURRENCY)
+        ]
+        await asyncio.sleep(0.2)
+        try:
+            assert backend.outstanding == settings.AI_MAX_CONCURRENCY
+            report = await health._probe_backend(backend, "llama2")
+            started = time.monotonic()
+            refreshed = await backend.refresh_models()
+            return report, refreshed, time.monotonic() - started, backend.consecutive_failures
+        finally:
+            for task in generations:
+                task.cancel()
+            await asyncio.gather(*generations, return_exceptions=True)
+            await pool.close()
+
+    try:
+        report, refreshed, refresh_seconds, failures = asyncio.run(scenario())
+    finally:
+        server.shutdown()
+
+    assert report["reachable"], report
+    assert report["model_installed"]
+    assert refreshed
+    assert refresh_seconds < 1.0
+    assert failures == 0
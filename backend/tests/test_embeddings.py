@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "hash")
+    monkeypatch.setattr(settings, "EMBEDDING_INDEX_DIR", str(tmp_path))
+    return EmbeddingService()
+
+
+def test_on_demand_embed_does_not_skip_lower_ids(db, service, make_article):
+    articles = [make_article(title=f"Story number {n}", description="markets and rates") for n in range(6)]
+    newest = articles[-1]
+
+    asyncio.run(service.related_articles(db, newest))
+    assert newest.id in service.get_index()
+
+    assert asyncio.run(service.index_articles(db)) == 5
+    index = service.get_index()
+    assert all(a.id in index for a in articles)
+    assert index.indexed_through == newest.id
+    # Nothing left past the mark
+    assert asyncio.run(service.index_articles(db)) == 0
+
+
+def test_indexing_resumes_from_the_mark(db, service, make_article):
+    articles = [make_article(title=f"Story {n}") for n in range(5)]
+    assert asyncio.run(service.index_articles(db, limit=2)) == 2
+    assert service.get_index().indexed_through == articles[1].id
+
+    reopened = EmbeddingService()
+    assert asyncio.run(reopened.index_articles(db)) == 3
+    assert len(reopened.get_index()) == 5
+
+
+def test_related_endpoint(db, service, make_article, monkeypatch):
+    import main
+
+    monkeypatch.setattr(embedding_module, "embedding_service", service)
+    target = make_article(title="Central bank raises interest rates", description="rates inflation")
+    make_article(title="Interest rates climb again", description="rates inflation")
+    make_article(title="Local team wins the cup", description="football final")
+    asyncio.run(service.index_articles(db))
+
+    client = TestClient(main.app)
+    response = client.get(f"/api/v1/articles/{target.id}/related", params={"limit": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["article_id"] == target.id
+    assert [r["article"]["title"] for r in body["related"]] == ["Interest rates climb again"]
+    assert client.get("/api/v1/articles/999999/related").status_code == 404
@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from app.models.article import Article, ReadingHistory
+from app.services.event_buffer import EventBuffer
+
+
+def crash(buffer: EventBuffer):
+    """Drop a buffer's file handles the way a killed process would, leaving its files behind"""
+    buffer._log.close()
+    buffer._owner_lock.close()
+
+
+def counts(db, article_id):
+    db.expire_all()
+    article = db.query(Article).filter(Article.id == article_id).one()
+    return article.view_count, article.share_count
+
+
+def test_flush_applies_counters_and_reads(db, tmp_path, user, make_article):
+    article = make_article()
+    buffer = EventBuffer(log_dir=str(tmp_path))
+    buffer.record([{"type": "view", "article_id": article.id}] * 3)
+    buffer.record([{"type": "share", "article_id": article.id}])
+    buffer.record([
+        {"type": "read", "article_id": article.id, "user_id": user.id, "progress": 40, "time_spent": 10},
+        {"type": "read", "article_id": article.id, "user_id": user.id, "progress": 20, "time_spent": 5},
+    ])
+
+    assert buffer.flush() == 2
+    assert counts(db, article.id) == (3, 1)
+    read = db.query(ReadingHistory).one()
+    assert (read.reading_progress, read.time_spent) == (40, 15)
+    assert buffer.flush() == 0
+    assert not list(tmp_path.glob("*.segment"))
+    buffer.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_record_reports_when_flush_is_due(tmp_path):
+    buffer = EventBuffer(log_dir=str(tmp_path))
+    buffer.max_events = 2
+    assert not buffer.record([{"type": "view", "article_id": 1}])
+    assert buffer.record([{"type": "view", "article_id": 1}])
+
+
+def test_recover_replays_logs_of_a_crashed_process(db, tmp_path, make_article):
+    article = make_article()
+    crashed = EventBuffer(log_dir=str(tmp_path))
+    crashed.record([{"type": "view", "article_id": article.id}] * 5)
+    crashed.record([{"type": "share", "article_id": article.id}])
+    crash(crashed)
+    # A torn final line from dying mid-write is skipped
+    with open(crashed._log_path(), "a") as log:
+        log.write('{"type":"view","article')
+
+    survivor = EventBuffer(log_dir=str(tmp_path))
+    survivor.recover()
+    assert survivor.stats["adopted_files"] == 1
+    survivor.flush()
+    assert counts(db, article.id) == (5, 1)
+
+    # Replayed files are deleted, so a second recovery adds nothing
+    survivor.recover()
+    survivor.flush()
+    assert counts(db, article.id) == (5, 1)
+    survivor.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_recover_leaves_live_processes_alone(db, tmp_path, make_article):
+    article = make_article()
+    live = EventBuffer(log_dir=str(tmp_path))
+    live.record([{"type": "view", "article_id": article.id}])
+
+    other = EventBuffer(log_dir=str(tmp_path))
+    other.recover()
+    assert other.stats["adopted_files"] == 0
+    assert other.flush() == 0
+
+    live.flush()
+    assert counts(db, article.id) == (1, 0)
+    live.close()
+    other.close()
+
+
+def test_failed_flush_keeps_events_for_the_next_one(db, tmp_path, make_article, monkeypatch):
+    article = make_article()
+    buffer = EventBuffer(log_dir=str(tmp_path))
+    buffer.record([{"type": "view", "article_id": article.id}] * 2)
+
+    def fail(*args):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(buffer, "_apply", fail)
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert list(tmp_path.glob("*.segment"))
+
+    monkeypatch.undo()
+    buffer.record([{"type": "view", "article_id": article.id}])
+    buffer.flush()
+    assert counts(db, article.id) == (3, 0)
+    assert not list(tmp_path.glob("*.segment"))
+    buffer.close()
+
+
+def test_unknown_ids_are_dropped_without_blocking_the_batch(db, tmp_path, user, make_article):
+    article = make_article()
+    buffer = EventBuffer(log_dir=str(tmp_path))
+    buffer.record([
+        {"type": "view", "article_id": article.id},
+        {"type": "view", "article_id": 999999},
+        {"type": "read", "article_id": 999999, "user_id": user.id, "progress": 50, "time_spent": 5},
+        {"type": "read", "article_id": article.id, "user_id": 424242, "progress": 50, "time_spent": 5},
+        {"type": "read", "article_id": article.id, "user_id": user.id, "progress": 70, "time_spent": 9},
+    ])
+
+    assert buffer.flush() == 2
+    assert buffer.stats["orphans_dropped"] == 3
+    assert counts(db, article.id) == (1, 0)
+    assert [(r.user_id, r.article_id) for r in db.query(ReadingHistory)] == [(user.id, article.id)]
+    assert not list(tmp_path.glob("*.segment"))
+
+    # Later batches flush normally
+    buffer.record([{"type": "share", "article_id": article.id}])
+    assert buffer.flush() == 1
+    assert counts(db, article.id) == (1, 1)
+    buffer.close()
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.services.facet_service import FacetService
+
+
+def counts(service, facet="categories"):
+    body, _ = asyncio.run(service.get(facet))
+    return {row["name"]: (row["total"], row["last_24h"]) for row in json.loads(body)["counts"]}
+
+
+def test_periodic_rebuild_sees_articles_from_other_writers(db, make_article):
+    service = FacetService()
+    make_article(category="science", source="Wire", published_date=datetime.now(timezone.utc))
+    assert counts(service) == {"science": (1, 1)}
+
+    # Stored by an importer or another worker: add_articles never runs here
+    make_article(category="science", source="Wire", published_date=datetime.now(timezone.utc))
+    make_article(category="health", source="Wire", published_date=datetime.now(timezone.utc) - timedelta(days=3))
+    assert counts(service) == {"science": (1, 1)}
+
+    async def one_round():
+        task = asyncio.create_task(service.run_periodically(interval=0.01))
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(one_round())
+    assert counts(service) == {"science": (2, 2), "health": (1, 0)}
+    assert counts(service, "sources") == {"Wire": (3, 2)}
+
+
+def test_encode_while_articles_are_added_from_a_thread(db):
+    service = FacetService()
+    asyncio.run(service.get("categories"))
+    stop = threading.Event()
+    now = datetime.now(timezone.utc)
+
+    def ingest():
+        n = 0
+        while not stop.is_set():
+            # Spread over the window so new hourly buckets keep appearing
+            service.add_articles([(f"cat-{n % 50}", "Wire", now - timedelta(hours=n % 23))])
+            n += 1
+
+    worker = threading.Thread(target=ingest)
+    interval = sys.getswitchinterval()
+    # Switch threads as often as possible so an unguarded iteration would collide
+    sys.setswitchinterval(1e-6)
+    worker.start()
+    try:
+        for hour in range(2000):
+            service._encode("categories", int(now.timestamp() // 3600) + hour % 3)
+    finally:
+        stop.set()
+        worker.join()
+        sys.setswitchinterval(interval)
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import feed_aggregator as aggregator_module
+from app.services.feed_aggregator import FeedAggregator
+
+FEED = b'{"title": "Local", "items": [{"title": "Hello", "url": "https://example.com/1", "content_text": "Body", "date_published": "2026-01-01T00:00:00Z"}]}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", self.path[len("/redirect?to="):])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def fetch(aggregator, url):
+    async def run():
+        try:
+            return await aggregator.aggregate([{"url": url}], 10)
+        finally:
+            await aggregator.close()
+    return asyncio.run(run())
+
+
+def test_private_targets_are_blocked(server_url):
+    aggregator = FeedAggregator()
+    aggregator.allow_private_hosts = False
+    for url in (f"{server_url}/feed", "http://169.254.169.254/latest/meta-data/", "http://[::1]/", "file:///etc/passwd"):
+        feed = fetch(aggregator, url)["feeds"][0]
+        assert not feed["ok"]
+    assert aggregator.stats["upstream_fetches"] == 4
+
+
+def test_redirects_to_private_targets_are_blocked(server_url, monkeypatch):
+    # Treat the test server's address as public; everything else on loopback stays private
+    monkeypatch.setattr(aggregator_module, "_is_public_address", lambda address: str(address) == "127.0.0.1")
+    port = server_url.rsplit(":", 1)[1]
+    aggregator = FeedAggregator()
+    aggregator.allow_private_hosts = False
+
+    assert fetch(aggregator, f"{server_url}/feed")["items"][0]["title"] == "Hello"
+    followed = fetch(FeedAggregator(), f"{server_url}/redirect?to={server_url}/feed")
+    assert followed["feeds"][0]["ok"]
+
+    aggregator = FeedAggregator()
+    aggregator.allow_private_hosts = False
+    blocked = fetch(aggregator, f"{server_url}/redirect?to=http://127.0.0.2:{port}/feed")["feeds"][0]
+    assert not blocked["ok"]
+    assert "non-public" in blocked["error"]
+
+
+def test_aggregate_requires_authentication(server_url):
+    import main
+
+    client = TestClient(main.app)
+    response = client.post("/api/v1/rss/aggregate", json={"feed_urls": [f"{server_url}/feed"]})
+    assert response.status_code == 401
+
+
+def test_aggregate_for_a_signed_in_user(server_url, user, monkeypatch):
+    import main
+    from app.core.security import get_current_user
+
+    aggregator = FeedAggregator()
+    aggregator.allow_private_hosts = True
+    monkeypatch.setattr("app.api.v1.endpoints.rss.feed_aggregator", aggregator)
+    main.app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        response = TestClient(main.app).post("/api/v1/rss/aggregate", json={"feed_urls": [f"{server_url}/feed"], "category": "tech"})
+    finally:
+        main.app.dependency_overrides.clear()
+    assert response.status_code == 200
+    item = response.json()["data"]["items"][0]
+    assert (item["title"], item["source"], item["category"]) == ("Hello", "Local", "tech")
@@ -0,0 +1,102 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import conditional_response, http_cache, make_etag
+
+state = {"version": 1, "calls": 0}
+
+
+def stamp():
+    return state["version"]
+
+
+app = FastAPI()
+
+
+@app.get("/items", dependencies=[http_cache(stamp, max_age=60)])
+def items():
+    state["calls"] += 1
+    return {"version": state["version"]}
+
+
+@app.get("/raw")
+def raw(request: Request):
+    return conditional_response(request, b'{"ok":true}', make_etag("raw"), max_age=30, private=True)
+
+
+@pytest.fixture
+def client():
+    state.update(version=1, calls=0)
+    return TestClient(app)
+
+
+def test_matching_etag_gets_304_without_running_the_handler(client):
+    first = client.get("/items")
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get("/items", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+    assert state["calls"] == 1
+
+
+def test_etag_changes_with_the_stamp(client):
+    etag = client.get("/items").headers["ETag"]
+    state["version"] = 2
+    response = client.get("/items", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == {"version": 2}
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_depends_on_the_query(client):
+    assert client.get("/items").headers["ETag"] != client.get("/items?page=2").headers["ETag"]
+
+
+@pytest.mark.parametrize("header", [
+    '"other", {etag}',
+    "{strong}",
+    "*",
+])
+def test_if_none_match_forms(client, header):
+    etag = client.get("/items").headers["ETag"]
+    value = header.format(etag=etag, strong=etag.removeprefix("W/"))
+    assert client.get("/items", headers={"If-None-Match": value}).status_code == 304
+
+
+def test_conditional_response(client):
+    first = client.get("/raw")
+    assert first.json() == {"ok": True}
+    assert first.headers["Cache-Control"] == "private, max-age=30"
+    assert client.get("/raw", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    assert client.get("/raw", headers={"If-None-Match": 'W/"stale"'}).status_code == 200
+
+
+def test_daily_rollup_etag_follows_the_database(db, user):
+    from datetime import date
+
+    import main
+    from app.core.security import get_current_user
+    from app.models.article import ReadingHistoryDaily
+
+    main.app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        api = TestClient(main.app)
+        url = "/api/v1/users/me/reading-history/daily"
+        etag = api.get(url).headers["ETag"]
+        assert api.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        # Written by another process's rollup: no in-memory counter knows about it
+        db.add(ReadingHistoryDaily(user_id=user.id, day=date.today(), articles_read=2,
+                                   completed_count=1, total_time_spent=60))
+        db.commit()
+        response = api.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+    finally:
+        main.app.dependency_overrides.clear()
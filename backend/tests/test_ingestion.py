@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.article import Article, ArticleCreate
+from app.models.ingestion import IngestionState
+from app.services import ingestion_service as ingestion_module
+from app.services.ingestion_service import IngestionService
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+class FakeNewsAPI:
+    """Serves `count` articles, one a minute apart, newest first in pages like NewsAPI"""
+
+    def __init__(self, count):
+        self.articles = [
+            ArticleCreate(title=f"Story {n}", url=f"https://news.example.com/{n}", published_date=NOW - timedelta(minutes=n))
+            for n in range(count)
+        ]
+        self.pages = []
+
+    async def search_articles(self, query, from_date=None, to_date=None, sources=None, max_articles=100, page=1):
+        self.pages.append(page)
+        matching = [a for a in self.articles if from_date is None or a.published_date >= from_date]
+        return [a.model_copy() for a in matching[(page - 1) * max_articles:page * max_articles]]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = IngestionService()
+    service.categories = ["technology"]
+    service.newsapi_page_size = 100
+    return service
+
+
+def run(service, monkeypatch, api):
+    monkeypatch.setattr(ingestion_module, "news_api_service", api)
+    return asyncio.run(service._run())
+
+
+def mark(db):
+    db.expire_all()
+    state = db.query(IngestionState).filter(IngestionState.source_key == "newsapi:technology").one()
+    return state.high_water_mark and state.high_water_mark.replace(tzinfo=timezone.utc)
+
+
+def test_pages_back_to_the_high_water_mark(db, service, monkeypatch):
+    api = FakeNewsAPI(250)
+    result = run(service, monkeypatch, api)
+
+    assert result["saved_count"] == 250
+    assert api.pages == [1, 2, 3]
+    assert db.query(Article).count() == 250
+    assert mark(db) == NOW
+
+
+def test_truncated_pull_keeps_the_mark(db, service, monkeypatch):
+    service.newsapi_max_pages = 2
+    api = FakeNewsAPI(250)
+    result = run(service, monkeypatch, api)
+    assert result["saved_count"] == 200
+    assert mark(db) is None
+
+    # The next run covers the rest of the window; already-saved URLs are skipped
+    service.newsapi_max_pages = 10
+    result = run(service, monkeypatch, api)
+    assert result["saved_count"] == 50
+    assert db.query(Article).count() == 250
+    assert mark(db) == NOW
+
+
+def test_failure_on_a_later_page_keeps_earlier_pages(db, service, monkeypatch):
+    api = FakeNewsAPI(150)
+    search = api.search_articles
+
+    async def capped(*args, page=1, **kwargs):
+        if page > 1:
+            raise RuntimeError("NewsAPI error: maximumResultsReached")
+        return await search(*args, page=page, **kwargs)
+
+    api.search_articles = capped
+    result = run(service, monkeypatch, api)
+    assert result["saved_count"] == 100
+    assert result["errors"] == {}
+    assert mark(db) is None
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.ai_job import AIJob, PRIORITY_BACKFILL, PRIORITY_INTERACTIVE
+from app.services.job_queue import JobQueue
+
+RESULT = {"summary": "Summary", "sentiment": "neutral", "keywords": ["news"]}
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue()
+    queue.max_attempts = 3
+    queue.retry_base = 30.0
+    queue.retry_max = 100.0
+    return queue
+
+
+def job(db, job_id) -> AIJob:
+    db.expire_all()
+    return db.query(AIJob).filter(AIJob.id == job_id).one()
+
+
+def make_due(db, job_id):
+    db.query(AIJob).filter(AIJob.id == job_id).update({AIJob.available_at: datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_submit_deduplicates_and_raises_priority(db, queue, make_article):
+    article = make_article()
+    first = queue.submit(db, article.id, priority=PRIORITY_BACKFILL)
+    second = queue.submit(db, article.id, priority=PRIORITY_INTERACTIVE)
+    assert second.id == first.id
+    assert job(db, first.id).priority == PRIORITY_INTERACTIVE
+    assert db.query(AIJob).count() == 1
+
+
+def test_claim_takes_highest_priority_first(db, queue, make_article):
+    backfill = queue.submit(db, make_article().id, priority=PRIORITY_BACKFILL)
+    interactive = queue.submit(db, make_article().id, priority=PRIORITY_INTERACTIVE)
+
+    assert queue._claim() == interactive.id
+    assert queue._claim() == backfill.id
+    assert queue._claim() is None
+    claimed = job(db, interactive.id)
+    assert (claimed.status, claimed.attempts) == ("running", 1)
+
+
+def test_failed_attempt_backs_off_before_retry(db, queue, make_article):
+    submitted = queue.submit(db, make_article().id)
+    queue._finish(queue._claim(), None, "Ollama timed out")
+
+    retried = job(db, submitted.id)
+    assert retried.status == "queued"
+    assert retried.error == "Ollama timed out"
+    assert retried.available_at is not None
+    # Not claimable until the backoff has passed
+    assert queue._claim() is None
+
+    make_due(db, submitted.id)
+    assert queue._claim() == submitted.id
+    queue._finish(submitted.id, RESULT, None)
+    done = job(db, submitted.id)
+    assert (done.status, done.attempts, done.error) == ("done", 2, None)
+
+
+def test_retry_delay_doubles_up_to_the_cap(queue):
+    assert [queue.retry_delay(n) for n in (1, 2, 3, 4)] == [30.0, 60.0, 100.0, 100.0]
+
+
+def test_job_fails_after_max_attempts(db, queue, make_article):
+    submitted = queue.submit(db, make_article().id)
+    for _ in range(queue.max_attempts):
+        make_due(db, submitted.id)
+        queue._finish(queue._claim(), None, "boom")
+
+    failed = job(db, submitted.id)
+    assert (failed.status, failed.attempts) == ("failed", 3)
+    assert failed.finished_at is not None
+    # A failed job no longer blocks a new submission for the article
+    assert queue.submit(db, failed.article_id).id != submitted.id
+
+
+def test_deleted_article_fails_without_retry(db, queue, make_article):
+    article = make_article()
+    submitted = queue.submit(db, article.id)
+    job_id = queue._claim()
+    db.delete(article)
+    db.commit()
+
+    queue._finish(job_id, RESULT, None)
+    failed = job(db, submitted.id)
+    assert (failed.status, failed.error) == ("failed", "Article not found")
+
+
+def test_interrupted_jobs_are_requeued_or_failed(db, queue, make_article):
+    retryable = queue.submit(db, make_article().id)
+    exhausted = queue.submit(db, make_article().id)
+    fresh = queue.submit(db, make_article().id)
+    for _ in range(3):
+        queue._claim()
+    stale = datetime.now(timezone.utc) - timedelta(seconds=queue.stale_after + 60)
+    db.query(AIJob).filter(AIJob.id.in_([retryable.id, exhausted.id])).update(
+        {AIJob.started_at: stale}, synchronize_session=False
+    )
+    db.query(AIJob).filter(AIJob.id == exhausted.id).update({AIJob.attempts: queue.max_attempts})
+    db.commit()
+
+    queue._requeue_interrupted()
+    assert job(db, retryable.id).status == "queued"
+    assert job(db, exhausted.id).status == "failed"
+    assert job(db, fresh.id).status == "running"
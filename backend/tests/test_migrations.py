@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+from alembic.script import ScriptDirectory
+
+from app.core.migrations import SCHEMA_HEAD, alembic_config, current_revision
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def migrate(database, *args):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}")
+    return subprocess.run(
+        [sys.executable, "migrate.py", *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+
+
+def test_schema_head_matches_the_newest_migration():
+    assert ScriptDirectory.from_config(alembic_config()).get_current_head() == SCHEMA_HEAD
+
+
+def test_test_database_is_at_head():
+    assert current_revision() == SCHEMA_HEAD
+
+
+def test_upgrade_to_head_passes_check(tmp_path):
+    database = tmp_path / "fresh.db"
+    assert migrate(database, "check").returncode == 1
+
+    upgraded = migrate(database, "upgrade")
+    assert upgraded.returncode == 0, upgraded.stderr
+    checked = migrate(database, "check")
+    assert checked.returncode == 0, checked.stdout
+    assert "Schema is up to date" in checked.stdout
+
+
+def test_downgrade_and_upgrade_again(tmp_path):
+    database = tmp_path / "roundtrip.db"
+    assert migrate(database, "upgrade").returncode == 0
+    downgraded = migrate(database, "downgrade", "0001")
+    assert downgraded.returncode == 0, downgraded.stderr
+    assert migrate(database, "check").returncode == 1
+
+    upgraded = migrate(database, "upgrade")
+    assert upgraded.returncode == 0, upgraded.stderr
+    assert migrate(database, "check").returncode == 0
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from app.services.ollama_scheduler import (
+    AIServiceBusy, LANE_BACKGROUND, LANE_HEALTH, LANE_INTERACTIVE, OllamaScheduler,
+)
+
+
+def scheduler(max_concurrency=1, max_waiting=10) -> OllamaScheduler:
+    scheduler = OllamaScheduler()
+    scheduler.max_concurrency = max_concurrency
+    scheduler.max_waiting = max_waiting
+    scheduler.queue_timeouts = {LANE_INTERACTIVE: 5.0, LANE_BACKGROUND: 5.0, LANE_HEALTH: 5.0}
+    return scheduler
+
+
+def test_released_slot_goes_to_the_highest_priority_lane():
+    async def scenario():
+        s = scheduler()
+        order = []
+        release = asyncio.Event()
+
+        async def hold():
+            async with s.slot(LANE_BACKGROUND):
+                await release.wait()
+
+        async def use(lane, name):
+            async with s.slot(lane):
+                order.append(name)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        # Queued lowest priority first; each lane is FIFO
+        waiters = [
+            asyncio.create_task(use(LANE_HEALTH, "health")),
+            asyncio.create_task(use(LANE_BACKGROUND, "background-1")),
+            asyncio.create_task(use(LANE_BACKGROUND, "background-2")),
+            asyncio.create_task(use(LANE_INTERACTIVE, "interactive")),
+        ]
+        await asyncio.sleep(0)
+        assert s.snapshot()["in_flight"] == 1
+        release.set()
+        await asyncio.gather(holder, *waiters)
+        return s, order
+
+    s, order = asyncio.run(scenario())
+    assert order == ["interactive", "background-1", "background-2", "health"]
+    assert s.snapshot()["in_flight"] == 0
+
+
+def test_queue_wait_times_out():
+    async def scenario():
+        s = scheduler()
+        s.queue_timeouts[LANE_BACKGROUND] = 0.05
+        async with s.slot(LANE_INTERACTIVE):
+            with pytest.raises(AIServiceBusy) as busy:
+                async with s.slot(LANE_BACKGROUND):
+                    pass
+        return s, busy.value
+
+    s, busy = asyncio.run(scenario())
+    assert busy.lane == LANE_BACKGROUND
+    assert "exceeded" in busy.reason
+    assert busy.retry_after >= 1
+    lanes = s.snapshot()["lanes"]
+    assert lanes[LANE_BACKGROUND]["timeouts"] == 1
+    assert lanes[LANE_BACKGROUND]["waiting"] == 0
+    assert s.snapshot()["in_flight"] == 0
+
+
+def test_full_queue_is_rejected():
+    async def scenario():
+        s = scheduler(max_waiting=1)
+        async with s.slot():
+            waiter = asyncio.create_task(s._acquire(LANE_INTERACTIVE, 5.0))
+            await asyncio.sleep(0)
+            with pytest.raises(AIServiceBusy) as busy:
+                await s._acquire(LANE_INTERACTIVE, 5.0)
+        await waiter
+        s._release()
+        return s, busy.value
+
+    s, busy = asyncio.run(scenario())
+    assert busy.reason == "queue full"
+    assert s.snapshot()["lanes"][LANE_INTERACTIVE]["rejected"] == 1
+    assert s.snapshot()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        s = scheduler()
+        async with s.slot():
+            waiter = asyncio.create_task(s._acquire(LANE_INTERACTIVE, 5.0))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        # The slot is free again: an immediate acquire succeeds
+        await asyncio.wait_for(s._acquire(LANE_INTERACTIVE, 0.01), 1)
+        s._release()
+        return s
+
+    s = asyncio.run(scenario())
+    assert s.snapshot()["in_flight"] == 0
+    assert s.snapshot()["lanes"][LANE_INTERACTIVE]["waiting"] == 0
+
+
+def test_concurrency_limit_is_respected():
+    async def scenario():
+        s = scheduler(max_concurrency=2)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            async with s.slot(LANE_BACKGROUND):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        return s, peak
+
+    s, peak = asyncio.run(scenario())
+    assert peak == 2
+    assert s.snapshot()["lanes"][LANE_BACKGROUND]["admitted"] == 6
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.article import ReadingHistory
+from app.services.reading_history_service import reading_history_service
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def read(progress, time_spent, read_at=NOW):
+    return {"progress": progress, "time_spent": time_spent, "read_at": read_at}
+
+
+def test_upsert_merges_into_one_row(db, user, make_article):
+    article = make_article()
+    reading_history_service.upsert_many(db, {(user.id, article.id): read(60, 30)})
+    reading_history_service.upsert_many(db, {(user.id, article.id): read(20, 15, NOW + timedelta(hours=1))})
+    db.commit()
+
+    row = db.query(ReadingHistory).one()
+    # Furthest progress is kept, time accumulates, read_at moves to the latest read
+    assert (row.reading_progress, row.time_spent) == (60, 45)
+    assert row.read_at.replace(tzinfo=timezone.utc) == NOW + timedelta(hours=1)
+
+    reading_history_service.upsert_many(db, {(user.id, article.id): read(95, 5)})
+    db.commit()
+    db.expire_all()
+    row = db.query(ReadingHistory).one()
+    assert (row.reading_progress, row.time_spent) == (95, 50)
+
+
+def test_record_progress_returns_the_stored_row(db, user, make_article):
+    article = make_article()
+    reading_history_service.record_progress(db, user.id, article.id, 30, 10)
+    row = reading_history_service.record_progress(db, user.id, article.id, 50, 10)
+    assert (row.reading_progress, row.time_spent) == (50, 20)
+    assert db.query(ReadingHistory).count() == 1
+
+
+def test_cursor_pages_through_history_once(db, user, make_article):
+    articles = [make_article() for _ in range(7)]
+    # Three reads share a timestamp, so the cursor has to break ties on id
+    times = [NOW, NOW, NOW, NOW - timedelta(minutes=1), NOW - timedelta(minutes=2),
+             NOW - timedelta(minutes=2), NOW - timedelta(minutes=3)]
+    reading_history_service.upsert_many(db, {
+        (user.id, article.id): read(10, 1, read_at) for article, read_at in zip(articles, times)
+    })
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = reading_history_service.list_history(db, user.id, limit=3, cursor=cursor)
+        seen.extend(rows)
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({row.id for row in seen}) == 7
+    keys = [(row.read_at, row.id) for row in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_last_page_has_no_cursor(db, user, make_article):
+    article = make_article()
+    reading_history_service.record_progress(db, user.id, article.id, 10, 1)
+    rows, cursor = reading_history_service.list_history(db, user.id, limit=1)
+    assert len(rows) == 1
+    assert cursor is None
+
+
+def test_malformed_cursor_is_rejected(db, user):
+    with pytest.raises(ValueError):
+        reading_history_service.list_history(db, user.id, cursor="not-a-cursor")
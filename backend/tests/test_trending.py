@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.article import Article
+from app.models.trending import TrendingState
+from app.services.trending_service import TrendingService
+
+
+def worker(min_advance_seconds=0.0) -> TrendingService:
+    service = TrendingService()
+    service.min_advance_seconds = min_advance_seconds
+    return service
+
+
+def flagged(db):
+    db.expire_all()
+    return {a.id for a in db.query(Article).filter(Article.is_trending.is_(True))}
+
+
+def add_views(db, article, views):
+    db.query(Article).filter(Article.id == article.id).update({Article.view_count: Article.view_count + views})
+    db.commit()
+
+
+def test_workers_share_baselines_and_flags(db, make_article):
+    published = datetime.now(timezone.utc) - timedelta(hours=1)
+    hot = make_article(published_date=published, view_count=500, share_count=10)
+    cold = make_article(published_date=published, view_count=900, share_count=0)
+
+    first = worker()
+    assert first.compute(db)["articles"] == []
+    assert flagged(db) == set()
+    assert db.query(TrendingState).count() == 2
+
+    add_views(db, hot, 40)
+    assert [a["id"] for a in first.compute(db)["articles"]] == [hot.id]
+    assert flagged(db) == {hot.id}
+
+    # A worker that never ran before scores from the stored state instead of starting a
+    # fresh baseline, so it neither treats lifetime counts as growth nor clears the flags
+    second = worker()
+    assert [a["id"] for a in second.compute(db)["articles"]] == [hot.id]
+    assert flagged(db) == {hot.id}
+
+    # Inside the advance interval a worker reads the state without writing it
+    computed_at = db.query(TrendingState.computed_at).first()[0]
+    add_views(db, cold, 5)
+    third = worker(min_advance_seconds=3600)
+    assert [a["id"] for a in third.compute(db)["articles"]] == [hot.id]
+    db.expire_all()
+    assert db.query(TrendingState.computed_at).first()[0] == computed_at
+    assert db.query(TrendingState).filter(TrendingState.article_id == cold.id).one().view_count == 900
+
+
+def test_new_article_growth_counts_from_zero(db, make_article):
+    service = worker()
+    make_article(published_date=datetime.now(timezone.utc), view_count=3)
+    service.compute(db)
+
+    now = datetime.now(timezone.utc)
+    fresh = make_article(published_date=now, created_at=now, view_count=25)
+    assert [a["id"] for a in service.compute(db)["articles"]] == [fresh.id]
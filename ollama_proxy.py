@@ -1,73 +1,218 @@
 #!/usr/bin/env python3
 """
 Simple proxy server to handle CORS issues when accessing Ollama from browser
+
+Two modes:
+  async (default)  ASGI app on uvicorn with one pooled upstream client. Request and
+                   response bodies are passed through byte-for-byte, so streamed
+                   tokens from /api/generate and /api/chat reach the browser as
+                   Ollama produces them. Concurrent upstream requests are capped.
+  flask            The original blocking Flask proxy, kept for comparison
+                   (see backend/benchmarks/bench_ollama_proxy.py).
+
+Usage:
+    python ollama_proxy.py [--mode async|flask] [--port 5001] [--upstream http://localhost:11434]
+                           [--max-concurrency 8] [--max-connections 32]
+
+The upstream URL and limits can also be set with OLLAMA_BASE_URL,
+OLLAMA_PROXY_MAX_CONCURRENCY and OLLAMA_PROXY_MAX_CONNECTIONS.
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import requests
-import json
-import time
-
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
-
-OLLAMA_BASE_URL = "http://localhost:11434"
-
-@app.route('/api/tags', methods=['GET'])
-def get_models():
-    """Proxy for getting available models"""
-    try:
-        response = requests.get(f"{OLLAMA_BASE_URL}/api/tags")
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/show', methods=['POST'])
-def show_model():
-    """Proxy for getting model information"""
-    try:
-        data = request.get_json()
-        response = requests.post(f"{OLLAMA_BASE_URL}/api/show", json=data)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    """Proxy for chat API"""
-    try:
-        data = request.get_json()
-        response = requests.post(f"{OLLAMA_BASE_URL}/api/chat", json=data)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/generate', methods=['POST'])
-def generate():
-    """Proxy for generate API"""
-    try:
-        data = request.get_json()
-        response = requests.post(f"{OLLAMA_BASE_URL}/api/generate", json=data)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    try:
-        response = requests.get(f"{OLLAMA_BASE_URL}/api/tags")
+import argparse
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
+# Ollama runs a handful of requests at a time per model; more only queue inside Ollama
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("OLLAMA_PROXY_MAX_CONCURRENCY", "8"))
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("OLLAMA_PROXY_MAX_CONNECTIONS", "32"))
+
+# Generation can pause for a long time (model load, long prompts) before the first byte
+UPSTREAM_READ_TIMEOUT = 300.0
+
+PROXIED_ROUTES = [
+    ("/api/tags", ["GET"]),
+    ("/api/ps", ["GET"]),
+    ("/api/show", ["POST"]),
+    ("/api/chat", ["POST"]),
+    ("/api/generate", ["POST"]),
+    ("/api/embed", ["POST"]),
+    ("/api/embeddings", ["POST"]),
+]
+
+# Hop-by-hop and length headers are recomputed by the server on each side
+_SKIP_REQUEST_HEADERS = {"host", "content-length", "connection", "keep-alive", "transfer-encoding", "upgrade"}
+_SKIP_RESPONSE_HEADERS = {"content-length", "connection", "keep-alive", "transfer-encoding"}
+
+
+def create_async_app(
+    upstream: str = OLLAMA_BASE_URL,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+):
+    """Build the streaming ASGI proxy"""
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.background import BackgroundTask
+    from starlette.middleware import Middleware
+    from starlette.middleware.cors import CORSMiddleware
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Route
+
+    state = {}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        state["client"] = httpx.AsyncClient(
+            base_url=upstream,
+            timeout=httpx.Timeout(10.0, read=UPSTREAM_READ_TIMEOUT),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        state["slots"] = asyncio.Semaphore(max_concurrency)
+        yield
+        await state["client"].aclose()
+
+    async def proxy(request):
+        client: httpx.AsyncClient = state["client"]
+        slots: asyncio.Semaphore = state["slots"]
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _SKIP_REQUEST_HEADERS}
+        upstream_request = client.build_request(
+            request.method, request.url.path, params=request.query_params,
+            headers=headers, content=await request.body(),
+        )
+
+        # The slot is held until the response body has been fully relayed, not just until headers arrive
+        await slots.acquire()
+        try:
+            response = await client.send(upstream_request, stream=True)
+        except httpx.HTTPError as e:
+            slots.release()
+            return JSONResponse({"error": str(e)}, status_code=502)
+        except BaseException:
+            slots.release()
+            raise
+
+        async def release():
+            await response.aclose()
+            slots.release()
+
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in _SKIP_RESPONSE_HEADERS},
+            background=BackgroundTask(release),
+        )
+
+    async def health(request):
+        try:
+            response = await state["client"].get("/api/tags", timeout=5.0)
+        except httpx.HTTPError as e:
+            return JSONResponse({"status": "unhealthy", "ollama": "error", "error": str(e)}, status_code=500)
         if response.status_code == 200:
-            return jsonify({"status": "healthy", "ollama": "connected"}), 200
-        else:
-            return jsonify({"status": "unhealthy", "ollama": "disconnected"}), 500
-    except Exception as e:
-        return jsonify({"status": "unhealthy", "ollama": "error", "error": str(e)}), 500
+            return JSONResponse({"status": "healthy", "ollama": "connected"})
+        return JSONResponse({"status": "unhealthy", "ollama": "disconnected"}, status_code=500)
 
-if __name__ == '__main__':
-    print("🚀 Starting Ollama Proxy Server...")
-    print("📍 Proxy URL: http://localhost:5001")
-    print("🔗 Ollama URL: http://localhost:11434")
+    routes = [Route(path, proxy, methods=methods) for path, methods in PROXIED_ROUTES]
+    routes.append(Route("/health", health, methods=["GET"]))
+    return Starlette(
+        routes=routes,
+        middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+        lifespan=lifespan,
+    )
+
+
+def create_flask_app(upstream: str = OLLAMA_BASE_URL):
+    """The original blocking proxy: one un-pooled request per call, fully buffered and re-encoded"""
+    from flask import Flask, request, jsonify
+    from flask_cors import CORS
+    import requests
+
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS for all routes
+
+    @app.route('/api/tags', methods=['GET'])
+    def get_models():
+        """Proxy for getting available models"""
+        try:
+            response = requests.get(f"{upstream}/api/tags")
+            return jsonify(response.json()), response.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/api/show', methods=['POST'])
+    def show_model():
+        """Proxy for getting model information"""
+        try:
+            data = request.get_json()
+            response = requests.post(f"{upstream}/api/show", json=data)
+            return jsonify(response.json()), response.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/api/chat', methods=['POST'])
+    def chat():
+        """Proxy for chat API"""
+        try:
+            data = request.get_json()
+            response = requests.post(f"{upstream}/api/chat", json=data)
+            return jsonify(response.json()), response.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/api/generate', methods=['POST'])
+    def generate():
+        """Proxy for generate API"""
+        try:
+            data = request.get_json()
+            response = requests.post(f"{upstream}/api/generate", json=data)
+            return jsonify(response.json()), response.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/health', methods=['GET'])
+    def health():
+        """Health check endpoint"""
+        try:
+            response = requests.get(f"{upstream}/api/tags")
+            if response.status_code == 200:
+                return jsonify({"status": "healthy", "ollama": "connected"}), 200
+            else:
+                return jsonify({"status": "unhealthy", "ollama": "disconnected"}), 500
+        except Exception as e:
+            return jsonify({"status": "unhealthy", "ollama": "error", "error": str(e)}), 500
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CORS proxy in front of Ollama")
+    parser.add_argument("--mode", choices=["async", "flask"], default="async")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--upstream", default=OLLAMA_BASE_URL)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="upstream requests in flight at once (async mode)")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help="pooled upstream connections (async mode)")
+    parser.add_argument("--debug", action="store_true", help="Flask debug mode (flask mode only)")
+    args = parser.parse_args()
+
+    print(f"🚀 Starting Ollama Proxy Server ({args.mode})...")
+    print(f"📍 Proxy URL: http://localhost:{args.port}")
+    print(f"🔗 Ollama URL: {args.upstream}")
     print("🌐 CORS enabled for browser access")
-    app.run(host='0.0.0.0', port=5001, debug=True)
+
+    if args.mode == "flask":
+        create_flask_app(args.upstream).run(host=args.host, port=args.port, debug=args.debug, threaded=True)
+    else:
+        import uvicorn
+
+        print(f"⚙️  Max concurrent upstream requests: {args.max_concurrency}")
+        app = create_async_app(args.upstream, args.max_concurrency, args.max_connections)
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == '__main__':
+    main()
@@ -257,7 +257,7 @@ class ApiService {
       message: string;
       total_fetched: number;
       saved_count: number;
-    }>('/news/fetch');
+    }>('/news/fetch', { method: 'POST' });
   }
 
   async getNewsCategories(): Promise<{ categories: string[] }> {
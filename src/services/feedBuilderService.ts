@@ -112,16 +112,6 @@ const RSS_FEEDS: FeedSource[] = [
   }
 ];
 
-// Rate limiting configuration
-const RATE_LIMIT_CONFIG = {
-  minDelay: 1000, // 1 second minimum between requests
-  maxDelay: 3000, // 3 seconds maximum delay
-  maxRetries: 2,
-  retryDelay: 2000, // 2 seconds base retry delay
-  batchSize: 2, // Process 2 feeds at a time
-  batchDelay: 2000, // 2 seconds between batches
-};
-
 class FeedBuilderService {
   private cache = new Map<string, { data: FeedItem[]; timestamp: number }>();
   private readonly CACHE_DURATION = 10 * 60 * 1000; // 10 minutes cache
@@ -141,15 +131,6 @@ class FeedBuilderService {
     return cached ? cached.data : null;
   }
 
-  private calculateWordCount(content: string): number {
-    return content.trim().split(/\s+/).length;
-  }
-
-  private calculateReadingTime(wordCount: number): number {
-    const averageWPM = 200;
-    return Math.max(1, Math.ceil(wordCount / averageWPM));
-  }
-
   private extractTags(text: string): string[] {
     const commonTags = [
       'trending', 'viral', 'popular', 'news', 'technology', 'AI', 'artificial intelligence',
@@ -178,75 +159,6 @@ class FeedBuilderService {
     return 'neutral';
   }
 
-  private async fetchRSSFeed(feed: FeedSource): Promise<FeedItem[]> {
-    let retries = 0;
-    let retryDelay = RATE_LIMIT_CONFIG.retryDelay;
-
-    while (retries < RATE_LIMIT_CONFIG.maxRetries) {
-      try {
-        // Add delay to avoid rate limiting
-        await new Promise(resolve => setTimeout(resolve, Math.random() * RATE_LIMIT_CONFIG.maxDelay));
-        
-        // Use proxy service to avoid CORS issues
-        const { rssProxyService } = await import('./rssProxyService');
-        const response = await rssProxyService.fetchRSSFeed(feed.url);
-        
-        if (!response.success) {
-          console.warn(`Failed to fetch RSS feed ${feed.name}: ${response.error}`);
-          retries++;
-          if (retries < RATE_LIMIT_CONFIG.maxRetries) {
-            await new Promise(resolve => setTimeout(resolve, retryDelay));
-            retryDelay *= 2; // Exponential backoff
-          }
-          continue;
-        }
-
-        const data = response.data;
-        
-        if (!data.items || !Array.isArray(data.items)) {
-          console.warn(`No items found in RSS feed for ${feed.name}`);
-          return [];
-        }
-
-        return data.items.map((item: any, index: number) => {
-          const content = item.content_text || item.content_html || item.summary || '';
-          const wordCount = this.calculateWordCount(content);
-          
-          return {
-            id: `${feed.id}_${index}`,
-            title: item.title || 'No Title',
-            content: content,
-            excerpt: content.length > 200 ? content.substring(0, 200) + '...' : content,
-            author: item.authors?.[0]?.name || item.author || feed.name,
-            source: feed.name,
-            url: item.url || '#',
-            publishedAt: item.date_published || item.pubDate || new Date().toISOString(),
-            imageUrl: item.image || item.thumbnail || undefined,
-            category: feed.category,
-            tags: this.extractTags(`${item.title} ${content}`),
-            readingTime: this.calculateReadingTime(wordCount),
-            wordCount: wordCount,
-            apiSource: 'rss-feed' as const,
-            sentiment: this.analyzeSentiment(`${item.title} ${content}`),
-            language: 'en',
-            country: 'US'
-          };
-        });
-        
-      } catch (error) {
-        console.warn(`Failed to fetch RSS feed ${feed.name}:`, error);
-        retries++;
-        if (retries < RATE_LIMIT_CONFIG.maxRetries) {
-          await new Promise(resolve => setTimeout(resolve, retryDelay));
-          retryDelay *= 2; // Exponential backoff
-        }
-      }
-    }
-    
-    console.warn(`Max retries reached for RSS feed ${feed.name}`);
-    return [];
-  }
-
   async getFeedItems(category?: string, limit: number = 20): Promise<FeedItem[]> {
     const cacheKey = `feed_${category || 'all'}_${limit}`;
     
@@ -260,38 +172,53 @@ class FeedBuilderService {
         .filter(source => source.enabled && (!category || source.category === category))
         .sort((a, b) => a.priority - b.priority);
 
-      const allItems: FeedItem[] = [];
+      if (sources.length === 0) {
+        return [];
+      }
 
-      // Process sources in batches to avoid overwhelming the API
-      for (let i = 0; i < sources.length; i += RATE_LIMIT_CONFIG.batchSize) {
-        const batch = sources.slice(i, i + RATE_LIMIT_CONFIG.batchSize);
-        
-        console.log(`Processing batch ${Math.floor(i / RATE_LIMIT_CONFIG.batchSize) + 1} of ${Math.ceil(sources.length / RATE_LIMIT_CONFIG.batchSize)}`);
-        
-        // Process batch in parallel
-        const batchPromises = batch.map(async (source) => {
-          try {
-            const items = await this.fetchRSSFeed(source);
-            console.log(`Successfully fetched ${items.length} items from ${source.name}`);
-            return items;
-          } catch (error) {
-            console.warn(`Failed to fetch from ${source.name}:`, error);
-            return [];
-          }
-        });
+      // Single server-side aggregation instead of one proxy call per feed
+      const { rssProxyService } = await import('./rssProxyService');
+      const response = await rssProxyService.fetchAggregatedFeed(
+        sources.map(source => source.url),
+        limit,
+        category
+      );
 
-        const batchResults = await Promise.all(batchPromises);
-        batchResults.forEach(items => allItems.push(...items));
-        
-        // Add delay between batches
-        if (i + RATE_LIMIT_CONFIG.batchSize < sources.length) {
-          console.log(`Waiting ${RATE_LIMIT_CONFIG.batchDelay}ms before next batch...`);
-          await new Promise(resolve => setTimeout(resolve, RATE_LIMIT_CONFIG.batchDelay));
-        }
+      if (!response.success || !response.data?.items) {
+        console.warn(`Failed to fetch aggregated feed: ${response.error}`);
+        return [];
       }
-      
-      // Sort by published date (newest first)
-      allItems.sort((a, b) => new Date(b.publishedAt).getTime() - new Date(a.publishedAt).getTime());
+
+      const sourcesByUrl = new Map(sources.map(source => [source.url, source]));
+      (response.data.feeds || []).forEach((feed: any) => {
+        if (!feed.ok) {
+          console.warn(`Failed to fetch RSS feed ${sourcesByUrl.get(feed.url)?.name || feed.url}: ${feed.error}`);
+        }
+      });
+
+      // Items arrive merged and sorted by publish time (newest first)
+      const allItems: FeedItem[] = response.data.items.map((item: any) => {
+        const source = sourcesByUrl.get(item.feedUrl);
+        return {
+          id: item.id,
+          title: item.title,
+          content: item.content,
+          excerpt: item.excerpt,
+          author: item.author,
+          source: source?.name || item.source,
+          url: item.url,
+          publishedAt: item.publishedAt || new Date().toISOString(),
+          imageUrl: item.imageUrl || undefined,
+          category: source?.category || item.category || 'General',
+          tags: this.extractTags(`${item.title} ${item.content}`),
+          readingTime: item.readingTime,
+          wordCount: item.wordCount,
+          apiSource: 'rss-feed' as const,
+          sentiment: this.analyzeSentiment(`${item.title} ${item.content}`),
+          language: 'en',
+          country: 'US'
+        };
+      });
       
       // Limit to requested number of items
       const limitedItems = allItems.slice(0, limit);
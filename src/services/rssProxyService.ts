@@ -19,10 +19,13 @@ class RSSProxyService {
 
   private async makeRequest(endpoint: string, options: RequestInit = {}): Promise<RSSProxyResponse> {
     try {
+      // /rss/aggregate fetches upstream feeds server-side and requires a signed-in user
+      const token = localStorage.getItem('auth_token');
       const response = await fetch(`${this.baseUrl}${endpoint}`, {
         ...options,
         headers: {
           'Content-Type': 'application/json',
+          ...(token && { Authorization: `Bearer ${token}` }),
           ...options.headers,
         },
       });
@@ -82,6 +85,20 @@ class RSSProxyService {
     return response;
   }
 
+  async fetchAggregatedFeed(feedUrls: string[], limit: number, category?: string): Promise<RSSProxyResponse> {
+    // One request for the whole feed set; the backend fetches, caches and merges upstream feeds
+    const response = await this.makeRequest('/rss/aggregate', {
+      method: 'POST',
+      body: JSON.stringify({ feed_urls: feedUrls, limit, category }),
+    });
+
+    if (response.success && response.data && !response.data.success) {
+      return { success: false, error: response.data.error || 'Aggregation failed' };
+    }
+
+    return response.success ? { success: true, data: response.data.data } : response;
+  }
+
   async getTrendingFeeds(): Promise<RSSProxyResponse> {
     return this.makeRequest('/rss/trending');
   }